@@ -0,0 +1,111 @@
+"""
+연령대별 인구 가중 접근성 점수
+population.csv의 구별 연령대(0-19 / 20-39 / 40-59 / 60+) 인구를 사용하여
+연령대마다 다른 보행 속도와 거리 감쇠 파라미터로 점수를 다시 계산
+거리 계산은 다시 하지 않고 구별 결과(km 지표)에 연령대 파라미터 표를 교차 결합하여 한 번에 계산
+"""
+
+import argparse
+import logging
+
+import numpy as np
+import pandas as pd
+
+from calculate_accessibility import PROCESSED_DIR, SCORING_PLAN
+from scoring_config import load_scoring_plan
+from instrumentation import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# 연령대별 보행 속도(km/h)와 거리 감쇠 시간(분): 도보 t분 거리 시설의 점수 = 100 · exp(-t / decay_min)
+AGE_GROUP_PARAMS = pd.DataFrame([
+    {'age_group': '0-19', 'walk_speed_kmh': 4.5, 'decay_min': 15.0},
+    {'age_group': '20-39', 'walk_speed_kmh': 4.8, 'decay_min': 15.0},
+    {'age_group': '40-59', 'walk_speed_kmh': 4.5, 'decay_min': 15.0},
+    {'age_group': '60+', 'walk_speed_kmh': 3.6, 'decay_min': 10.0},
+])
+
+
+
+def score_categories(plan=None):
+    """결과 category 컬럼 값 순서 (계획의 카테고리 + 종합 점수)"""
+    return (plan or SCORING_PLAN).categories + ['total_accessibility_score']
+
+
+def calculate_age_group_scores(results_df, population_df, params=AGE_GROUP_PARAMS, plan=None):
+    """
+    구 × 연령대 접근성 점수
+    results_df: calculate_scores 이전 / 이후의 구별 결과 (거리 / 밀도 지표 컬럼 필요)
+    population_df: population.csv (district, age_group, population)
+    plan: 지표 구성 / 가중치 (None이면 scoring_config.json, 구별 점수와 같은 계획을 넘김)
+    결과: district, age_group, population, category, score 컬럼의 long 형식 DataFrame
+    """
+    plan = plan or SCORING_PLAN
+    categories = score_categories(plan)
+
+    # 구 × 연령대 교차 결합 후 연령대 인구 결합
+    wide = results_df.merge(params, how='cross')
+    population = population_df[['district', 'age_group', 'population']].astype(
+        {'district': str, 'age_group': str})
+    wide = wide.drop(columns='population').astype({'district': str}).merge(
+        population, on=['district', 'age_group'], how='left')
+    wide['population'] = wide['population'].fillna(0).astype(np.int64)
+
+    minutes_per_km = 60 / wide['walk_speed_kmh']
+    for category, components in plan.components.items():
+        score = 0
+        for column, kind, weight in components:
+            if kind == 'inverse':
+                # 거리 지표: 연령대 보행 시간에 대한 지수 감쇠 (시설이 없으면 0점)
+                minutes = wide[column] * minutes_per_km
+                part = (100 * np.exp(-minutes / wide['decay_min'])).fillna(0)
+            else:
+                # 밀도 지표는 연령대와 무관하므로 구 단위 정규화 값을 그대로 사용
+                part = pd.Series(plan.normalize(wide[column], 'direct'), index=wide.index)
+            score = score + part * weight
+        wide[category] = score
+
+    wide['total_accessibility_score'] = sum(
+        wide[category] * weight for category, weight in plan.category_weight_map.items()
+    ).round(plan.total_decimals)
+
+    long = wide.melt(id_vars=['district', 'age_group', 'population'], value_vars=categories,
+                     var_name='category', value_name='score')
+    long['district'] = pd.Categorical(long['district'], categories=results_df['district'].astype(str))
+    long['age_group'] = pd.Categorical(long['age_group'], categories=params['age_group'])
+    long['category'] = pd.Categorical(long['category'], categories=categories)
+    return long.sort_values(['district', 'age_group', 'category']).reset_index(drop=True)
+
+
+def summarize_by_age_group(long_df, plan=None):
+    """서울시 전체 연령대별 인구 가중 평균 점수 (연령대 × 카테고리)"""
+    plan = plan or SCORING_PLAN
+    weighted = long_df.assign(weighted=long_df['score'] * long_df['population'])
+    grouped = weighted.groupby(['age_group', 'category'], observed=True)[['weighted', 'population']].sum()
+    summary = (grouped['weighted'] / grouped['population']).unstack('category')
+    summary['grade'] = plan.grades(summary['total_accessibility_score'].round(plan.total_decimals).to_numpy())
+    return summary
+
+
+if __name__ == "__main__":
+    from ingest import load_dataset
+
+    parser = argparse.ArgumentParser(description="연령대별 인구 가중 접근성 점수 (배치 결과 재사용)")
+    parser.add_argument("--quiet", action="store_true", help="경고 외 콘솔 출력 생략")
+    args = parser.parse_args()
+
+    configure_logging(quiet=args.quiet)
+
+    # 구별 결과를 만든 배치 실행의 점수 계산 계획 사용
+    plan_file = PROCESSED_DIR / "scoring_plan.json"
+    plan = load_scoring_plan(plan_file) if plan_file.exists() else SCORING_PLAN
+
+    results = pd.read_csv(PROCESSED_DIR / "accessibility_scores.csv", encoding='utf-8-sig')
+    long_df = calculate_age_group_scores(results, load_dataset('population'), plan=plan)
+
+    output_file = PROCESSED_DIR / "accessibility_scores_by_age.csv"
+    long_df.to_csv(output_file, index=False, encoding='utf-8-sig')
+
+    logger.info("👥 연령대별 인구 가중 접근성 점수")
+    logger.info(summarize_by_age_group(long_df, plan).round(2).to_string())
+    logger.info(f"\n✅ 연령대별 결과 저장: {output_file}")
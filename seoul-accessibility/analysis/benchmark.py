@@ -0,0 +1,202 @@
+"""
+접근성 분석 파이프라인 벤치마크
+generate_sample_data.py의 벡터화 생성기로 시설 수를 N배 확대한 데이터셋을 고정 시드로 만들고,
+실제 파이프라인(calculate_accessibility.analyze_accessibility, 격자 크기를 주면
+grid_accessibility.analyze_grid_accessibility도)을 임시 디렉토리에서 실행하여
+StageRecorder의 단계별 실행 시간과 최대 메모리를 JSON Lines 파일에 누적 기록 (버전 간 성능 회귀 추적용)
+출발지 수 N마다 generate_origins(N) 출발지로 파이프라인 거리 단계(compute_distances)도 측정
+
+- 실행 시간은 tracemalloc을 끈 실행에서 측정 (추적 오버헤드가 저장 단계 시간 대부분을 차지)
+- 최대 메모리(peak_mb)는 캐시를 비우고 tracemalloc을 켜서 한 번 더 실행하여 측정
+"""
+
+import argparse
+import json
+import logging
+import shutil
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from calculate_accessibility import FACILITY_SPECS, analyze_accessibility, compute_distances, load_facilities
+from grid_accessibility import analyze_grid_accessibility
+from generate_sample_data import SEOUL_DISTRICTS, generate_datasets, write_datasets
+from instrumentation import StageRecorder, configure_logging
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+RESULTS_FILE = PROJECT_ROOT / "benchmarks" / "results.jsonl"
+
+STAGES = ['load', 'filter', 'distance', 'normalize', 'save']
+GRID_STAGES = ['load', 'index', 'score', 'aggregate', 'save']
+
+
+def generate_origins(num_origins, seed):
+    """구 인구에 비례하여 구 중심 주변에 출발지 좌표 생성"""
+    rng = np.random.default_rng(seed)
+    names = list(SEOUL_DISTRICTS)
+    populations = np.array([SEOUL_DISTRICTS[name]['population'] for name in names], dtype=np.float64)
+    picks = rng.choice(len(names), size=num_origins, p=populations / populations.sum())
+
+    return pd.DataFrame({
+        'district': np.array(names)[picks],
+        'latitude': np.array([SEOUL_DISTRICTS[name]['lat'] for name in names])[picks]
+        + rng.normal(0, 0.02, num_origins),
+        'longitude': np.array([SEOUL_DISTRICTS[name]['lon'] for name in names])[picks]
+        + rng.normal(0, 0.02, num_origins),
+    })
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _measure(run, cache_dir, trace_memory=True):
+    """
+    run(recorder)을 캐시 없이 실행하여 단계별 기록 반환
+    시간 / 행 수 / 최대 RSS는 tracemalloc을 끈 실행, peak_mb는 tracemalloc을 켠 두 번째 실행 기준
+    """
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    recorder = StageRecorder()
+    result = run(recorder)
+    stages = {
+        name: {'seconds': stage['seconds'], 'peak_mb': None,
+               'rows': stage['rows'], 'peak_rss_mb': stage['peak_rss_mb']}
+        for name, stage in recorder.summary().items()
+    }
+
+    if trace_memory:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        recorder = StageRecorder(trace_memory=True)
+        run(recorder)
+        for name, stage in recorder.summary().items():
+            stages[name]['peak_mb'] = stage['peak_traced_mb']
+    return result, stages
+
+
+def run_benchmark(scale=1.0, seed=42, search_scope='district', origin_counts=(), cell_sizes=(),
+                  workers=None, trace_memory=True, workdir=None):
+    """
+    한 번의 벤치마크 실행
+    origin_counts: 거리 단계를 측정할 출발지 수 목록 (generate_origins)
+    cell_sizes: 격자 파이프라인을 실행할 격자 크기(m) 목록 (작을수록 출발지 셀이 많음)
+    workers: 2 이상이면 거리 단계를 프로세스 풀로 계산 (analyze_accessibility --workers와 같음)
+    trace_memory: False면 tracemalloc 실행을 생략 (peak_mb는 None)
+    결과: 파라미터, 데이터 크기, 단계별 시간 / 메모리를 담은 dict
+    """
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        tmp = Path(tmp)
+        raw_dir, cache_dir, output_dir = tmp / "raw", tmp / "cache", tmp / "processed"
+        output_dir.mkdir()
+        datasets = generate_datasets(scale=scale, seed=seed, bulk=True)
+        write_datasets(datasets, raw_dir)
+        dirs = {'raw_dir': raw_dir, 'cache_dir': cache_dir, 'output_dir': output_dir}
+
+        _, stages = _measure(
+            lambda recorder: analyze_accessibility(search_scope=search_scope, use_cache=False,
+                                                   workers=workers, recorder=recorder, **dirs),
+            cache_dir, trace_memory)
+
+        # 출발지 수 확대: 같은 시설 데이터로 파이프라인 거리 단계만 반복
+        facilities = load_facilities(raw_dir, cache_dir)
+        origins = []
+        for num_origins in origin_counts:
+            origins_df = generate_origins(num_origins, seed)
+
+            def run(recorder):
+                with recorder.stage('distance', rows=num_origins * len(facilities)):
+                    return compute_distances(origins_df, facilities, search_scope, workers=workers)
+
+            _, origin_stages = _measure(run, tmp / "origin-cache", trace_memory)
+            origins.append({'num_origins': num_origins, 'stages': origin_stages})
+
+        grid = []
+        for cell_m in cell_sizes:
+            (cells, _), grid_stages = _measure(
+                lambda recorder: analyze_grid_accessibility(cell_m=cell_m, recorder=recorder, **dirs),
+                cache_dir, trace_memory)
+            grid.append({
+                'cell_m': cell_m,
+                'cells': len(cells),
+                'total_seconds': round(sum(stage['seconds'] for stage in grid_stages.values()), 6),
+                'stages': grid_stages,
+            })
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git_revision': _git_revision(),
+        'scale': scale,
+        'seed': seed,
+        'search_scope': search_scope,
+        'workers': workers,
+        'facility_rows': {facility_type: len(datasets[facility_type]) for facility_type in FACILITY_SPECS},
+        'total_seconds': round(sum(stage['seconds'] for stage in stages.values()), 6),
+        'stages': stages,
+        'origins': origins,
+        'grid': grid,
+    }
+
+
+def append_results(records, results_file=RESULTS_FILE):
+    """벤치마크 결과를 JSON Lines 파일에 추가"""
+    results_file = Path(results_file)
+    results_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(results_file, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="접근성 분석 파이프라인 벤치마크")
+    parser.add_argument("--scales", type=float, nargs="+", default=[1, 10],
+                        help="시설 수 배율 목록 (예: 1 10 100 1000)")
+    parser.add_argument("--origins", type=int, nargs="*", default=[1000],
+                        help="거리 단계를 측정할 출발지 수 목록 (값 없이 주면 생략)")
+    parser.add_argument("--cell-m", type=int, nargs="*", default=[500],
+                        help="격자 파이프라인 격자 크기(m) 목록 (값 없이 주면 격자 파이프라인 생략)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scope", choices=["district", "city"], default="district")
+    parser.add_argument("--workers", type=int, default=None, help="거리 계산 프로세스 수 (2 이상이면 병렬)")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="tracemalloc 측정 실행 생략 (시간만 측정)")
+    parser.add_argument("--output", type=Path, default=RESULTS_FILE,
+                        help="결과 JSON Lines 파일 경로")
+    parser.add_argument("--verbose", action="store_true", help="파이프라인 진행 메시지도 출력")
+    args = parser.parse_args()
+
+    configure_logging()
+    if not args.verbose:
+        # 파이프라인 모듈의 진행 메시지는 경고만 출력
+        for name in ("calculate_accessibility", "grid_accessibility", "ingest"):
+            logging.getLogger(name).setLevel(logging.WARNING)
+
+    records = []
+    for scale in args.scales:
+        record = run_benchmark(scale=scale, seed=args.seed, search_scope=args.scope,
+                               origin_counts=args.origins, cell_sizes=args.cell_m,
+                               workers=args.workers, trace_memory=not args.no_memory)
+        records.append(record)
+        stage_summary = " | ".join(
+            f"{name} {record['stages'][name]['seconds']:.3f}s" for name in STAGES)
+        logger.info(f"⏱️  x{scale:g} 시설 {sum(record['facility_rows'].values()):,}개 | {stage_summary}")
+        for origins in record['origins']:
+            logger.info(f"   출발지 {origins['num_origins']:,}개 | "
+                        f"distance {origins['stages']['distance']['seconds']:.3f}s")
+        for grid in record['grid']:
+            stage_summary = " | ".join(
+                f"{name} {grid['stages'][name]['seconds']:.3f}s" for name in GRID_STAGES)
+            logger.info(f"   격자 {grid['cell_m']}m 셀 {grid['cells']:,}개 | {stage_summary}")
+
+    append_results(records, args.output)
+    logger.info(f"\n✅ 벤치마크 결과 저장: {args.output}")
@@ -7,6 +7,19 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 import json
+import argparse
+import logging
+
+from distance_engine import nearest_and_mean_distances, grouped_nearest_and_mean_distances
+from spatial_index import FacilityIndex
+from coordinate_store import CoordinateStore, facility_coordinates, open_facility_stores, store_dir
+from ingest import CACHE_DIR, COORDINATE_BOUNDS, load_dataset, add_bounds_arguments, bounds_from_args
+from incremental import metrics_key, load_cached_metrics, save_cached_metrics
+from output_writers import SUFFIXES, WRITERS, write_csv, write_json_records
+from scoring_config import load_scoring_plan
+from instrumentation import StageRecorder, configure_logging
+
+logger = logging.getLogger(__name__)
 
 # 프로젝트 경로
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -15,6 +28,37 @@ RAW_DIR = DATA_DIR / "raw"
 PROCESSED_DIR = DATA_DIR / "processed"
 PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
 
+# 시설 종류별 원본 파일 및 지표 설정
+# display_name: 출력용 이름
+# label: 결과 컬럼 이름에 쓰는 단수형 (nearest_{label}_km, avg_{label}_dist_km, {label}_density)
+# count_column: 구별 시설 개수 컬럼
+# top_n: 평균 거리에 사용할 가까운 시설 수 (None이면 평균 거리 미계산)
+# density: 시설 밀도 계산 여부
+# per_capita: (컬럼 이름, 인구 단위) - 인구 대비 시설 비율 (None이면 미계산)
+FACILITY_SPECS = {
+    'hospitals': {
+        'file': "hospitals.csv", 'display_name': "병원", 'label': 'hospital', 'count_column': 'num_hospitals',
+        'top_n': 5, 'density': True, 'per_capita': ('hospital_per_10k_people', 10000),
+    },
+    'banks': {
+        'file': "banks.csv", 'display_name': "은행", 'label': 'bank', 'count_column': 'num_banks',
+        'top_n': 3, 'density': True, 'per_capita': ('bank_per_10k_people', 10000),
+    },
+    'gov_offices': {
+        'file': "gov_offices.csv", 'display_name': "행정시설", 'label': 'office', 'count_column': 'num_offices',
+        'top_n': None, 'density': False, 'per_capita': None,
+    },
+    'subway_stations': {
+        'file': "subway_stations.csv", 'display_name': "지하철역", 'label': 'station', 'count_column': 'num_stations',
+        'top_n': 3, 'density': True, 'per_capita': ('station_per_100k_people', 100000),
+    },
+}
+
+DISTRICT_COLUMNS = ['district', 'latitude', 'longitude', 'population', 'area_km2']
+
+# 결과 컬럼은 지표 종류별로 묶어서 출력 (개수 → 최근접 → 평균 → 밀도 → 인구 대비)
+METRIC_KINDS = ['count', 'nearest', 'avg', 'density', 'per_capita']
+
 
 def haversine_distance(lat1, lon1, lat2, lon2):
     """
@@ -41,15 +85,13 @@ def calculate_nearest_facility(district_lat, district_lon, facilities_df):
     if len(facilities_df) == 0:
         return None
 
-    distances = facilities_df.apply(
-        lambda row: haversine_distance(
-            district_lat, district_lon,
-            row['latitude'], row['longitude']
-        ),
-        axis=1
+    nearest, _ = nearest_and_mean_distances(
+        [district_lat], [district_lon],
+        facilities_df['latitude'].to_numpy(),
+        facilities_df['longitude'].to_numpy()
     )
 
-    return distances.min()
+    return nearest[0]
 
 
 def calculate_average_distance(district_lat, district_lon, facilities_df, top_n=5):
@@ -59,17 +101,15 @@ def calculate_average_distance(district_lat, district_lon, facilities_df, top_n=
     if len(facilities_df) == 0:
         return None
 
-    distances = facilities_df.apply(
-        lambda row: haversine_distance(
-            district_lat, district_lon,
-            row['latitude'], row['longitude']
-        ),
-        axis=1
+    # 가장 가까운 N개의 평균
+    _, mean = nearest_and_mean_distances(
+        [district_lat], [district_lon],
+        facilities_df['latitude'].to_numpy(),
+        facilities_df['longitude'].to_numpy(),
+        top_n=top_n
     )
 
-    # 가장 가까운 N개의 평균
-    nearest_distances = distances.nsmallest(min(top_n, len(distances)))
-    return nearest_distances.mean()
+    return mean[0]
 
 
 def calculate_facility_density(district, facilities_df, districts_df):
@@ -85,230 +125,472 @@ def calculate_facility_density(district, facilities_df, districts_df):
     return num_facilities / area_km2
 
 
-def analyze_accessibility():
+def normalize_inverse(series):
+    """거리는 짧을수록 좋으므로 역수 정규화 (NaN은 중간값으로 채움)"""
+    return pd.Series(SCORING_PLAN.normalize(series, 'inverse'), index=series.index)
+
+
+def normalize_direct(series):
+    """밀도는 높을수록 좋으므로 직접 정규화 (NaN은 0으로 채움)"""
+    return pd.Series(SCORING_PLAN.normalize(series, 'direct'), index=series.index)
+
+
+def assign_grade(score):
+    """종합 점수 → 등급 (scoring_config.json의 등급 기준)"""
+    return SCORING_PLAN.grade(score)
+
+
+def assign_grades(scores):
+    """종합 점수 Series → 등급 Series (행마다 함수를 호출하지 않는 벡터 연산)"""
+    return pd.Series(SCORING_PLAN.grades(scores), index=scores.index)
+
+
+# 점수 계산 규칙 (카테고리 / 지표 가중치, 등급 기준): scoring_config.json
+SCORING_PLAN = load_scoring_plan()
+
+# 카테고리 점수 구성: [(지표 컬럼, 정규화 방식, 가중치)]
+SCORE_COMPONENTS = SCORING_PLAN.components
+
+# 종합 점수 가중치
+CATEGORY_WEIGHTS = SCORING_PLAN.category_weight_map
+
+NORMALIZERS = {'inverse': normalize_inverse, 'direct': normalize_direct}
+
+
+def travel_time_plan(plan=None):
+    """이동 시간 모드 점수 계획: 거리 지표 컬럼을 같은 종류의 이동 시간 컬럼으로 대체"""
+    from travel_time import time_metric_columns
+
+    renames = {}
+    for spec in FACILITY_SPECS.values():
+        distance_columns = facility_metric_columns(spec)
+        for kind, column in time_metric_columns(spec).items():
+            renames[distance_columns[kind]] = column
+
+    return (plan or SCORING_PLAN).with_columns(renames)
+
+
+def calculate_scores(results_df, plan=None):
     """
-    자치구별 접근성 종합 분석
+    접근성 점수 계산 (0-100점)
+    거리가 짧을수록, 밀도가 높을수록 높은 점수
+    Min-Max 정규화를 사용하여 0-100점으로 변환
+    plan: 점수 계산 계획 (None이면 scoring_config.json의 SCORING_PLAN)
     """
-    print("📊 서울시 생활 서비스 접근성 분석 시작...\n")
+    # 카테고리별 점수 (의료 / 금융 / 교통 / 행정) → 종합 접근성 점수 (가중 평균) → 등급
+    return (plan or SCORING_PLAN).apply(results_df)
 
-    # 데이터 로드
-    print("📁 데이터 로딩 중...")
-    districts = pd.read_csv(RAW_DIR / "districts.csv")
-    hospitals = pd.read_csv(RAW_DIR / "hospitals.csv")
-    banks = pd.read_csv(RAW_DIR / "banks.csv")
-    gov_offices = pd.read_csv(RAW_DIR / "gov_offices.csv")
-    subway_stations = pd.read_csv(RAW_DIR / "subway_stations.csv")
-    population = pd.read_csv(RAW_DIR / "population.csv")
-
-    print(f"   ✅ 자치구: {len(districts)}개")
-    print(f"   ✅ 병원: {len(hospitals)}개")
-    print(f"   ✅ 은행: {len(banks)}개")
-    print(f"   ✅ 행정시설: {len(gov_offices)}개")
-    print(f"   ✅ 지하철역: {len(subway_stations)}개\n")
-
-    results = []
-
-    print("🔍 자치구별 접근성 분석 중...")
-    print("-" * 80)
-
-    for idx, row in districts.iterrows():
-        district = row['district']
-        lat, lon = row['latitude'], row['longitude']
-
-        # 해당 구의 시설들만 필터링
-        district_hospitals = hospitals[hospitals['district'] == district]
-        district_banks = banks[banks['district'] == district]
-        district_offices = gov_offices[gov_offices['district'] == district]
-        district_stations = subway_stations[subway_stations['district'] == district]
-
-        # 1. 최근접 거리 계산
-        nearest_hospital = calculate_nearest_facility(lat, lon, district_hospitals)
-        nearest_bank = calculate_nearest_facility(lat, lon, district_banks)
-        nearest_office = calculate_nearest_facility(lat, lon, district_offices)
-        nearest_station = calculate_nearest_facility(lat, lon, district_stations)
-
-        # 2. 평균 거리 (가까운 5개 시설)
-        avg_hospital_dist = calculate_average_distance(lat, lon, district_hospitals, top_n=5)
-        avg_bank_dist = calculate_average_distance(lat, lon, district_banks, top_n=3)
-        avg_station_dist = calculate_average_distance(lat, lon, district_stations, top_n=3)
-
-        # 3. 시설 밀도 (개수/km²)
-        hospital_density = calculate_facility_density(district, hospitals, districts)
-        bank_density = calculate_facility_density(district, banks, districts)
-        station_density = calculate_facility_density(district, subway_stations, districts)
-
-        # 4. 인구 대비 시설 비율
-        pop_total = row['population']
-        hospital_per_10k = (len(district_hospitals) / pop_total) * 10000
-        bank_per_10k = (len(district_banks) / pop_total) * 10000
-        station_per_100k = (len(district_stations) / pop_total) * 100000
-
-        results.append({
-            'district': district,
-            'latitude': lat,
-            'longitude': lon,
-            'population': pop_total,
-            'area_km2': row['area_km2'],
-
-            # 시설 개수
-            'num_hospitals': len(district_hospitals),
-            'num_banks': len(district_banks),
-            'num_offices': len(district_offices),
-            'num_stations': len(district_stations),
-
-            # 최근접 거리 (km)
-            'nearest_hospital_km': nearest_hospital,
-            'nearest_bank_km': nearest_bank,
-            'nearest_office_km': nearest_office,
-            'nearest_station_km': nearest_station,
-
-            # 평균 거리 (km)
-            'avg_hospital_dist_km': avg_hospital_dist,
-            'avg_bank_dist_km': avg_bank_dist,
-            'avg_station_dist_km': avg_station_dist,
-
-            # 시설 밀도 (개/km²)
-            'hospital_density': hospital_density,
-            'bank_density': bank_density,
-            'station_density': station_density,
-
-            # 인구 대비 시설 비율
-            'hospital_per_10k_people': hospital_per_10k,
-            'bank_per_10k_people': bank_per_10k,
-            'station_per_100k_people': station_per_100k,
-        })
-
-        print(f"✓ {district:8s} | 병원: {len(district_hospitals):3d}개 | "
-              f"은행: {len(district_banks):3d}개 | 지하철: {len(district_stations):2d}개")
-
-    print("-" * 80)
-
-    # DataFrame 생성
-    results_df = pd.DataFrame(results)
 
-    # 5. 접근성 점수 계산 (0-100점)
-    print("\n📈 접근성 점수 계산 중...")
-
-    # 점수 계산: 거리가 짧을수록, 밀도가 높을수록 높은 점수
-    # Min-Max 정규화를 사용하여 0-100점으로 변환
-
-    def normalize_inverse(series):
-        """거리는 짧을수록 좋으므로 역수 정규화"""
-        # NaN 값을 중간값으로 채우기
-        series_filled = series.fillna(series.median())
-        if series_filled.isnull().all() or len(series_filled.unique()) == 1:
-            return pd.Series([50] * len(series))
-        inversed = 1 / (series_filled + 0.1)  # 0으로 나누기 방지
-        normalized = (inversed - inversed.min()) / (inversed.max() - inversed.min()) * 100
-        return normalized.fillna(50)
-
-    def normalize_direct(series):
-        """밀도는 높을수록 좋으므로 직접 정규화"""
-        series_filled = series.fillna(0)
-        if series_filled.isnull().all() or len(series_filled.unique()) == 1:
-            return pd.Series([50] * len(series))
-        if series_filled.max() == series_filled.min():
-            return pd.Series([50] * len(series))
-        normalized = (series_filled - series_filled.min()) / (series_filled.max() - series_filled.min()) * 100
-        return normalized.fillna(0)
-
-    # 의료 접근성 점수
-    results_df['medical_score'] = (
-        normalize_inverse(results_df['avg_hospital_dist_km']) * 0.6 +
-        normalize_direct(results_df['hospital_density']) * 0.4
-    )
+def normalization_params(results_df, plan=None):
+    """
+    배치 실행의 정규화 상수 (지점 단위 점수 계산에서 재사용)
+    결과: {지표 컬럼: {'kind', 'fill', 'min', 'max', 'offset'}} - 값이 모두 같으면 'constant': True
+    """
+    plan = plan or SCORING_PLAN
+    params = {}
+    for column in plan.columns:
+        kind = plan.kinds[column]
+        series = results_df[column]
+        fill = series.median() if kind == 'inverse' else 0
+        filled = series.fillna(fill)
+        if filled.isnull().all() or len(filled.unique()) == 1:
+            params[column] = {'kind': kind, 'constant': True, 'score': plan.degenerate_score}
+            continue
+        transformed = 1 / (filled + plan.inverse_offset) if kind == 'inverse' else filled
+        params[column] = {
+            'kind': kind,
+            'fill': float(fill),
+            'min': float(transformed.min()),
+            'max': float(transformed.max()),
+            'offset': plan.inverse_offset,
+        }
+    return params
+
+
+def apply_normalization(values, params):
+    """
+    저장된 정규화 상수로 새 값을 0-100점으로 변환
+    배치 실행 범위를 벗어난 값은 0 또는 100으로 자름
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if params.get('constant'):
+        return np.full(values.shape, params.get('score', SCORING_PLAN.degenerate_score))
+
+    filled = np.where(np.isnan(values), params['fill'], values)
+    offset = params.get('offset', SCORING_PLAN.inverse_offset)
+    transformed = 1 / (filled + offset) if params['kind'] == 'inverse' else filled
+    normalized = (transformed - params['min']) / (params['max'] - params['min']) * 100
+    return np.clip(normalized, 0, 100)
 
-    # 금융 접근성 점수
-    results_df['financial_score'] = (
-        normalize_inverse(results_df['avg_bank_dist_km']) * 0.6 +
-        normalize_direct(results_df['bank_density']) * 0.4
-    )
 
-    # 교통 접근성 점수
-    results_df['transport_score'] = (
-        normalize_inverse(results_df['avg_station_dist_km']) * 0.6 +
-        normalize_direct(results_df['station_density']) * 0.4
+def load_facilities(raw_dir=RAW_DIR, cache_dir=CACHE_DIR):
+    """
+    시설 종류별 데이터 로드 (ingest 단계의 컬럼형 캐시 사용)
+    결과: {시설 종류: DataFrame} 딕셔너리 (spatial_index.build_facility_indexes 입력)
+    """
+    return {
+        facility_type: load_dataset(facility_type, raw_dir=raw_dir, cache_dir=cache_dir)
+        for facility_type in FACILITY_SPECS
+    }
+
+
+def calculate_citywide_distances(districts_df, facilities_df, spec, search_radius_km=None):
+    """
+    구 경계와 관계없이 서울시 전체 시설을 대상으로 거리 계산
+    BallTree 인덱스를 한 번만 만들어 모든 구 중심에 재사용
+    search_radius_km를 주면 반경 밖의 시설은 제외
+    결과: (최근접 거리 배열, 평균 거리 배열)
+    """
+    index = FacilityIndex(*facility_coordinates(facilities_df))
+    return index.nearest_and_mean_distances(
+        districts_df['latitude'].to_numpy(), districts_df['longitude'].to_numpy(),
+        top_n=spec['top_n'] or 1, max_distance_km=search_radius_km)
+
+
+def facility_metric_columns(spec):
+    """시설 종류별 결과 컬럼 이름 {지표 종류: 컬럼}"""
+    label = spec['label']
+    columns = {
+        'count': spec['count_column'],
+        'nearest': f'nearest_{label}_km',
+    }
+    if spec['top_n']:
+        columns['avg'] = f'avg_{label}_dist_km'
+    if spec['density']:
+        columns['density'] = f'{label}_density'
+    if spec['per_capita']:
+        columns['per_capita'] = spec['per_capita'][0]
+    return columns
+
+
+def result_columns():
+    """구별 분석 결과 컬럼 순서"""
+    columns = list(DISTRICT_COLUMNS)
+    for kind in METRIC_KINDS:
+        for spec in FACILITY_SPECS.values():
+            column = facility_metric_columns(spec).get(kind)
+            if column:
+                columns.append(column)
+    return columns
+
+
+def calculate_facility_metrics(districts_df, facilities_df, spec, distances=None, counts=None):
+    """
+    한 시설 종류의 구별 지표 계산 (개수, 최근접 / 평균 거리, 밀도, 인구 대비 비율)
+    개수 / 거리는 count_by_district / calculate_distances로 계산 (미리 계산한 값을 넘기면 재사용)
+    distances: 미리 계산한 (최근접, 평균) 거리 배열 (None이면 같은 구 시설 기준으로 계산)
+    counts: 미리 집계한 구별 시설 수 배열 (None이면 facilities_df에서 집계)
+    """
+    columns = facility_metric_columns(spec)
+
+    if counts is None:
+        counts = count_by_district(districts_df, facilities_df)
+    if distances is None:
+        distances = calculate_distances(districts_df, facilities_df, spec)
+    nearest, mean = distances
+
+    metrics = pd.DataFrame(index=districts_df.index)
+    metrics[columns['count']] = counts
+    metrics[columns['nearest']] = nearest
+    if 'avg' in columns:
+        metrics[columns['avg']] = mean
+    if 'density' in columns:
+        metrics[columns['density']] = counts / districts_df['area_km2'].to_numpy()
+    if 'per_capita' in columns:
+        per = spec['per_capita'][1]
+        metrics[columns['per_capita']] = (counts / districts_df['population'].to_numpy()) * per
+
+    return metrics
+
+
+def calculate_distances(districts_df, facilities_df, spec, search_scope='district', search_radius_km=None):
+    """
+    한 시설 종류의 (최근접 거리 배열, 평균 거리 배열) - 'district'면 같은 구 시설, 'city'면 서울시 전체
+    facilities_df: DataFrame 또는 CoordinateStore (memmap 좌표와 정수 구 코드를 복사 없이 사용)
+    """
+    if search_scope == 'city':
+        return calculate_citywide_distances(districts_df, facilities_df, spec, search_radius_km)
+    if isinstance(facilities_df, CoordinateStore):
+        labels = pd.Index(districts_df['district'].astype(str))
+        return grouped_nearest_and_mean_distances(
+            districts_df['latitude'], districts_df['longitude'], labels.get_indexer(labels),
+            facilities_df.latitude, facilities_df.longitude, facilities_df.group_codes(labels),
+            top_n=spec['top_n'] or 1
+        )
+    return grouped_nearest_and_mean_distances(
+        districts_df['latitude'], districts_df['longitude'], districts_df['district'],
+        facilities_df['latitude'], facilities_df['longitude'], facilities_df['district'],
+        top_n=spec['top_n'] or 1
     )
 
-    # 행정 접근성 점수
-    results_df['administrative_score'] = normalize_inverse(results_df['nearest_office_km'])
-
-    # 종합 접근성 점수 (가중 평균)
-    results_df['total_accessibility_score'] = (
-        results_df['medical_score'] * 0.35 +
-        results_df['financial_score'] * 0.20 +
-        results_df['transport_score'] * 0.30 +
-        results_df['administrative_score'] * 0.15
-    ).round(2)
-
-    # 등급 부여
-    def assign_grade(score):
-        if score >= 80:
-            return 'A'
-        elif score >= 65:
-            return 'B'
-        elif score >= 50:
-            return 'C'
-        elif score >= 35:
-            return 'D'
+
+def compute_distances(origins_df, facilities, search_scope='district', search_radius_km=None, workers=None):
+    """
+    시설 종류별 (최근접 거리 배열, 평균 거리 배열) - analyze_accessibility의 거리 단계
+    origins_df: latitude / longitude / district 컬럼의 출발지 DataFrame (구 중심 또는 임의 출발지)
+    facilities: {시설 종류: DataFrame 또는 CoordinateStore}
+    workers: 2 이상이면 프로세스 풀로 병렬 계산 (parallel.py, 직렬 계산과 같은 값)
+    """
+    if workers is not None and workers > 1 and facilities:
+        from parallel import compute_distances_parallel
+
+        return compute_distances_parallel(
+            origins_df, facilities, FACILITY_SPECS, search_scope, search_radius_km, workers=workers)
+    return {
+        facility_type: calculate_distances(
+            origins_df, facilities_df, FACILITY_SPECS[facility_type], search_scope, search_radius_km)
+        for facility_type, facilities_df in facilities.items()
+    }
+
+
+def count_by_district(districts_df, facilities_df):
+    """구별 시설 수 (groupby 한 번, districts_df 순서)"""
+    if isinstance(facilities_df, CoordinateStore):
+        return facilities_df.count_by_district(districts_df['district'].astype(str))
+    return (facilities_df.groupby('district').size()
+            .reindex(districts_df['district'], fill_value=0)
+            .to_numpy())
+
+
+def analyze_accessibility(search_scope='district', search_radius_km=None, use_cache=True,
+                          workers=None, osm_file=None, extra_formats=(), plan=None, recorder=None,
+                          use_coordinate_store=False, bounds=COORDINATE_BOUNDS,
+                          raw_dir=RAW_DIR, cache_dir=CACHE_DIR, output_dir=PROCESSED_DIR):
+    """
+    자치구별 접근성 종합 분석
+    search_scope: 'district'면 같은 구의 시설만, 'city'면 서울시 전체 시설까지의 거리 사용
+                  (시설 개수 / 밀도 / 인구 대비 비율은 항상 구 단위)
+    search_radius_km: 'city' 검색 시 고려할 최대 거리 (None이면 제한 없음)
+    use_cache: 입력이 바뀌지 않은 시설 종류는 저장된 중간 결과를 재사용
+    workers: 2 이상이면 거리 계산을 프로세스 풀로 병렬 실행 (결과는 직렬 실행과 동일)
+    osm_file: OSM 추출 파일을 주면 이동 시간 모드 (도로 / 지하철 네트워크 이동 시간으로 점수 계산)
+    extra_formats: CSV / JSON 외에 추가로 저장할 형식 (ndjson / parquet / columnar)
+    plan: 점수 계산 계획 (None이면 scoring_config.json)
+    recorder: instrumentation.StageRecorder (단계별 시간 / 행 수 / 메모리 기록, None이면 기록만 하고 버림)
+    use_coordinate_store: 시설을 DataFrame 대신 메모리 맵 좌표 저장소(coordinate_store.py)로 읽음
+                          (이름 등 문자열 컬럼을 올리지 않고, 병렬 워커도 같은 파일을 공유)
+    bounds: 입력 좌표 허용 범위 (ingest.validate_dataset, None이면 위경도 범위만 검사)
+    raw_dir / cache_dir / output_dir: 원본 CSV / 캐시 / 결과 디렉토리 (벤치마크 등에서 임시 디렉토리 사용)
+    """
+    if search_scope not in ('district', 'city'):
+        raise ValueError(f"search_scope must be 'district' or 'city', got {search_scope!r}")
+
+    recorder = recorder or StageRecorder()
+
+    logger.info("📊 서울시 생활 서비스 접근성 분석 시작...\n")
+
+    # 입력 해시가 같은 시설 종류는 이전 실행의 중간 결과를 그대로 사용
+    keys = {}
+    metrics = {}
+
+    # 데이터 로드
+    logger.info("📁 데이터 로딩 중...")
+    with recorder.stage('load') as record:
+        datasets = {'raw_dir': raw_dir, 'cache_dir': cache_dir, 'bounds': bounds}
+        districts = load_dataset('districts', **datasets)
+        population = load_dataset('population', **datasets)
+        for facility_type, spec in FACILITY_SPECS.items():
+            keys[facility_type] = metrics_key(facility_type, spec, search_scope, search_radius_km,
+                                              raw_dir, cache_dir)
+            if use_cache:
+                cached = load_cached_metrics(facility_type, search_scope, keys[facility_type],
+                                             districts.index, cache_dir)
+                if cached is not None:
+                    metrics[facility_type] = cached
+
+        # 나머지 시설 종류만 다시 계산
+        stale = [facility_type for facility_type in FACILITY_SPECS if facility_type not in metrics]
+        if use_coordinate_store:
+            facilities = open_facility_stores(stale, raw_dir=raw_dir, store_dir=store_dir(cache_dir),
+                                              cache_dir=cache_dir, bounds=bounds)
         else:
-            return 'F'
+            facilities = {facility_type: load_dataset(facility_type, **datasets) for facility_type in stale}
+        record['rows'] = len(districts) + len(population) + sum(map(len, facilities.values()))
+    logger.info(f"   ✅ 자치구: {len(districts)}개\n")
+
+    logger.info("🔍 자치구별 접근성 분석 중...")
+
+    # 구별 시설 수 (groupby 한 번)
+    with recorder.stage('filter') as record:
+        counts = {facility_type: count_by_district(districts, facilities[facility_type])
+                  for facility_type in stale}
+        record['rows'] = sum(map(len, facilities.values()))
+
+    with recorder.stage('distance') as record:
+        distances = compute_distances(districts, facilities, search_scope, search_radius_km, workers)
+        for facility_type in stale:
+            metrics[facility_type] = calculate_facility_metrics(
+                districts, facilities[facility_type], FACILITY_SPECS[facility_type],
+                distances=distances[facility_type], counts=counts[facility_type])
+            save_cached_metrics(facility_type, search_scope, keys[facility_type], metrics[facility_type],
+                                cache_dir)
+        record['rows'] = len(districts) * len(stale)
+
+    for facility_type, spec in FACILITY_SPECS.items():
+        status = "재계산" if facility_type in stale else "캐시 사용"
+        total = metrics[facility_type][spec['count_column']].sum()
+        logger.info(f"   ✅ {spec['display_name']}: {total}개 ({status})")
+
+    # 시설 종류별 지표를 구 기준으로 결합
+    metrics = [metrics[facility_type] for facility_type in FACILITY_SPECS]
+
+    logger.info("-" * 80)
+    results_df = pd.concat([districts[DISTRICT_COLUMNS]] + metrics, axis=1)[result_columns()]
+
+    for row in results_df.itertuples(index=False):
+        logger.info(f"✓ {row.district:8s} | 병원: {row.num_hospitals:3d}개 | "
+                    f"은행: {row.num_banks:3d}개 | 지하철: {row.num_stations:2d}개")
+
+    logger.info("-" * 80)
+
+    plan = plan or SCORING_PLAN
+    # 연령대별 점수는 이동 시간 모드에서도 거리 지표(km)에 연령대 보행 속도를 적용하므로 거리 기준 계획 사용
+    distance_plan = plan
+    if osm_file is not None:
+        from travel_time import calculate_travel_time_metrics
+
+        logger.info("\n🗺️  네트워크 이동 시간 계산 중...")
+        if search_scope != 'city' or search_radius_km is not None:
+            logger.warning("   ⚠️  이동 시간 지표는 검색 범위 / 반경과 관계없이 서울시 전체 시설 기준으로 계산")
+        with recorder.stage('travel_time', rows=len(districts)):
+            time_metrics = calculate_travel_time_metrics(
+                districts, {facility_type: load_dataset(facility_type, **datasets)
+                            for facility_type in FACILITY_SPECS},
+                FACILITY_SPECS, osm_file, cache_dir, raw_dir=raw_dir, bounds=bounds)
+        results_df = pd.concat([results_df, time_metrics], axis=1)
+        plan = travel_time_plan(plan)
+
+    # 5. 접근성 점수 계산 (0-100점)
+    logger.info("\n📈 접근성 점수 계산 중...")
+
+    from age_group_scores import calculate_age_group_scores
 
-    results_df['grade'] = results_df['total_accessibility_score'].apply(assign_grade)
+    with recorder.stage('normalize', rows=len(results_df)):
+        results_df = calculate_scores(results_df, plan)
+        # 연령대별 점수 (거리 지표 재사용, 구 × 연령대 × 카테고리 long 형식)
+        age_scores = calculate_age_group_scores(results_df, population, plan=distance_plan)
 
     # 결과 저장
-    output_file = PROCESSED_DIR / "accessibility_scores.csv"
-    results_df.to_csv(output_file, index=False, encoding='utf-8-sig')
-    print(f"   ✅ 접근성 분석 결과 저장: {output_file}\n")
+    with recorder.stage('save', rows=len(results_df)):
+        # 지점 단위 점수 API(scoring_api.py)가 사용할 정규화 상수와 점수 계산 계획 (거리 모드만 해당)
+        # 지점 거리도 같은 범위로 계산하도록 검색 범위 / 반경을 함께 저장
+        if osm_file is None:
+            normalization = {'search_scope': search_scope, 'search_radius_km': search_radius_km,
+                             **normalization_params(results_df, plan)}
+            with open(output_dir / "normalization.json", 'w', encoding='utf-8') as f:
+                json.dump(normalization, f, ensure_ascii=False, indent=2)
+            plan.save(output_dir / "scoring_plan.json")
+
+        output_file = output_dir / "accessibility_scores.csv"
+        write_csv(results_df, output_file)
+        logger.info(f"   ✅ 접근성 분석 결과 저장: {output_file}")
+
+        age_output = output_dir / "accessibility_scores_by_age.csv"
+        age_scores.to_csv(age_output, index=False, encoding='utf-8-sig')
+        logger.info(f"   ✅ 연령대별 결과 저장: {age_output}")
+
+        # JSON으로도 저장 (대시보드용)
+        json_output = output_dir / "accessibility_scores.json"
+        # 시설이 없는 구의 거리(NaN)는 JSON null로 저장, 레코드는 청크 단위로 직렬화
+        write_json_records(results_df, json_output)
+        logger.info(f"   ✅ JSON 파일 저장: {json_output}")
+
+        for fmt in extra_formats:
+            extra_output = output_dir / f"accessibility_scores{SUFFIXES[fmt]}"
+            WRITERS[fmt](results_df, extra_output)
+            logger.info(f"   ✅ {fmt} 파일 저장: {extra_output}")
+
+    log_summary(results_df)
+
+    return results_df
 
-    # 결과 요약 출력
-    print("=" * 80)
-    print("📊 서울시 자치구별 접근성 점수 TOP 5 / BOTTOM 5")
-    print("=" * 80)
+
+def log_summary(results_df):
+    """결과 요약 (TOP 5 / BOTTOM 5, 통계, 등급 분포)"""
+    logger.info("\n" + "=" * 80)
+    logger.info("📊 서울시 자치구별 접근성 점수 TOP 5 / BOTTOM 5")
+    logger.info("=" * 80)
 
     # 정렬
     sorted_df = results_df.sort_values('total_accessibility_score', ascending=False)
 
-    print("\n🏆 접근성 최상위 5개 구:")
-    print("-" * 80)
+    logger.info("\n🏆 접근성 최상위 5개 구:")
+    logger.info("-" * 80)
     for idx, row in sorted_df.head(5).iterrows():
-        print(f"{row['district']:8s} | 종합: {row['total_accessibility_score']:5.1f}점 ({row['grade']}) | "
-              f"의료: {row['medical_score']:4.1f} | 금융: {row['financial_score']:4.1f} | "
-              f"교통: {row['transport_score']:4.1f}")
+        logger.info(f"{row['district']:8s} | 종합: {row['total_accessibility_score']:5.1f}점 ({row['grade']}) | "
+                    f"의료: {row['medical_score']:4.1f} | 금융: {row['financial_score']:4.1f} | "
+                    f"교통: {row['transport_score']:4.1f}")
 
-    print("\n⚠️  접근성 최하위 5개 구:")
-    print("-" * 80)
+    logger.info("\n⚠️  접근성 최하위 5개 구:")
+    logger.info("-" * 80)
     for idx, row in sorted_df.tail(5).iterrows():
-        print(f"{row['district']:8s} | 종합: {row['total_accessibility_score']:5.1f}점 ({row['grade']}) | "
-              f"의료: {row['medical_score']:4.1f} | 금융: {row['financial_score']:4.1f} | "
-              f"교통: {row['transport_score']:4.1f}")
+        logger.info(f"{row['district']:8s} | 종합: {row['total_accessibility_score']:5.1f}점 ({row['grade']}) | "
+                    f"의료: {row['medical_score']:4.1f} | 금융: {row['financial_score']:4.1f} | "
+                    f"교통: {row['transport_score']:4.1f}")
 
-    print("\n" + "=" * 80)
+    logger.info("\n" + "=" * 80)
 
     # 통계 요약
-    print("\n📈 통계 요약:")
-    print(f"   • 평균 접근성 점수: {results_df['total_accessibility_score'].mean():.2f}점")
-    print(f"   • 최고 점수: {results_df['total_accessibility_score'].max():.2f}점 "
-          f"({results_df.loc[results_df['total_accessibility_score'].idxmax(), 'district']})")
-    print(f"   • 최저 점수: {results_df['total_accessibility_score'].min():.2f}점 "
-          f"({results_df.loc[results_df['total_accessibility_score'].idxmin(), 'district']})")
-    print(f"   • 점수 격차: {results_df['total_accessibility_score'].max() - results_df['total_accessibility_score'].min():.2f}점")
+    total = results_df['total_accessibility_score']
+    logger.info("\n📈 통계 요약:")
+    logger.info(f"   • 평균 접근성 점수: {total.mean():.2f}점")
+    logger.info(f"   • 최고 점수: {total.max():.2f}점 ({results_df.loc[total.idxmax(), 'district']})")
+    logger.info(f"   • 최저 점수: {total.min():.2f}점 ({results_df.loc[total.idxmin(), 'district']})")
+    logger.info(f"   • 점수 격차: {total.max() - total.min():.2f}점")
 
     grade_counts = results_df['grade'].value_counts().sort_index()
-    print(f"\n   등급 분포:")
+    logger.info(f"\n   등급 분포:")
     for grade, count in grade_counts.items():
-        print(f"      {grade}등급: {count}개 구")
-
-    # JSON으로도 저장 (대시보드용)
-    json_output = PROCESSED_DIR / "accessibility_scores.json"
-    results_json = results_df.to_dict(orient='records')
-    with open(json_output, 'w', encoding='utf-8') as f:
-        json.dump(results_json, f, ensure_ascii=False, indent=2)
-    print(f"\n   ✅ JSON 파일 저장: {json_output}")
-
-    return results_df
+        logger.info(f"      {grade}등급: {count}개 구")
 
 
 if __name__ == "__main__":
-    df = analyze_accessibility()
-    print("\n✅ 접근성 분석 완료!")
+    parser = argparse.ArgumentParser(description="서울시 자치구별 생활 서비스 접근성 분석")
+    parser.add_argument("--scope", choices=["district", "city"], default="district",
+                        help="거리 계산 대상 시설 범위 (district: 같은 구, city: 서울시 전체)")
+    parser.add_argument("--radius-km", type=float, default=None,
+                        help="city 범위 검색 시 최대 거리 (km)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="저장된 시설별 중간 결과를 무시하고 모두 재계산")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="거리 계산 병렬 프로세스 수 (기본: 직렬 실행)")
+    parser.add_argument("--travel-time", type=Path, default=None, metavar="OSM_FILE",
+                        help="OSM 추출 파일(.osm / .osm.gz)로 네트워크 이동 시간 기반 점수 계산")
+    parser.add_argument("--formats", nargs="+", default=[], choices=["ndjson", "parquet", "columnar"],
+                        help="CSV / JSON 외에 추가로 저장할 형식")
+    parser.add_argument("--scoring-config", type=Path, default=None, metavar="JSON",
+                        help="점수 계산 규칙 파일 (기본: analysis/scoring_config.json)")
+    parser.add_argument("--metrics", type=Path, default=None,
+                        help="단계별 계측 결과 파일 (.prom이면 Prometheus textfile, 그 외에는 JSON Lines 추가)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="단계별 최대 파이썬 할당량(tracemalloc) 측정")
+    parser.add_argument("--profile", type=Path, default=None, metavar="DIR",
+                        help="단계마다 cProfile 결과를 DIR/{단계}.prof로 저장")
+    parser.add_argument("--mmap", action="store_true",
+                        help="시설 좌표를 메모리 맵 좌표 저장소에서 읽음 (coordinate_store.py, 대용량 POI용)")
+    add_bounds_arguments(parser)
+    parser.add_argument("--quiet", action="store_true", help="경고 외 콘솔 출력 생략")
+    parser.add_argument("--verbose", action="store_true", help="단계별 계측 값도 출력")
+    parser.add_argument("--snapshot", nargs="?", const="", default=None, metavar="LABEL",
+                        help="분석 후 입력 / 출력을 스냅샷 저장소에 보관 (snapshots.py)")
+    args = parser.parse_args()
+
+    configure_logging(quiet=args.quiet, verbose=args.verbose)
+    recorder = StageRecorder(trace_memory=args.trace_memory, profile_dir=args.profile,
+                             labels={'search_scope': args.scope})
+
+    df = analyze_accessibility(search_scope=args.scope, search_radius_km=args.radius_km,
+                               use_cache=not args.no_cache, workers=args.workers,
+                               osm_file=args.travel_time, extra_formats=args.formats,
+                               plan=load_scoring_plan(args.scoring_config) if args.scoring_config else None,
+                               recorder=recorder, use_coordinate_store=args.mmap,
+                               bounds=bounds_from_args(args))
+    if args.metrics:
+        recorder.write(args.metrics)
+        logger.info(f"\n   ✅ 단계별 계측 결과 저장: {args.metrics}")
+    if args.snapshot is not None:
+        from snapshots import SnapshotStore
+
+        manifest = SnapshotStore().create(label=args.snapshot or None)
+        logger.info(f"\n   ✅ 스냅샷 저장: {manifest['id']} (새 객체 {manifest['stored']}개)")
+    logger.info("\n✅ 접근성 분석 완료!")
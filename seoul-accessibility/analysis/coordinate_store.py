@@ -0,0 +1,261 @@
+"""
+메모리 맵 시설 좌표 저장소
+전국 단위 POI처럼 큰 시설 데이터를 문자열 컬럼까지 DataFrame으로 올리지 않고,
+좌표와 구 코드만 연속된 이진 배열로 저장하여 numpy.memmap으로 읽음
+
+data/cache/coordinates/{데이터셋}/
+- latitude.bin / longitude.bin: 좌표 (기본 float64, 값은 ingest 캐시와 같은 float32 정밀도)
+- district.bin: int32 구 코드 (meta.json의 district_labels 순서, 구가 비어 있으면 -1)
+- metadata.parquet: 이름 등 나머지 컬럼 (필요할 때 필요한 컬럼만 읽음, pyarrow가 없으면 CSV)
+- meta.json: 행 수 / dtype / 구 라벨 / 원본 파일 지문
+
+- 원본 CSV는 청크 단위로 읽어 파일 끝에 이어 씀 (전체를 메모리에 올리지 않음)
+- float64 좌표는 distance_engine / spatial_index에서 복사 없이 그대로 사용
+- 프로세스 풀 워커는 같은 파일을 memmap으로 열어 OS 페이지 캐시를 공유 (parallel.py)
+"""
+
+import argparse
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+from ingest import (
+    CACHE_DIR, RAW_DIR, SCHEMAS, FACILITY_COORDINATE_DTYPE, COORDINATE_BOUNDS,
+    coalesce_coordinates, validate_dataset, source_fingerprint, load_dataset,
+    bounds_key, add_bounds_arguments, bounds_from_args,
+)
+from instrumentation import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+def store_dir(cache_dir=CACHE_DIR):
+    return Path(cache_dir) / "coordinates"
+
+
+STORE_DIR = store_dir()
+
+# 저장 형식이 바뀌면 올려서 기존 저장소를 모두 다시 생성
+STORE_VERSION = 1
+
+DEFAULT_COORDINATE_DTYPE = 'float64'
+DEFAULT_CHUNK_ROWS = 500_000
+CODE_DTYPE = 'int32'
+
+FACILITY_DATASETS = ['hospitals', 'banks', 'gov_offices', 'subway_stations']
+
+
+def _memmap(path, dtype, length):
+    """읽기 전용 memmap (행이 없으면 빈 배열 - 크기 0 파일은 memmap으로 열 수 없음)"""
+    if length == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', shape=(length,))
+
+
+class CoordinateStore:
+    """
+    한 데이터셋의 메모리 맵 좌표 저장소
+    latitude / longitude: memmap 좌표 배열, district_codes: memmap int32 구 코드
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / "meta.json", encoding='utf-8') as f:
+            self.meta = json.load(f)
+
+        length = self.meta['rows']
+        dtype = self.meta['coordinate_dtype']
+        self.latitude = _memmap(self.path / "latitude.bin", dtype, length)
+        self.longitude = _memmap(self.path / "longitude.bin", dtype, length)
+        self.district_codes = _memmap(self.path / "district.bin", CODE_DTYPE, length)
+        self.district_labels = pd.Index(self.meta['district_labels'])
+        self._metadata = None
+
+    def __len__(self):
+        return self.meta['rows']
+
+    @property
+    def name(self):
+        return self.meta['name']
+
+    def districts(self):
+        """구 이름 (Categorical, 필요할 때만 생성)"""
+        return pd.Categorical.from_codes(np.asarray(self.district_codes), categories=self.district_labels)
+
+    def group_codes(self, labels):
+        """
+        labels(pd.Index) 순서 기준 구 코드 배열
+        저장소 라벨이 labels의 앞부분과 같으면 memmap을 복사 없이 그대로 반환
+        """
+        labels = pd.Index(labels)
+        stored = self.district_labels
+        if len(stored) <= len(labels) and labels[:len(stored)].equals(stored):
+            return self.district_codes
+        mapping = np.append(labels.get_indexer(stored), -1).astype(CODE_DTYPE)
+        return mapping[self.district_codes]
+
+    def count_by_district(self, labels):
+        """labels 순서의 구별 시설 수 (구 코드 bincount 한 번)"""
+        labels = pd.Index(labels)
+        valid = self.district_codes[self.district_codes >= 0]
+        counts = np.bincount(valid, minlength=len(self.district_labels))
+        return pd.Series(counts, index=self.district_labels).reindex(labels, fill_value=0).to_numpy()
+
+    def metadata(self, columns=None):
+        """이름 등 좌표 외 컬럼 (처음 호출할 때 읽음, columns를 주면 해당 컬럼만)"""
+        path = self.path / self.meta['metadata_file']
+        if columns is not None:
+            if path.suffix == '.parquet':
+                return pd.read_parquet(path, columns=list(columns))
+            return pd.read_csv(path, usecols=list(columns))
+        if self._metadata is None:
+            self._metadata = pd.read_parquet(path) if path.suffix == '.parquet' else pd.read_csv(path)
+        return self._metadata
+
+    def describe(self):
+        """워커 프로세스가 같은 파일을 다시 열기 위한 설명자"""
+        return str(self.path)
+
+
+def _metadata_chunk(chunk, columns):
+    """메타데이터 청크: 숫자 컬럼은 float64, 나머지는 문자열 (청크마다 같은 스키마)"""
+    frame = pd.DataFrame(index=chunk.index)
+    for column in columns:
+        values = chunk[column] if column in chunk else pd.Series(np.nan, index=chunk.index)
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            frame[column] = values.astype('float64')
+        else:
+            frame[column] = values.astype('string')
+    return frame
+
+
+def build_store(name, raw_dir=RAW_DIR, store_dir=STORE_DIR, coordinate_dtype=DEFAULT_COORDINATE_DTYPE,
+                chunk_rows=DEFAULT_CHUNK_ROWS, district_labels=None, bounds=COORDINATE_BOUNDS,
+                cache_dir=CACHE_DIR):
+    """
+    원본 CSV → 좌표 저장소 (청크 단위로 읽고 이어 씀)
+    district_labels: 구 코드 순서 (None이면 districts 데이터셋 순서, 처음 보는 구는 뒤에 추가)
+    bounds: 좌표 허용 범위 (ingest.validate_dataset, 전국 단위 데이터는 None 또는 더 넓은 범위)
+    cache_dir: districts 데이터셋의 ingest 캐시 디렉토리
+    """
+    raw_dir = Path(raw_dir)
+    path = Path(store_dir) / name
+    path.mkdir(parents=True, exist_ok=True)
+    fingerprint = source_fingerprint(name, raw_dir)
+
+    if district_labels is None:
+        district_labels = load_dataset('districts', raw_dir=raw_dir, cache_dir=cache_dir,
+                                       bounds=bounds)['district'].astype(str)
+    labels = {label: code for code, label in enumerate(pd.unique(pd.Index(district_labels).astype(str)))}
+
+    metadata_file = "metadata.parquet" if pq is not None else "metadata.csv"
+    metadata_columns = None
+    writer = None
+    rows = 0
+    try:
+        with open(path / "latitude.bin", 'wb') as lat_file, \
+                open(path / "longitude.bin", 'wb') as lon_file, \
+                open(path / "district.bin", 'wb') as code_file:
+            for chunk in pd.read_csv(raw_dir / SCHEMAS[name]['file'], chunksize=chunk_rows):
+                chunk = coalesce_coordinates(chunk)
+                for warning in validate_dataset(name, chunk, bounds):
+                    logger.warning(f"   ⚠️  {warning}")
+
+                # ingest 캐시와 같은 정밀도로 맞춘 뒤 저장 dtype으로 변환 (DataFrame 경로와 같은 거리 결과)
+                for column, target in (('latitude', lat_file), ('longitude', lon_file)):
+                    values = chunk[column].to_numpy(dtype=FACILITY_COORDINATE_DTYPE)
+                    target.write(values.astype(coordinate_dtype).tobytes())
+
+                districts = chunk['district'].astype('string')
+                for label in pd.unique(districts.dropna()):
+                    labels.setdefault(label, len(labels))
+                codes = districts.map(labels).fillna(-1).to_numpy(dtype=CODE_DTYPE)
+                code_file.write(codes.tobytes())
+
+                if metadata_columns is None:
+                    metadata_columns = [c for c in chunk.columns if c not in ('latitude', 'longitude', 'district')]
+                metadata = _metadata_chunk(chunk, metadata_columns)
+                if pq is not None:
+                    table = pa.Table.from_pandas(metadata, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(path / metadata_file, table.schema)
+                    writer.write_table(table.cast(writer.schema))
+                else:
+                    metadata.to_csv(path / metadata_file, mode='w' if rows == 0 else 'a',
+                                    header=rows == 0, index=False)
+                rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    meta = {
+        'name': name,
+        'store_version': STORE_VERSION,
+        'rows': rows,
+        'coordinate_dtype': np.dtype(coordinate_dtype).name,
+        'district_labels': list(labels),
+        'metadata_file': metadata_file,
+        'bounds': bounds_key(bounds),
+        'source': {**fingerprint, 'file': SCHEMAS[name]['file']},
+    }
+    with open(path / "meta.json", 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    return CoordinateStore(path)
+
+
+def open_store(name, raw_dir=RAW_DIR, store_dir=STORE_DIR, coordinate_dtype=DEFAULT_COORDINATE_DTYPE,
+               rebuild=False, bounds=COORDINATE_BOUNDS, cache_dir=CACHE_DIR):
+    """좌표 저장소 열기 (원본이 바뀌었거나 저장소가 없으면 다시 생성)"""
+    meta_path = Path(store_dir) / name / "meta.json"
+    if not rebuild and meta_path.exists():
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        source = meta.get('source', {})
+        fingerprint = source_fingerprint(name, Path(raw_dir), {name: source})
+        if (meta.get('store_version') == STORE_VERSION
+                and meta.get('coordinate_dtype') == np.dtype(coordinate_dtype).name
+                and meta.get('bounds') == bounds_key(bounds)
+                and source.get('sha256') == fingerprint['sha256']):
+            return CoordinateStore(meta_path.parent)
+    return build_store(name, raw_dir, store_dir, coordinate_dtype, bounds=bounds, cache_dir=cache_dir)
+
+
+def open_facility_stores(facility_types=FACILITY_DATASETS, **kwargs):
+    """시설 종류별 좌표 저장소 {시설 종류: CoordinateStore}"""
+    return {facility_type: open_store(facility_type, **kwargs) for facility_type in facility_types}
+
+
+def facility_coordinates(facilities):
+    """DataFrame 또는 CoordinateStore → (위도 배열, 경도 배열)"""
+    if isinstance(facilities, CoordinateStore):
+        return facilities.latitude, facilities.longitude
+    return facilities['latitude'].to_numpy(), facilities['longitude'].to_numpy()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="메모리 맵 시설 좌표 저장소 생성")
+    parser.add_argument("datasets", nargs="*", default=FACILITY_DATASETS)
+    parser.add_argument("--dtype", choices=["float32", "float64"], default=DEFAULT_COORDINATE_DTYPE,
+                        help="좌표 저장 dtype (float32는 크기가 절반이지만 거리 계산 시 float64로 복사)")
+    parser.add_argument("--rebuild", action="store_true", help="원본이 그대로여도 다시 생성")
+    add_bounds_arguments(parser)
+    args = parser.parse_args()
+
+    configure_logging()
+    logger.info(f"🗂️  좌표 저장소 생성 ({args.dtype})...")
+    for name in args.datasets:
+        store = open_store(name, coordinate_dtype=args.dtype, rebuild=args.rebuild,
+                           bounds=bounds_from_args(args))
+        size_kb = sum(f.stat().st_size for f in store.path.glob("*.bin")) / 1024
+        logger.info(f"   ✅ {name:16s} {len(store):8,}행 | 좌표 / 구 코드 {size_kb:8.1f}KB | "
+                    f"구 {len(store.district_labels)}개")
+    logger.info(f"\n✅ 저장 위치: {STORE_DIR}")
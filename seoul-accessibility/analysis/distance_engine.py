@@ -0,0 +1,140 @@
+"""
+배치 거리 계산 엔진
+M개 출발지 × N개 시설의 Haversine 거리를 NumPy 배열 연산으로 한 번에 계산
+메모리 사용량을 제한하기 위해 출발지를 청크 단위로 나누어 처리
+"""
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371
+
+# 한 청크에서 만들 거리 행렬의 최대 원소 수 (float64 기준 약 64MB)
+DEFAULT_MAX_ELEMENTS = 8_000_000
+
+
+def haversine_matrix(origin_lats, origin_lons, facility_lats, facility_lons):
+    """
+    출발지 × 시설 거리 행렬 계산 (Haversine 공식)
+    결과: (M, N) 킬로미터 단위 배열
+    """
+    lat1 = np.radians(np.asarray(origin_lats, dtype=np.float64))[:, np.newaxis]
+    lon1 = np.radians(np.asarray(origin_lons, dtype=np.float64))[:, np.newaxis]
+    lat2 = np.radians(np.asarray(facility_lats, dtype=np.float64))[np.newaxis, :]
+    lon2 = np.radians(np.asarray(facility_lons, dtype=np.float64))[np.newaxis, :]
+
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+
+    a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
+    c = 2 * np.arcsin(np.sqrt(a))
+
+    return EARTH_RADIUS_KM * c
+
+
+def _chunk_rows(num_facilities, chunk_size, max_elements):
+    """거리 행렬 크기가 max_elements를 넘지 않도록 청크 행 수 결정"""
+    if chunk_size is not None:
+        return max(1, int(chunk_size))
+    return max(1, max_elements // max(num_facilities, 1))
+
+
+def _valid_coordinates(lats, lons):
+    """좌표가 비어 있는(NaN) 시설 제외"""
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    valid = ~(np.isnan(lats) | np.isnan(lons))
+    return lats[valid], lons[valid]
+
+
+def nearest_and_mean_distances(origin_lats, origin_lons, facility_lats, facility_lons,
+                               top_n=1, chunk_size=None,
+                               max_elements=DEFAULT_MAX_ELEMENTS):
+    """
+    각 출발지에서 최근접 시설 거리와 가까운 N개 시설의 평균 거리 계산
+    결과: (nearest, mean) 길이 M 배열 튜플 (km)
+    """
+    origin_lats = np.asarray(origin_lats, dtype=np.float64)
+    origin_lons = np.asarray(origin_lons, dtype=np.float64)
+    facility_lats, facility_lons = _valid_coordinates(facility_lats, facility_lons)
+
+    num_origins = len(origin_lats)
+    nearest = np.full(num_origins, np.nan)
+    mean = np.full(num_origins, np.nan)
+
+    num_facilities = len(facility_lats)
+    if num_facilities == 0:
+        return nearest, mean
+
+    k = min(top_n, num_facilities)
+    rows = _chunk_rows(num_facilities, chunk_size, max_elements)
+
+    for start in range(0, num_origins, rows):
+        stop = min(start + rows, num_origins)
+        distances = haversine_matrix(
+            origin_lats[start:stop], origin_lons[start:stop],
+            facility_lats, facility_lons
+        )
+
+        if k < num_facilities:
+            distances = np.partition(distances, k - 1, axis=1)[:, :k]
+        # 오름차순으로 합산해야 기존 pandas 계산과 동일한 값이 나옴
+        smallest = np.sort(distances, axis=1)[:, :k]
+
+        nearest[start:stop] = smallest[:, 0]
+        mean[start:stop] = smallest.mean(axis=1)
+
+    return nearest, mean
+
+
+def grouped_nearest_and_mean_distances(origin_lats, origin_lons, origin_groups,
+                                       facility_lats, facility_lons, facility_groups,
+                                       top_n=1, chunk_size=None,
+                                       max_elements=DEFAULT_MAX_ELEMENTS):
+    """
+    출발지와 같은 그룹(예: 자치구)에 속한 시설만 대상으로 최근접 / 평균 거리 계산
+    시설을 그룹 순으로 한 번 정렬한 뒤 그룹별 구간만 잘라 사용 (그룹마다 전체 스캔하지 않음)
+    결과: (nearest, mean) 길이 M 배열 튜플 (km), 같은 그룹 시설이 없으면 NaN
+    """
+    origin_lats = np.asarray(origin_lats, dtype=np.float64)
+    origin_lons = np.asarray(origin_lons, dtype=np.float64)
+    facility_lats = np.asarray(facility_lats, dtype=np.float64)
+    facility_lons = np.asarray(facility_lons, dtype=np.float64)
+    origin_groups = np.asarray(origin_groups)
+    facility_groups = np.asarray(facility_groups)
+
+    nearest = np.full(len(origin_lats), np.nan)
+    mean = np.full(len(origin_lats), np.nan)
+
+    if origin_groups.dtype.kind in 'iu' and facility_groups.dtype.kind in 'iu':
+        # 이미 정수 코드면 그대로 사용 (좌표 저장소의 구 코드, 음수는 그룹 없음)
+        origin_codes = origin_groups.astype(np.int64)
+        facility_codes = facility_groups.astype(np.int64)
+        num_groups = int(max(origin_codes.max(initial=-1), facility_codes.max(initial=-1))) + 1
+    else:
+        # 그룹 이름을 정수 코드로 변환
+        labels, codes = np.unique(
+            np.concatenate([origin_groups.astype(object), facility_groups.astype(object)]).astype(str),
+            return_inverse=True)
+        origin_codes = codes[:len(origin_groups)]
+        facility_codes = codes[len(origin_groups):]
+        num_groups = len(labels)
+
+    # 시설을 코드 순으로 정렬
+    group_ids = np.arange(num_groups + 1)
+    facility_order = np.argsort(facility_codes, kind='stable')
+    facility_bounds = np.searchsorted(facility_codes[facility_order], group_ids)
+    origin_order = np.argsort(origin_codes, kind='stable')
+    origin_bounds = np.searchsorted(origin_codes[origin_order], group_ids)
+
+    for code in np.unique(origin_codes[origin_codes >= 0]):
+        members = facility_order[facility_bounds[code]:facility_bounds[code + 1]]
+        if len(members) == 0:
+            continue
+        origins = origin_order[origin_bounds[code]:origin_bounds[code + 1]]
+        nearest[origins], mean[origins] = nearest_and_mean_distances(
+            origin_lats[origins], origin_lons[origins],
+            facility_lats[members], facility_lons[members],
+            top_n=top_n, chunk_size=chunk_size, max_elements=max_elements
+        )
+
+    return nearest, mean
@@ -0,0 +1,205 @@
+"""
+2단계 유동 집수역(2SFCA / E2SFCA) 접근성
+최근접 / 가까운 N개 평균 거리는 공급(시설)과 수요(인구)의 비율을 반영하지 못하므로,
+집수 반경 안의 시설 공급 대비 인구 수요 비율을 거리 감쇠 가중치로 계산
+
+- 1단계: 시설 j의 공급 대비 수요 비율 R_j = S_j / Σ_i W_ij · P_i
+- 2단계: 출발지 i의 접근성 A_i = Σ_j W_ij · R_j (인구 per_people명당 시설 수)
+- 출발지 × 시설 쌍은 BallTree 반경 질의로 한 번만 찾아 희소 행렬(CSR) W로 만들고,
+  두 단계 모두 희소 행렬-벡터 곱으로 계산 (M × N 밀집 행렬을 만들지 않음)
+- 출발지: 자치구 중심(구 인구) 또는 격자 셀(구 인구 균등 배분)
+"""
+
+import argparse
+import logging
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+
+from calculate_accessibility import PROCESSED_DIR, FACILITY_SPECS, load_facilities
+from grid_accessibility import build_grid
+from spatial_index import FacilityIndex
+from ingest import load_dataset
+from output_writers import write_csv
+from instrumentation import StageRecorder, configure_logging
+
+logger = logging.getLogger(__name__)
+
+DECAY_FUNCTIONS = ['uniform', 'e2sfca', 'gaussian', 'gravity']
+
+# 시설 종류별 기본 집수 반경 (km)
+CATCHMENT_KM = {
+    'hospitals': 3.0,
+    'banks': 2.0,
+    'gov_offices': 3.0,
+    'subway_stations': 1.0,
+}
+
+# E2SFCA 구간 가중치: (집수 반경 대비 거리 상한, 가중치) - Luo & Qi (2009)
+E2SFCA_ZONES = [(1 / 3, 1.0), (2 / 3, 0.68), (1.0, 0.22)]
+
+DEFAULT_DECAY = 'gaussian'
+DEFAULT_GRAVITY_BETA = 1.5
+DEFAULT_PER_PEOPLE = 10_000
+
+
+def decay_weights(distances, radius_km, decay=DEFAULT_DECAY, beta=DEFAULT_GRAVITY_BETA):
+    """
+    집수 반경 안 거리 (km) → 거리 감쇠 가중치
+    uniform: 반경 안이면 1 (기본 2SFCA)
+    e2sfca: 반경을 세 구간으로 나눈 계단형 가중치
+    gaussian: 반경에서 0이 되도록 조정한 가우시안 커널
+    gravity: 중력 모형 (1 + 거리)^-beta
+    """
+    distances = np.asarray(distances, dtype=np.float64)
+    if decay == 'uniform':
+        return np.ones_like(distances)
+    if decay == 'e2sfca':
+        ratio = distances / radius_km
+        return np.select([ratio <= upper for upper, _ in E2SFCA_ZONES],
+                         [weight for _, weight in E2SFCA_ZONES], default=0.0)
+    if decay == 'gaussian':
+        edge = np.exp(-0.5)
+        return (np.exp(-0.5 * (distances / radius_km) ** 2) - edge) / (1 - edge)
+    if decay == 'gravity':
+        return (1 + distances) ** -beta
+    raise ValueError(f"decay는 {DECAY_FUNCTIONS} 중 하나여야 합니다")
+
+
+def catchment_matrix(origin_lats, origin_lons, index, num_facilities, radius_km,
+                     decay=DEFAULT_DECAY, beta=DEFAULT_GRAVITY_BETA):
+    """
+    출발지 × 시설 거리 감쇠 가중치 희소 행렬 (CSR, 출발지 수 × num_facilities)
+    index: 시설 FacilityIndex (열 번호 = 시설 행 위치)
+    반경 질의 결과를 그대로 CSR의 indptr / indices / data로 사용 (가중치 0인 쌍도 구조상 유지)
+    """
+    positions, distances = index.query_radius(origin_lats, origin_lons, radius_km)
+    lengths = np.array([len(p) for p in positions], dtype=np.int64)
+    indptr = np.concatenate([[0], np.cumsum(lengths)])
+    indices = np.concatenate(positions) if len(positions) else np.array([], dtype=np.int64)
+    distances = np.concatenate(distances) if len(distances) else np.array([])
+
+    return csr_matrix((decay_weights(distances, radius_km, decay, beta), indices, indptr),
+                      shape=(len(lengths), num_facilities))
+
+
+def two_step_fca(weights, population, supply, per_people=DEFAULT_PER_PEOPLE):
+    """
+    2SFCA 두 단계 (희소 행렬-벡터 곱 두 번)
+    weights: catchment_matrix 결과 (출발지 수 × 시설 수)
+    결과: (출발지별 접근성 - 인구 per_people명당 시설 수, 시설별 공급 대비 수요 비율)
+    수요가 없는 시설(집수 반경 안에 인구 없음)의 비율은 0
+    """
+    population = np.asarray(population, dtype=np.float64)
+    supply = np.asarray(supply, dtype=np.float64)
+
+    demand = weights.T @ population
+    ratio = np.zeros(len(demand))
+    np.divide(supply, demand, out=ratio, where=demand > 0)
+    return (weights @ ratio) * per_people, ratio
+
+
+def calculate_fca(units, facilities, radius_km=None, decay=DEFAULT_DECAY, beta=DEFAULT_GRAVITY_BETA,
+                  per_people=DEFAULT_PER_PEOPLE, supply_column=None, recorder=None):
+    """
+    시설 종류별 2SFCA 접근성
+    units: latitude / longitude / population 컬럼을 가진 출발지 DataFrame (구 또는 격자 셀)
+    facilities: {시설 종류: DataFrame}
+    radius_km: 모든 시설 종류에 같은 집수 반경 (None이면 CATCHMENT_KM)
+    supply_column: 시설 공급량 컬럼 (예: 병상 수, 없으면 시설당 1)
+    결과: {label}_fca 컬럼의 DataFrame (units와 같은 인덱스)
+    """
+    recorder = recorder or StageRecorder()
+    lats = units['latitude'].to_numpy(dtype=np.float64)
+    lons = units['longitude'].to_numpy(dtype=np.float64)
+    population = units['population'].to_numpy(dtype=np.float64)
+
+    results = pd.DataFrame(index=units.index)
+    for facility_type, spec in FACILITY_SPECS.items():
+        facilities_df = facilities[facility_type]
+        radius = radius_km or CATCHMENT_KM[facility_type]
+
+        with recorder.stage(f'catchment_{facility_type}') as record:
+            weights = catchment_matrix(lats, lons, FacilityIndex.from_dataframe(facilities_df),
+                                       len(facilities_df), radius, decay, beta)
+            record['rows'] = weights.nnz
+
+        if supply_column and supply_column in facilities_df:
+            supply = facilities_df[supply_column].fillna(0).to_numpy(dtype=np.float64)
+        else:
+            supply = np.ones(len(facilities_df))
+
+        with recorder.stage(f'fca_{facility_type}', rows=weights.nnz):
+            accessibility, _ = two_step_fca(weights, population, supply, per_people)
+        results[f"{spec['label']}_fca"] = accessibility
+
+        logger.info(f"   ✅ {spec['display_name']}: 반경 {radius:g}km | 출발지-시설 쌍 {weights.nnz:,}개 | "
+                    f"평균 {np.average(accessibility, weights=population):.3f}개 / {per_people:,}명")
+
+    return results
+
+
+def aggregate_to_districts(cells, columns):
+    """격자 셀 접근성 → 자치구별 인구 가중 평균"""
+    weighted = cells[columns].mul(cells['population'], axis=0)
+    weighted['district'] = cells['district']
+    weighted['population'] = cells['population']
+    grouped = weighted.groupby('district', observed=True).sum()
+    return grouped[columns].div(grouped['population'], axis=0).reset_index()
+
+
+def analyze_fca(units='grid', cell_m=100, radius_km=None, decay=DEFAULT_DECAY,
+                beta=DEFAULT_GRAVITY_BETA, per_people=DEFAULT_PER_PEOPLE, recorder=None):
+    """
+    2SFCA 분석 후 결과 저장
+    units: 'district' (구 중심) 또는 'grid' (격자 셀, 자치구 인구 가중 평균도 함께 저장)
+    결과: 출발지별 결과 DataFrame
+    """
+    if units not in ('district', 'grid'):
+        raise ValueError(f"units must be 'district' or 'grid', got {units!r}")
+
+    logger.info(f"📊 2SFCA 접근성 분석 ({units}, 감쇠: {decay})...\n")
+    districts = load_dataset('districts')
+    facilities = load_facilities()
+
+    if units == 'grid':
+        origins = build_grid(districts, cell_m=cell_m)
+        logger.info(f"   ✅ 격자 셀: {len(origins):,}개")
+    else:
+        origins = districts[['district', 'latitude', 'longitude', 'population']].copy()
+
+    fca = calculate_fca(origins, facilities, radius_km, decay, beta, per_people, recorder=recorder)
+    results = pd.concat([origins, fca], axis=1)
+
+    output = PROCESSED_DIR / f"fca_{units}_scores.csv"
+    write_csv(results, output)
+    logger.info(f"\n   ✅ 2SFCA 결과 저장: {output}")
+
+    if units == 'grid':
+        district_output = PROCESSED_DIR / "fca_grid_district_scores.csv"
+        write_csv(aggregate_to_districts(results, list(fca.columns)), district_output)
+        logger.info(f"   ✅ 자치구 집계 결과 저장: {district_output}")
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="2SFCA / E2SFCA 공급-수요 접근성")
+    parser.add_argument("--units", choices=["district", "grid"], default="grid",
+                        help="출발지 단위 (district: 구 중심, grid: 격자 셀)")
+    parser.add_argument("--cell-m", type=int, default=100, help="격자 크기 (m)")
+    parser.add_argument("--radius-km", type=float, default=None,
+                        help="집수 반경 (기본: 시설 종류별 CATCHMENT_KM)")
+    parser.add_argument("--decay", choices=DECAY_FUNCTIONS, default=DEFAULT_DECAY,
+                        help="거리 감쇠 함수 (uniform: 2SFCA, e2sfca: 계단형 E2SFCA)")
+    parser.add_argument("--beta", type=float, default=DEFAULT_GRAVITY_BETA, help="gravity 감쇠 지수")
+    parser.add_argument("--per-people", type=int, default=DEFAULT_PER_PEOPLE,
+                        help="접근성 단위 인구 (인구 N명당 시설 수)")
+    parser.add_argument("--quiet", action="store_true", help="경고 외 콘솔 출력 생략")
+    args = parser.parse_args()
+
+    configure_logging(quiet=args.quiet)
+    analyze_fca(units=args.units, cell_m=args.cell_m, radius_km=args.radius_km, decay=args.decay,
+                beta=args.beta, per_people=args.per_people)
+    logger.info("\n✅ 2SFCA 분석 완료!")
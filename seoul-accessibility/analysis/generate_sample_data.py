@@ -5,9 +5,19 @@
 
 import pandas as pd
 import numpy as np
+import argparse
 import json
+import string
+import zlib
 from pathlib import Path
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    # pyarrow가 없으면 pandas.to_csv로 기록
+    pacsv = None
+
 # 프로젝트 루트 경로
 PROJECT_ROOT = Path(__file__).parent.parent
 DATA_DIR = PROJECT_ROOT / "data" / "raw"
@@ -43,32 +53,96 @@ SEOUL_DISTRICTS = {
 }
 
 
-def generate_hospitals(num_hospitals=500):
-    """병원/의원 데이터 생성"""
+HOSPITAL_TYPES = ["종합병원", "병원", "의원", "한의원"]
+HOSPITAL_TYPE_PROBS = [0.05, 0.15, 0.6, 0.2]
+SPECIALTIES = [
+    "내과", "외과", "정형외과", "소아청소년과",
+    "산부인과", "안과", "이비인후과", "치과"
+]
+
+BANK_TYPES = ["시중은행", "지방은행", "ATM"]
+BANK_TYPE_PROBS = [0.4, 0.3, 0.3]
+BANK_NAMES = [
+    "KB국민은행", "신한은행", "우리은행", "하나은행",
+    "NH농협", "IBK기업은행"
+]
+
+SUBWAY_LINES = [
+    "1호선", "2호선", "3호선", "4호선", "5호선",
+    "6호선", "7호선", "8호선", "9호선"
+]
+
+# 주요 역들 (실제 좌표 근사치)
+MAJOR_STATIONS = [
+    {"name": "강남역", "line": "2호선", "lat": 37.4979, "lon": 127.0276, "district": "강남구"},
+    {"name": "역삼역", "line": "2호선", "lat": 37.5005, "lon": 127.0365, "district": "강남구"},
+    {"name": "선릉역", "line": "2호선", "lat": 37.5047, "lon": 127.0490, "district": "강남구"},
+    {"name": "삼성역", "line": "2호선", "lat": 37.5087, "lon": 127.0634, "district": "강남구"},
+    {"name": "잠실역", "line": "2호선", "lat": 37.5133, "lon": 127.1000, "district": "송파구"},
+    {"name": "강남구청역", "line": "7호선", "lat": 37.5174, "lon": 127.0416, "district": "강남구"},
+    {"name": "신림역", "line": "2호선", "lat": 37.4843, "lon": 126.9298, "district": "관악구"},
+    {"name": "서울대입구역", "line": "2호선", "lat": 37.4813, "lon": 126.9527, "district": "관악구"},
+    {"name": "홍대입구역", "line": "2호선", "lat": 37.5572, "lon": 126.9236, "district": "마포구"},
+    {"name": "신촌역", "line": "2호선", "lat": 37.5556, "lon": 126.9369, "district": "서대문구"},
+    {"name": "시청역", "line": "1호선", "lat": 37.5660, "lon": 126.9771, "district": "중구"},
+    {"name": "을지로입구역", "line": "2호선", "lat": 37.5660, "lon": 126.9826, "district": "중구"},
+    {"name": "종로3가역", "line": "1호선", "lat": 37.5711, "lon": 126.9918, "district": "종로구"},
+    {"name": "광화문역", "line": "5호선", "lat": 37.5719, "lon": 126.9762, "district": "종로구"},
+    {"name": "노원역", "line": "4호선", "lat": 37.6555, "lon": 127.0613, "district": "노원구"},
+    {"name": "수유역", "line": "4호선", "lat": 37.6383, "lon": 127.0253, "district": "강북구"},
+    {"name": "구로디지털단지역", "line": "2호선", "lat": 37.4853, "lon": 126.9015, "district": "구로구"},
+    {"name": "영등포구청역", "line": "5호선", "lat": 37.5245, "lon": 126.8959, "district": "영등포구"},
+]
+
+
+def hospital_count(district, info, scale=1.0):
+    """구별 병원 수"""
+    # 인구 비례하여 병원 수 배분 (but 강남 집중도 반영)
+    base_count = int((info["population"] / 500000) * 20)
+
+    # 강남 3구에 추가 가중치
+    if district in ["강남구", "서초구", "송파구"]:
+        num = int(base_count * 1.8)
+    # 외곽 지역은 적게
+    elif district in ["강북구", "도봉구", "금천구", "강동구"]:
+        num = int(base_count * 0.6)
+    else:
+        num = base_count
+    return int(num * scale)
+
+
+def bank_count(district, info, scale=1.0):
+    """구별 은행 수"""
+    # 강남권에 은행 집중
+    base_count = int((info["population"] / 500000) * 15)
+
+    if district in ["강남구", "서초구", "송파구", "중구", "종로구"]:
+        num = int(base_count * 2.0)
+    elif district in ["강북구", "도봉구", "금천구"]:
+        num = int(base_count * 0.5)
+    else:
+        num = base_count
+    return int(num * scale)
+
+
+def station_count(district, info, scale=1.0):
+    """구별 추가 지하철역 수 (면적에 비례)"""
+    return int((int((info["area_km2"] / 30) * 5) + 1) * scale)
+
+
+def generate_hospitals(num_hospitals=500, scale=1.0):
+    """병원/의원 데이터 생성 (scale: 구별 시설 수 배율)"""
     hospitals = []
 
     for district, info in SEOUL_DISTRICTS.items():
-        # 인구 비례하여 병원 수 배분 (but 강남 집중도 반영)
-        base_count = int((info["population"] / 500000) * 20)
-
-        # 강남 3구에 추가 가중치
-        if district in ["강남구", "서초구", "송파구"]:
-            num = int(base_count * 1.8)
-        # 외곽 지역은 적게
-        elif district in ["강북구", "도봉구", "금천구", "강동구"]:
-            num = int(base_count * 0.6)
-        else:
-            num = base_count
+        num = hospital_count(district, info, scale)
 
         for i in range(num):
             # 구 중심 좌표에서 랜덤 분산
             lat = info["lat"] + np.random.normal(0, 0.02)
             lon = info["lon"] + np.random.normal(0, 0.02)
 
-            hospital_type = np.random.choice(
-                ["종합병원", "병원", "의원", "한의원"],
-                p=[0.05, 0.15, 0.6, 0.2]
-            )
+            hospital_type = np.random.choice(HOSPITAL_TYPES, p=HOSPITAL_TYPE_PROBS)
 
             hospitals.append({
                 "name": f"{district} {hospital_type} {i+1}",
@@ -76,38 +150,24 @@ def generate_hospitals(num_hospitals=500):
                 "district": district,
                 "latitude": lat,
                 "longitude": lon,
-                "specialty": np.random.choice([
-                    "내과", "외과", "정형외과", "소아청소년과",
-                    "산부인과", "안과", "이비인후과", "치과"
-                ])
+                "specialty": np.random.choice(SPECIALTIES)
             })
 
     return pd.DataFrame(hospitals)
 
 
-def generate_banks(num_banks=400):
-    """은행/ATM 데이터 생성"""
+def generate_banks(num_banks=400, scale=1.0):
+    """은행/ATM 데이터 생성 (scale: 구별 시설 수 배율)"""
     banks = []
 
     for district, info in SEOUL_DISTRICTS.items():
-        # 강남권에 은행 집중
-        base_count = int((info["population"] / 500000) * 15)
-
-        if district in ["강남구", "서초구", "송파구", "중구", "종로구"]:
-            num = int(base_count * 2.0)
-        elif district in ["강북구", "도봉구", "금천구"]:
-            num = int(base_count * 0.5)
-        else:
-            num = base_count
+        num = bank_count(district, info, scale)
 
         for i in range(num):
             lat = info["lat"] + np.random.normal(0, 0.02)
             lon = info["lon"] + np.random.normal(0, 0.02)
 
-            bank_type = np.random.choice(
-                ["시중은행", "지방은행", "ATM"],
-                p=[0.4, 0.3, 0.3]
-            )
+            bank_type = np.random.choice(BANK_TYPES, p=BANK_TYPE_PROBS)
 
             banks.append({
                 "name": f"{district} {bank_type} {i+1}",
@@ -115,17 +175,14 @@ def generate_banks(num_banks=400):
                 "district": district,
                 "latitude": lat,
                 "longitude": lon,
-                "bank_name": np.random.choice([
-                    "KB국민은행", "신한은행", "우리은행", "하나은행",
-                    "NH농협", "IBK기업은행"
-                ])
+                "bank_name": np.random.choice(BANK_NAMES)
             })
 
     return pd.DataFrame(banks)
 
 
-def generate_gov_offices():
-    """행정시설 데이터 생성 (주민센터, 구청)"""
+def generate_gov_offices(scale=1.0):
+    """행정시설 데이터 생성 (주민센터, 구청 / scale: 주민센터 수 배율)"""
     offices = []
 
     for district, info in SEOUL_DISTRICTS.items():
@@ -139,7 +196,7 @@ def generate_gov_offices():
         })
 
         # 주민센터 (동) - 구마다 10-20개
-        num_dongs = np.random.randint(10, 21)
+        num_dongs = int(np.random.randint(10, 21) * scale)
         for i in range(num_dongs):
             lat = info["lat"] + np.random.normal(0, 0.025)
             lon = info["lon"] + np.random.normal(0, 0.025)
@@ -155,38 +212,16 @@ def generate_gov_offices():
     return pd.DataFrame(offices)
 
 
-def generate_subway_stations():
-    """지하철역 데이터 생성"""
+def generate_subway_stations(scale=1.0):
+    """지하철역 데이터 생성 (scale: 추가 역 수 배율)"""
     stations = []
 
-    # 주요 역들 (실제 좌표 근사치)
-    major_stations = [
-        {"name": "강남역", "line": "2호선", "lat": 37.4979, "lon": 127.0276, "district": "강남구"},
-        {"name": "역삼역", "line": "2호선", "lat": 37.5005, "lon": 127.0365, "district": "강남구"},
-        {"name": "선릉역", "line": "2호선", "lat": 37.5047, "lon": 127.0490, "district": "강남구"},
-        {"name": "삼성역", "line": "2호선", "lat": 37.5087, "lon": 127.0634, "district": "강남구"},
-        {"name": "잠실역", "line": "2호선", "lat": 37.5133, "lon": 127.1000, "district": "송파구"},
-        {"name": "강남구청역", "line": "7호선", "lat": 37.5174, "lon": 127.0416, "district": "강남구"},
-        {"name": "신림역", "line": "2호선", "lat": 37.4843, "lon": 126.9298, "district": "관악구"},
-        {"name": "서울대입구역", "line": "2호선", "lat": 37.4813, "lon": 126.9527, "district": "관악구"},
-        {"name": "홍대입구역", "line": "2호선", "lat": 37.5572, "lon": 126.9236, "district": "마포구"},
-        {"name": "신촌역", "line": "2호선", "lat": 37.5556, "lon": 126.9369, "district": "서대문구"},
-        {"name": "시청역", "line": "1호선", "lat": 37.5660, "lon": 126.9771, "district": "중구"},
-        {"name": "을지로입구역", "line": "2호선", "lat": 37.5660, "lon": 126.9826, "district": "중구"},
-        {"name": "종로3가역", "line": "1호선", "lat": 37.5711, "lon": 126.9918, "district": "종로구"},
-        {"name": "광화문역", "line": "5호선", "lat": 37.5719, "lon": 126.9762, "district": "종로구"},
-        {"name": "노원역", "line": "4호선", "lat": 37.6555, "lon": 127.0613, "district": "노원구"},
-        {"name": "수유역", "line": "4호선", "lat": 37.6383, "lon": 127.0253, "district": "강북구"},
-        {"name": "구로디지털단지역", "line": "2호선", "lat": 37.4853, "lon": 126.9015, "district": "구로구"},
-        {"name": "영등포구청역", "line": "5호선", "lat": 37.5245, "lon": 126.8959, "district": "영등포구"},
-    ]
-
-    stations.extend(major_stations)
+    stations.extend(dict(station) for station in MAJOR_STATIONS)
 
     # 각 구마다 추가 역 생성
     for district, info in SEOUL_DISTRICTS.items():
         # 면적에 비례하여 역 수 결정
-        num_stations = int((info["area_km2"] / 30) * 5) + 1
+        num_stations = station_count(district, info, scale)
 
         for i in range(num_stations):
             lat = info["lat"] + np.random.normal(0, 0.03)
@@ -194,10 +229,7 @@ def generate_subway_stations():
 
             stations.append({
                 "name": f"{district} {i+1}역",
-                "line": np.random.choice([
-                    "1호선", "2호선", "3호선", "4호선", "5호선",
-                    "6호선", "7호선", "8호선", "9호선"
-                ]),
+                "line": np.random.choice(SUBWAY_LINES),
                 "latitude": lat,
                 "longitude": lon,
                 "district": district
@@ -249,6 +281,241 @@ def generate_population_data():
     return pd.DataFrame(population)
 
 
+def generate_districts():
+    """자치구 정보 데이터 생성"""
+    return pd.DataFrame([
+        {
+            "district": name,
+            "latitude": info["lat"],
+            "longitude": info["lon"],
+            "population": info["population"],
+            "area_km2": info["area_km2"]
+        }
+        for name, info in SEOUL_DISTRICTS.items()
+    ])
+
+
+def generate_datasets(scale=1.0, seed=None, bulk=False):
+    """
+    모든 데이터셋 생성 (저장하지 않음)
+    scale: 시설 수 배율 (벤치마크용 확대 데이터셋)
+    seed: 지정하면 재현 가능한 데이터 생성
+    bulk: True면 벡터화 생성기(numpy.random.Generator) 사용
+    결과: {데이터셋 이름: DataFrame}
+    """
+    if bulk:
+        datasets = {
+            kind: generate_facilities_bulk(kind, scale, _kind_seed(seed, kind))
+            for kind in BULK_SPECS
+        }
+        datasets["population"] = generate_population_data()
+        datasets["districts"] = generate_districts()
+        return datasets
+
+    if seed is not None:
+        np.random.seed(seed)
+
+    return {
+        "hospitals": generate_hospitals(scale=scale),
+        "banks": generate_banks(scale=scale),
+        "gov_offices": generate_gov_offices(scale=scale),
+        "subway_stations": generate_subway_stations(scale=scale),
+        "population": generate_population_data(),
+        "districts": generate_districts(),
+    }
+
+
+def write_datasets(datasets, data_dir=DATA_DIR):
+    """데이터셋을 {이름}.csv로 저장"""
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    for name, df in datasets.items():
+        df.to_csv(data_dir / f"{name}.csv", index=False, encoding="utf-8-sig")
+
+
+# ---------------------------------------------------------------------------
+# 대용량 벡터화 생성 (부하 테스트용)
+# 좌표 / 범주형 값을 numpy.random.Generator로 한 번에 뽑아 컬럼을 직접 구성하고,
+# 청크 단위로 나누어 디스크에 바로 기록할 수 있음
+# ---------------------------------------------------------------------------
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+_DISTRICT_NAMES = np.array(list(SEOUL_DISTRICTS))
+_DISTRICT_LATS = np.array([info["lat"] for info in SEOUL_DISTRICTS.values()])
+_DISTRICT_LONS = np.array([info["lon"] for info in SEOUL_DISTRICTS.values()])
+
+# 시설 종류별 벡터화 생성 설정
+# columns: 출력 컬럼 순서 / sigma: 구 중심 기준 좌표 분산(도)
+# categories: {컬럼: (값 목록, 확률)} / name: 이름 컬럼 형식
+BULK_SPECS = {
+    "hospitals": {
+        "columns": ["name", "type", "district", "latitude", "longitude", "specialty"],
+        "sigma": 0.02,
+        "categories": {"type": (HOSPITAL_TYPES, HOSPITAL_TYPE_PROBS), "specialty": (SPECIALTIES, None)},
+        "name": "{district} {type} {i}",
+    },
+    "banks": {
+        "columns": ["name", "type", "district", "latitude", "longitude", "bank_name"],
+        "sigma": 0.02,
+        "categories": {"type": (BANK_TYPES, BANK_TYPE_PROBS), "bank_name": (BANK_NAMES, None)},
+        "name": "{district} {type} {i}",
+    },
+    "gov_offices": {
+        "columns": ["name", "type", "district", "latitude", "longitude"],
+        "sigma": 0.025,
+        "categories": {"type": (["주민센터"], None)},
+        "name": "{district} {i}동 주민센터",
+    },
+    "subway_stations": {
+        "columns": ["name", "line", "latitude", "longitude", "district"],
+        "sigma": 0.03,
+        "categories": {"line": (SUBWAY_LINES, None)},
+        "name": "{district} {i}역",
+    },
+}
+
+
+def _bulk_counts(kind, scale, rng):
+    """구별 생성 개수 배열 (SEOUL_DISTRICTS 순서)"""
+    items = list(SEOUL_DISTRICTS.items())
+    if kind == "hospitals":
+        return np.array([hospital_count(d, info, scale) for d, info in items], dtype=np.int64)
+    if kind == "banks":
+        return np.array([bank_count(d, info, scale) for d, info in items], dtype=np.int64)
+    if kind == "subway_stations":
+        return np.array([station_count(d, info, scale) for d, info in items], dtype=np.int64)
+    # 주민센터: 구마다 10-20개
+    return (rng.integers(10, 21, size=len(items)) * scale).astype(np.int64)
+
+
+def _bulk_fixed_rows(kind):
+    """무작위가 아닌 고정 행 (구청, 주요 역)"""
+    if kind == "gov_offices":
+        return pd.DataFrame({
+            "name": [f"{district} 구청" for district in SEOUL_DISTRICTS],
+            "type": "구청",
+            "district": list(SEOUL_DISTRICTS),
+            "latitude": _DISTRICT_LATS,
+            "longitude": _DISTRICT_LONS,
+        })
+    if kind == "subway_stations":
+        major = pd.DataFrame(MAJOR_STATIONS)
+        return major.rename(columns={"lat": "latitude", "lon": "longitude"})[BULK_SPECS[kind]["columns"]]
+    return None
+
+
+def _format_names(template, districts, columns, local_index):
+    """이름 컬럼을 행 단위 포맷 없이 NumPy 문자열 연산으로 생성"""
+    parts = {"district": districts, "i": local_index.astype(str)}
+    parts.update(columns)
+
+    result = np.full(len(districts), "", dtype="<U1")
+    for literal, field, _, _ in string.Formatter().parse(template):
+        if literal:
+            result = np.char.add(result, literal)
+        if field:
+            result = np.char.add(result, parts[field].astype(str))
+    return result
+
+
+def iter_facility_chunks(kind, scale=1.0, seed=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    시설 데이터를 청크(DataFrame) 단위로 생성
+    필드마다 독립된 난수 스트림을 쓰므로 같은 seed면 chunk_rows와 관계없이 같은 데이터가 나옴
+    """
+    spec = BULK_SPECS[kind]
+    count_rng, lat_rng, lon_rng, *category_rngs = [
+        np.random.default_rng(child)
+        for child in np.random.SeedSequence(seed).spawn(3 + len(spec["categories"]))
+    ]
+
+    fixed = _bulk_fixed_rows(kind)
+    if fixed is not None:
+        yield fixed[spec["columns"]]
+
+    counts = _bulk_counts(kind, scale, count_rng)
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    total = int(offsets[-1])
+
+    for start in range(0, total, chunk_rows):
+        rows = np.arange(start, min(start + chunk_rows, total))
+        district_idx = np.searchsorted(offsets, rows, side="right") - 1
+        districts = _DISTRICT_NAMES[district_idx]
+
+        columns = {
+            "district": districts,
+            "latitude": _DISTRICT_LATS[district_idx] + lat_rng.normal(0, spec["sigma"], len(rows)),
+            "longitude": _DISTRICT_LONS[district_idx] + lon_rng.normal(0, spec["sigma"], len(rows)),
+        }
+        for (column, (values, probs)), rng in zip(spec["categories"].items(), category_rngs):
+            columns[column] = np.asarray(values)[rng.choice(len(values), size=len(rows), p=probs)]
+
+        local_index = rows - offsets[district_idx] + 1
+        categorical = {column: np.asarray(columns[column]) for column in spec["categories"]}
+        columns["name"] = _format_names(spec["name"], districts, categorical, local_index)
+
+        # 반복 문자열 컬럼은 category로 두어 메모리 절약
+        for column in ["district"] + list(spec["categories"]):
+            columns[column] = pd.Categorical(columns[column])
+        yield pd.DataFrame({column: columns[column] for column in spec["columns"]})
+
+
+def _kind_seed(seed, kind):
+    """시설 종류별 독립 시드 (종류를 추가해도 기존 종류의 데이터가 바뀌지 않도록 이름으로 구분)"""
+    return None if seed is None else [seed, zlib.crc32(kind.encode("utf-8"))]
+
+
+def generate_facilities_bulk(kind, scale=1.0, seed=None):
+    """시설 데이터를 한 번에 생성 (메모리에 모두 올림)"""
+    return pd.concat(list(iter_facility_chunks(kind, scale, seed)), ignore_index=True)
+
+
+def _write_csv_chunk(chunk, f, header):
+    """CSV 청크 기록 (pyarrow가 있으면 pyarrow.csv 사용, 없으면 pandas)"""
+    if pacsv is None:
+        chunk.to_csv(f, index=False, header=header)
+        return
+    # 청크마다 category 사전이 다르므로 문자열로 풀어서 같은 스키마로 기록
+    chunk = chunk.astype({
+        column: str for column, dtype in chunk.dtypes.items()
+        if isinstance(dtype, pd.CategoricalDtype)
+    })
+    table = pa.Table.from_pandas(chunk, preserve_index=False)
+    pacsv.write_csv(table, f, write_options=pacsv.WriteOptions(include_header=header))
+
+
+def stream_facilities_to_csv(kind, path, scale=1.0, seed=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """시설 데이터를 청크 단위로 생성하여 CSV에 바로 기록 (전체를 메모리에 올리지 않음)"""
+    rows = 0
+    with open(path, "wb") as f:
+        f.write("\ufeff".encode("utf-8"))  # 다른 원본 CSV와 같은 utf-8-sig
+        for i, chunk in enumerate(iter_facility_chunks(kind, scale, seed, chunk_rows)):
+            _write_csv_chunk(chunk, f, header=(i == 0))
+            rows += len(chunk)
+    return rows
+
+
+def stream_datasets(data_dir=DATA_DIR, scale=1.0, seed=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    모든 데이터셋을 벡터화 생성기로 만들어 청크 단위로 저장
+    결과: {데이터셋 이름: 행 수}
+    """
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    rows = {
+        kind: stream_facilities_to_csv(kind, data_dir / f"{kind}.csv", scale,
+                                       _kind_seed(seed, kind), chunk_rows)
+        for kind in BULK_SPECS
+    }
+
+    small = {"population": generate_population_data(), "districts": generate_districts()}
+    write_datasets(small, data_dir)
+    rows.update({name: len(df) for name, df in small.items()})
+    return rows
+
+
 def save_datasets():
     """모든 데이터셋 생성 및 저장"""
     print("🏥 병원 데이터 생성 중...")
@@ -278,16 +545,7 @@ def save_datasets():
 
     # 자치구 정보 저장
     print("\n📍 자치구 정보 저장 중...")
-    districts_df = pd.DataFrame([
-        {
-            "district": name,
-            "latitude": info["lat"],
-            "longitude": info["lon"],
-            "population": info["population"],
-            "area_km2": info["area_km2"]
-        }
-        for name, info in SEOUL_DISTRICTS.items()
-    ])
+    districts_df = generate_districts()
     districts_df.to_csv(DATA_DIR / "districts.csv", index=False, encoding="utf-8-sig")
     print(f"   ✅ {len(districts_df)}개 자치구 정보 저장")
 
@@ -307,4 +565,21 @@ def save_datasets():
 
 
 if __name__ == "__main__":
-    save_datasets()
+    parser = argparse.ArgumentParser(description="서울시 생활 서비스 샘플 데이터 생성")
+    parser.add_argument("--bulk", action="store_true",
+                        help="벡터화 생성기로 대용량 데이터를 청크 단위로 저장")
+    parser.add_argument("--scale", type=float, default=1.0, help="시설 수 배율 (--bulk 전용)")
+    parser.add_argument("--seed", type=int, default=None, help="난수 시드 (--bulk 전용)")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help="청크당 행 수 (--bulk 전용)")
+    parser.add_argument("--output-dir", type=Path, default=DATA_DIR, help="저장 위치 (--bulk 전용)")
+    args = parser.parse_args()
+
+    if args.bulk:
+        print(f"⚡ 벡터화 생성기로 데이터 생성 중 (x{args.scale:g}, seed={args.seed})...")
+        rows = stream_datasets(args.output_dir, args.scale, args.seed, args.chunk_rows)
+        for name, count in rows.items():
+            print(f"   ✅ {name}: {count:,}행")
+        print(f"📁 저장 위치: {args.output_dir}")
+    else:
+        save_datasets()
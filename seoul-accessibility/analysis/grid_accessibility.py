@@ -0,0 +1,196 @@
+"""
+서울시 격자 단위 생활 서비스 접근성 분석
+자치구 중심점 25개 대신 촘촘한 정사각형 격자(기본 100m)의 모든 셀을 점수화하고,
+인구 가중 평균으로 자치구 단위 점수를 다시 집계
+"""
+
+import argparse
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from calculate_accessibility import (
+    PROCESSED_DIR, FACILITY_SPECS,
+    load_facilities, calculate_scores, assign_grades,
+)
+from distance_engine import EARTH_RADIUS_KM, haversine_matrix
+from spatial_index import build_facility_indexes
+from ingest import CACHE_DIR, RAW_DIR, load_dataset
+from output_writers import write_csv
+from instrumentation import StageRecorder, configure_logging
+
+logger = logging.getLogger(__name__)
+
+# 셀 밀도 계산에 사용하는 반경 (km)
+DENSITY_RADIUS_KM = 1.0
+
+SCORE_COLUMNS = [
+    'medical_score', 'financial_score', 'transport_score',
+    'administrative_score', 'total_accessibility_score',
+]
+
+
+def build_grid(districts_df, cell_m=100):
+    """
+    서울시를 덮는 정사각형 격자 생성
+    각 구는 면적이 같은 원(반지름 √(면적/π))으로 근사하고,
+    구 반지름 대비 거리가 가장 가까운 구에 셀을 배정 (어느 원에도 속하지 않는 셀은 제외)
+    결과: cell_id, latitude, longitude, district, population 컬럼의 DataFrame
+    """
+    lats = districts_df['latitude'].to_numpy(dtype=np.float64)
+    lons = districts_df['longitude'].to_numpy(dtype=np.float64)
+    radius_km = np.sqrt(districts_df['area_km2'].to_numpy(dtype=np.float64) / np.pi)
+
+    km_per_deg_lat = EARTH_RADIUS_KM * np.pi / 180
+    km_per_deg_lon = km_per_deg_lat * np.cos(np.radians(lats.mean()))
+    cell_km = cell_m / 1000
+
+    lat_min = (lats - radius_km / km_per_deg_lat).min()
+    lat_max = (lats + radius_km / km_per_deg_lat).max()
+    lon_min = (lons - radius_km / km_per_deg_lon).min()
+    lon_max = (lons + radius_km / km_per_deg_lon).max()
+
+    grid_lats = np.arange(lat_min, lat_max, cell_km / km_per_deg_lat) + cell_km / km_per_deg_lat / 2
+    grid_lons = np.arange(lon_min, lon_max, cell_km / km_per_deg_lon) + cell_km / km_per_deg_lon / 2
+    cell_lons, cell_lats = np.meshgrid(grid_lons, grid_lats)
+    cell_lats = cell_lats.ravel()
+    cell_lons = cell_lons.ravel()
+
+    # 셀 × 구 중심 거리 행렬 (구가 25개뿐이므로 한 번에 계산)
+    ratio = haversine_matrix(cell_lats, cell_lons, lats, lons) / radius_km
+    nearest_district = ratio.argmin(axis=1)
+    inside = ratio[np.arange(len(ratio)), nearest_district] <= 1.0
+
+    cells = pd.DataFrame({
+        'cell_id': np.flatnonzero(inside),
+        'latitude': cell_lats[inside],
+        'longitude': cell_lons[inside],
+        'district': districts_df['district'].to_numpy()[nearest_district[inside]],
+    })
+
+    # 세부 인구 자료가 없으므로 구 인구를 구 내 셀에 균등 배분
+    cells_per_district = cells['district'].map(cells['district'].value_counts())
+    district_population = cells['district'].map(
+        districts_df.set_index('district')['population'])
+    cells['population'] = district_population / cells_per_district
+
+    return cells
+
+
+def score_cells(cells, indexes):
+    """
+    셀별 최근접 / 평균 거리, 반경 밀도 및 접근성 점수 계산
+    indexes: spatial_index.build_facility_indexes 결과 (서울시 전체 시설)
+    """
+    lats = cells['latitude'].to_numpy()
+    lons = cells['longitude'].to_numpy()
+    density_area_km2 = np.pi * DENSITY_RADIUS_KM ** 2
+
+    for facility_type, spec in FACILITY_SPECS.items():
+        index = indexes[facility_type]
+        label = spec['label']
+
+        nearest, mean = index.nearest_and_mean_distances(lats, lons, top_n=spec['top_n'] or 1)
+        cells[f'nearest_{label}_km'] = nearest
+        if spec['top_n']:
+            cells[f'avg_{label}_dist_km'] = mean
+        if spec['density']:
+            cells[f'{label}_density'] = (
+                index.count_within(lats, lons, DENSITY_RADIUS_KM) / density_area_km2)
+
+    return calculate_scores(cells)
+
+
+def aggregate_to_districts(cells):
+    """셀 점수를 인구 가중 평균으로 자치구 단위 집계"""
+    value_columns = [
+        column for column in cells.columns
+        if column.endswith('_km') or column.endswith('_density')
+    ] + SCORE_COLUMNS
+
+    weights = cells['population']
+    weighted = cells[value_columns].mul(weights, axis=0)
+    weighted['district'] = cells['district']
+    weighted['population'] = weights
+
+    grouped = weighted.groupby('district').sum()
+    district_scores = grouped[value_columns].div(grouped['population'], axis=0)
+    district_scores['total_accessibility_score'] = district_scores['total_accessibility_score'].round(2)
+    district_scores['grade'] = assign_grades(district_scores['total_accessibility_score'])
+    district_scores.insert(0, 'num_cells', cells.groupby('district').size())
+
+    return district_scores.reset_index()
+
+
+def analyze_grid_accessibility(cell_m=100, tiles=False, recorder=None,
+                               raw_dir=RAW_DIR, cache_dir=CACHE_DIR, output_dir=PROCESSED_DIR):
+    """
+    격자 단위 접근성 분석 후 셀 / 자치구 결과 저장
+    tiles: True면 셀 점수로 히트맵 타일까지 생성 (tiles.py, 바뀐 타일만 다시 저장)
+    recorder: instrumentation.StageRecorder (단계별 시간 / 행 수 / 메모리 기록)
+    raw_dir / cache_dir / output_dir: 원본 CSV / 캐시 / 결과 디렉토리
+    """
+    recorder = recorder or StageRecorder()
+    logger.info(f"📊 서울시 격자({cell_m}m) 접근성 분석 시작...\n")
+
+    with recorder.stage('load') as record:
+        districts = load_dataset('districts', raw_dir=raw_dir, cache_dir=cache_dir)
+        facilities = load_facilities(raw_dir, cache_dir)
+        record['rows'] = len(districts) + sum(map(len, facilities.values()))
+
+    with recorder.stage('index') as record:
+        indexes = build_facility_indexes(facilities)
+        cells = build_grid(districts, cell_m=cell_m)
+        record['rows'] = len(cells)
+    logger.info(f"   ✅ 격자 셀: {len(cells):,}개")
+
+    # 셀별 거리 / 밀도 지표 + 점수
+    with recorder.stage('score', rows=len(cells)):
+        cells = score_cells(cells, indexes)
+    with recorder.stage('aggregate', rows=len(cells)):
+        district_scores = aggregate_to_districts(cells)
+
+    with recorder.stage('save', rows=len(cells)):
+        cell_output = output_dir / "grid_accessibility_scores.csv"
+        write_csv(cells, cell_output)
+        logger.info(f"   ✅ 셀 단위 결과 저장: {cell_output}")
+
+        district_output = output_dir / "grid_district_scores.csv"
+        write_csv(district_scores, district_output)
+        logger.info(f"   ✅ 자치구 집계 결과 저장: {district_output}")
+
+    if tiles:
+        from tiles import TILES_DIR, generate_tiles
+
+        with recorder.stage('tiles', rows=len(cells)):
+            summary = generate_tiles(cells, TILES_DIR, value_columns=SCORE_COLUMNS)
+        logger.info(f"   ✅ 히트맵 타일 {summary['tiles']:,}개 (새로 저장 {summary['written']:,}개): {TILES_DIR}")
+
+    return cells, district_scores
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="서울시 격자 단위 생활 서비스 접근성 분석")
+    parser.add_argument("--cell-m", type=int, default=100, help="격자 크기 (m)")
+    parser.add_argument("--tiles", action="store_true", help="히트맵 타일도 생성")
+    parser.add_argument("--metrics", type=Path, default=None,
+                        help="단계별 계측 결과 파일 (.prom이면 Prometheus textfile, 그 외에는 JSON Lines 추가)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="단계별 최대 파이썬 할당량(tracemalloc) 측정")
+    parser.add_argument("--profile", type=Path, default=None, metavar="DIR",
+                        help="단계마다 cProfile 결과를 DIR/{단계}.prof로 저장")
+    parser.add_argument("--quiet", action="store_true", help="경고 외 콘솔 출력 생략")
+    parser.add_argument("--verbose", action="store_true", help="단계별 계측 값도 출력")
+    args = parser.parse_args()
+
+    configure_logging(quiet=args.quiet, verbose=args.verbose)
+    recorder = StageRecorder(trace_memory=args.trace_memory, profile_dir=args.profile,
+                             labels={'cell_m': args.cell_m})
+
+    analyze_grid_accessibility(cell_m=args.cell_m, tiles=args.tiles, recorder=recorder)
+    if args.metrics:
+        recorder.write(args.metrics)
+        logger.info(f"   ✅ 단계별 계측 결과 저장: {args.metrics}")
+    logger.info("\n✅ 격자 접근성 분석 완료!")
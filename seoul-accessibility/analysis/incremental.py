@@ -0,0 +1,75 @@
+"""
+시설 종류별 중간 결과 캐시 (증분 재계산)
+구별 지표(개수, 최근접 / 평균 거리, 밀도, 인구 대비 비율)를 입력 내용 해시와 함께 저장하고,
+입력이 바뀐 시설 종류만 다시 계산
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from ingest import CACHE_DIR, CACHE_FORMAT, RAW_DIR, dataset_sha256
+
+# 중간 결과 계산 방식이 바뀌면 올려서 기존 캐시를 모두 무효화
+INTERMEDIATE_VERSION = 2
+
+
+def intermediate_dir(cache_dir=CACHE_DIR):
+    return Path(cache_dir) / "intermediate"
+
+
+def metrics_key(facility_type, spec, search_scope, search_radius_km,
+                raw_dir=RAW_DIR, cache_dir=CACHE_DIR):
+    """
+    중간 결과 캐시 키
+    시설 / 자치구 원본 해시와 계산 파라미터가 모두 같을 때만 같은 키
+    """
+    payload = {
+        'version': INTERMEDIATE_VERSION,
+        'facility_type': facility_type,
+        'spec': spec,
+        'search_scope': search_scope,
+        'search_radius_km': search_radius_km,
+        'facility_sha256': dataset_sha256(facility_type, raw_dir, cache_dir),
+        'districts_sha256': dataset_sha256('districts', raw_dir, cache_dir),
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=list)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def _metrics_prefix(facility_type, search_scope):
+    return f"{facility_type}-{search_scope}-"
+
+
+def _metrics_path(facility_type, search_scope, key, cache_dir):
+    suffix = '.parquet' if CACHE_FORMAT == 'parquet' else '.pkl'
+    return intermediate_dir(cache_dir) / f"{_metrics_prefix(facility_type, search_scope)}{key[:16]}{suffix}"
+
+
+def load_cached_metrics(facility_type, search_scope, key, index, cache_dir=CACHE_DIR):
+    """저장된 중간 결과 로드 (없으면 None), index는 자치구 DataFrame의 인덱스"""
+    path = _metrics_path(facility_type, search_scope, key, cache_dir)
+    if not path.exists():
+        return None
+    metrics = pd.read_parquet(path) if CACHE_FORMAT == 'parquet' else pd.read_pickle(path)
+    metrics.index = index
+    return metrics
+
+
+def save_cached_metrics(facility_type, search_scope, key, metrics, cache_dir=CACHE_DIR):
+    """중간 결과 저장 (같은 시설 종류 / 검색 범위의 이전 결과는 삭제)"""
+    directory = intermediate_dir(cache_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = _metrics_path(facility_type, search_scope, key, cache_dir)
+
+    for old in directory.glob(f"{_metrics_prefix(facility_type, search_scope)}*"):
+        if old != path:
+            old.unlink()
+
+    metrics = metrics.reset_index(drop=True)
+    if CACHE_FORMAT == 'parquet':
+        metrics.to_parquet(path, index=False)
+    else:
+        metrics.to_pickle(path)
@@ -0,0 +1,317 @@
+"""
+원본 CSV 수집 단계
+data/raw/의 CSV를 한 번만 파싱하여 타입이 지정된 컬럼형 캐시(Parquet)로 저장
+- district / type / line 등 반복 문자열은 category, 시설 좌표는 float32
+- 원본 파일의 크기 / 수정 시각 / SHA-256 해시로 캐시 무효화
+- 스키마 검증 (필수 컬럼, 좌표 범위, lat/lon 별칭 컬럼 병합)
+  좌표 범위는 기본값이 서울 주변이며, 전국 단위 데이터는 bounds로 범위를 바꾸거나 끌 수 있음
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+from instrumentation import configure_logging
+
+try:
+    import pyarrow  # noqa: F401
+    CACHE_FORMAT = 'parquet'
+except ImportError:
+    # pyarrow가 없으면 pickle로 저장 (dtype은 그대로 보존됨)
+    CACHE_FORMAT = 'pickle'
+
+logger = logging.getLogger(__name__)
+
+# 프로젝트 경로
+PROJECT_ROOT = Path(__file__).parent.parent
+DATA_DIR = PROJECT_ROOT / "data"
+RAW_DIR = DATA_DIR / "raw"
+CACHE_DIR = DATA_DIR / "cache"
+
+# 스키마가 바뀌면 올려서 기존 캐시를 모두 무효화
+SCHEMA_VERSION = 1
+
+# 서울 주변 좌표 허용 범위 (잘못 입력된 좌표 검출용)
+LATITUDE_RANGE = (37.0, 38.0)
+LONGITUDE_RANGE = (126.5, 127.5)
+COORDINATE_BOUNDS = {'latitude': LATITUDE_RANGE, 'longitude': LONGITUDE_RANGE}
+# bounds=None일 때 사용하는 범위 (위경도로 가능한 값만 검사)
+GLOBAL_BOUNDS = {'latitude': (-90.0, 90.0), 'longitude': (-180.0, 180.0)}
+
+# 좌표 컬럼 별칭 (예: subway_stations.csv의 주요 역은 lat/lon에만 좌표가 있음)
+COORDINATE_ALIASES = {
+    'latitude': ['lat'],
+    'longitude': ['lon', 'lng'],
+}
+
+FACILITY_COORDINATE_DTYPE = 'float32'
+
+# 데이터셋별 스키마: {컬럼: dtype}, required는 반드시 있어야 하는 컬럼
+SCHEMAS = {
+    'districts': {
+        'file': "districts.csv",
+        'required': ['district', 'latitude', 'longitude', 'population', 'area_km2'],
+        'dtypes': {
+            'district': 'category', 'latitude': 'float64', 'longitude': 'float64',
+            'population': 'int64', 'area_km2': 'float64',
+        },
+    },
+    'population': {
+        'file': "population.csv",
+        'required': ['district', 'age_group', 'population'],
+        'dtypes': {
+            'district': 'category', 'age_group': 'category',
+            'population': 'int64', 'ratio': 'float64',
+        },
+    },
+    'hospitals': {
+        'file': "hospitals.csv",
+        'required': ['district', 'latitude', 'longitude'],
+        'dtypes': {
+            'name': 'object', 'type': 'category', 'district': 'category',
+            'latitude': FACILITY_COORDINATE_DTYPE, 'longitude': FACILITY_COORDINATE_DTYPE,
+            'specialty': 'category',
+        },
+    },
+    'banks': {
+        'file': "banks.csv",
+        'required': ['district', 'latitude', 'longitude'],
+        'dtypes': {
+            'name': 'object', 'type': 'category', 'district': 'category',
+            'latitude': FACILITY_COORDINATE_DTYPE, 'longitude': FACILITY_COORDINATE_DTYPE,
+            'bank_name': 'category',
+        },
+    },
+    'gov_offices': {
+        'file': "gov_offices.csv",
+        'required': ['district', 'latitude', 'longitude'],
+        'dtypes': {
+            'name': 'object', 'type': 'category', 'district': 'category',
+            'latitude': FACILITY_COORDINATE_DTYPE, 'longitude': FACILITY_COORDINATE_DTYPE,
+        },
+    },
+    'subway_stations': {
+        'file': "subway_stations.csv",
+        'required': ['district', 'latitude', 'longitude'],
+        'dtypes': {
+            'name': 'object', 'line': 'category', 'district': 'category',
+            'latitude': FACILITY_COORDINATE_DTYPE, 'longitude': FACILITY_COORDINATE_DTYPE,
+        },
+    },
+}
+
+
+def file_sha256(path):
+    """파일 내용의 SHA-256 해시"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def coalesce_coordinates(df):
+    """별칭 컬럼(lat/lon 등)의 좌표를 latitude/longitude로 합치고 별칭 컬럼 제거"""
+    df = df.copy()
+    for column, aliases in COORDINATE_ALIASES.items():
+        for alias in aliases:
+            if alias not in df.columns:
+                continue
+            if column in df.columns:
+                df[column] = df[column].fillna(df[alias])
+            else:
+                df[column] = df[alias]
+            df = df.drop(columns=alias)
+    return df
+
+
+def bounds_key(bounds):
+    """캐시 manifest / 좌표 저장소에 기록할 좌표 범위 ({컬럼: [최소, 최대]}, None이면 None)"""
+    if bounds is None:
+        return None
+    return {column: [float(low), float(high)] for column, (low, high) in sorted(bounds.items())}
+
+
+def validate_dataset(name, df, bounds=COORDINATE_BOUNDS):
+    """
+    스키마 검증
+    필수 컬럼 누락, 숫자가 아닌 좌표, bounds를 벗어난 좌표는 ValueError
+    bounds: {'latitude': (최소, 최대), 'longitude': (최소, 최대)} (None이면 GLOBAL_BOUNDS)
+    좌표가 비어 있는 행은 경고 목록으로 반환
+    """
+    schema = SCHEMAS[name]
+    missing = [column for column in schema['required'] if column not in df.columns]
+    if missing:
+        raise ValueError(f"{schema['file']}: 필수 컬럼 누락 {missing}")
+
+    warnings = []
+    if 'latitude' in df.columns and 'longitude' in df.columns:
+        bounds = bounds or GLOBAL_BOUNDS
+        for column in ('latitude', 'longitude'):
+            low, high = bounds[column]
+            values = pd.to_numeric(df[column], errors='coerce')
+            invalid = values.isna() & df[column].notna()
+            if invalid.any():
+                raise ValueError(f"{schema['file']}: {column} 컬럼에 숫자가 아닌 값 {int(invalid.sum())}개")
+            out_of_range = values.notna() & ~values.between(low, high)
+            if out_of_range.any():
+                raise ValueError(
+                    f"{schema['file']}: {column} 범위({low}~{high})를 벗어난 값 {int(out_of_range.sum())}개")
+
+        missing_coords = df['latitude'].isna() | df['longitude'].isna()
+        if missing_coords.any():
+            warnings.append(f"{schema['file']}: 좌표가 비어 있는 행 {int(missing_coords.sum())}개")
+
+    return warnings
+
+
+def apply_schema(name, df):
+    """스키마의 dtype 적용 (스키마에 없는 컬럼은 그대로 유지)"""
+    dtypes = {
+        column: dtype for column, dtype in SCHEMAS[name]['dtypes'].items()
+        if column in df.columns
+    }
+    return df.astype(dtypes)
+
+
+def parse_raw_dataset(name, raw_dir=RAW_DIR, bounds=COORDINATE_BOUNDS):
+    """원본 CSV 파싱 → 좌표 병합 → 검증 → dtype 적용"""
+    df = pd.read_csv(raw_dir / SCHEMAS[name]['file'])
+    df = coalesce_coordinates(df)
+    for warning in validate_dataset(name, df, bounds):
+        logger.warning(f"   ⚠️  {warning}")
+    return apply_schema(name, df)
+
+
+def _cache_path(name, cache_dir):
+    suffix = '.parquet' if CACHE_FORMAT == 'parquet' else '.pkl'
+    return cache_dir / f"{name}{suffix}"
+
+
+def _read_cache(path):
+    if CACHE_FORMAT == 'parquet':
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def _write_cache(df, path):
+    if CACHE_FORMAT == 'parquet':
+        df.to_parquet(path, index=False)
+    else:
+        df.to_pickle(path)
+
+
+def _load_manifest(cache_dir):
+    manifest_path = cache_dir / "manifest.json"
+    if not manifest_path.exists():
+        return {}
+    with open(manifest_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _save_manifest(manifest, cache_dir):
+    with open(cache_dir / "manifest.json", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def source_fingerprint(name, raw_dir=RAW_DIR, manifest=None):
+    """
+    원본 파일 지문 {size, mtime_ns, sha256}
+    크기와 수정 시각이 manifest와 같으면 해시 계산을 생략
+    """
+    source = raw_dir / SCHEMAS[name]['file']
+    stat = source.stat()
+    entry = (manifest or {}).get(name, {})
+    if entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+        sha256 = entry['sha256']
+    else:
+        sha256 = file_sha256(source)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha256}
+
+
+def dataset_sha256(name, raw_dir=RAW_DIR, cache_dir=CACHE_DIR):
+    """원본 파일 SHA-256 (수정 시각이 같으면 manifest 값을 재사용하여 해시 계산 생략)"""
+    return source_fingerprint(name, raw_dir, _load_manifest(Path(cache_dir)))['sha256']
+
+
+def load_dataset(name, raw_dir=RAW_DIR, cache_dir=CACHE_DIR, force=False, bounds=COORDINATE_BOUNDS):
+    """
+    캐시에서 데이터셋 로드 (원본이 바뀌었거나 캐시가 없으면 다시 파싱하여 저장)
+    bounds: 좌표 허용 범위 (validate_dataset 참고, 범위가 바뀌면 다시 검증)
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    manifest = _load_manifest(cache_dir)
+    fingerprint = source_fingerprint(name, raw_dir, manifest)
+    cache_path = _cache_path(name, cache_dir)
+
+    entry = manifest.get(name, {})
+    if (not force and cache_path.exists()
+            and entry.get('sha256') == fingerprint['sha256']
+            and entry.get('schema_version') == SCHEMA_VERSION
+            and entry.get('format') == CACHE_FORMAT
+            and entry.get('bounds', bounds_key(COORDINATE_BOUNDS)) == bounds_key(bounds)):
+        if entry.get('mtime_ns') != fingerprint['mtime_ns']:
+            # 내용은 같고 수정 시각만 바뀐 경우: 지문만 갱신
+            manifest[name] = {**entry, **fingerprint}
+            _save_manifest(manifest, cache_dir)
+        return _read_cache(cache_path)
+
+    df = parse_raw_dataset(name, raw_dir, bounds)
+    _write_cache(df, cache_path)
+
+    manifest[name] = {
+        **fingerprint,
+        'source': SCHEMAS[name]['file'],
+        'schema_version': SCHEMA_VERSION,
+        'format': CACHE_FORMAT,
+        'bounds': bounds_key(bounds),
+        'rows': len(df),
+    }
+    _save_manifest(manifest, cache_dir)
+    return df
+
+
+def ingest_all(raw_dir=RAW_DIR, cache_dir=CACHE_DIR, force=False, bounds=COORDINATE_BOUNDS):
+    """모든 데이터셋 캐시 생성 / 갱신"""
+    return {
+        name: load_dataset(name, raw_dir=raw_dir, cache_dir=cache_dir, force=force, bounds=bounds)
+        for name in SCHEMAS
+    }
+
+
+def add_bounds_arguments(parser):
+    """좌표 허용 범위 CLI 옵션 (--bounds / --no-bounds)"""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--bounds", type=float, nargs=4, metavar=("LAT_MIN", "LAT_MAX", "LON_MIN", "LON_MAX"),
+                       help="좌표 허용 범위 (기본: 서울 주변)")
+    group.add_argument("--no-bounds", action="store_true", help="좌표 범위 검사 생략 (전국 단위 데이터)")
+
+
+def bounds_from_args(args):
+    if args.no_bounds:
+        return None
+    if args.bounds:
+        lat_min, lat_max, lon_min, lon_max = args.bounds
+        return {'latitude': (lat_min, lat_max), 'longitude': (lon_min, lon_max)}
+    return COORDINATE_BOUNDS
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="원본 CSV → 컬럼형 캐시 변환")
+    parser.add_argument("--force", action="store_true", help="원본 변경 여부와 관계없이 캐시 재생성")
+    add_bounds_arguments(parser)
+    parser.add_argument("--quiet", action="store_true", help="경고 외 콘솔 출력 생략")
+    args = parser.parse_args()
+
+    configure_logging(quiet=args.quiet)
+    logger.info(f"📁 원본 CSV 캐시 변환 중 ({CACHE_FORMAT})...")
+    datasets = ingest_all(force=args.force, bounds=bounds_from_args(args))
+    for name, df in datasets.items():
+        memory_kb = df.memory_usage(deep=True).sum() / 1024
+        logger.info(f"   ✅ {name:16s} {len(df):6,}행 | 메모리 {memory_kb:8.1f}KB")
+    logger.info(f"\n✅ 캐시 저장 위치: {CACHE_DIR}")
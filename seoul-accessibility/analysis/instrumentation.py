@@ -0,0 +1,187 @@
+"""
+파이프라인 단계별 계측
+load / filter / distance / normalize / save 등 단계마다 실행 시간, 처리 행 수, 최대 메모리를 기록하고
+JSON Lines 또는 Prometheus textfile 형식으로 저장
+
+- 최대 RSS: 프로세스 시작 이후 최대 상주 메모리 (resource 모듈, 단계 종료 시점 값)
+- tracemalloc: trace_memory=True일 때만 단계별 최대 파이썬 할당량 측정 (측정 중에는 느려짐)
+- cProfile: profile_dir를 주면 단계마다 {profile_dir}/{단계}.prof 저장 (snakeviz / pstats로 확인)
+단계는 중첩하지 않음 (tracemalloc 최대값 초기화와 cProfile이 단계마다 독립적이어야 하므로)
+"""
+
+import cProfile
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import wraps
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:
+    # Windows에는 resource 모듈이 없음 (최대 RSS는 None으로 기록)
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_PREFIX = 'accessibility_stage'
+
+
+def configure_logging(quiet=False, verbose=False):
+    """CLI 콘솔 출력 설정 (메시지만 stdout으로, quiet면 경고 이상만)"""
+    level = logging.WARNING if quiet else logging.DEBUG if verbose else logging.INFO
+    logging.basicConfig(stream=sys.stdout, format='%(message)s', level=level)
+
+
+def peak_rss_mb():
+    """프로세스 최대 상주 메모리 (MB)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+class StageRecorder:
+    """
+    단계별 계측 기록
+    trace_memory: tracemalloc으로 단계별 최대 파이썬 할당량 측정
+    profile_dir: cProfile 결과 저장 디렉토리 (None이면 프로파일링 안 함)
+    labels: 모든 기록에 붙일 값 (예: {'search_scope': 'city'})
+    """
+
+    def __init__(self, trace_memory=False, profile_dir=None, labels=None):
+        self.trace_memory = trace_memory
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        self.labels = dict(labels or {})
+        self.records = []
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """
+        단계 계측 (with 블록 안에서 record['rows']에 처리 행 수를 지정할 수 있음)
+            with recorder.stage('load') as record:
+                df = load()
+                record['rows'] = len(df)
+        """
+        record = {'stage': name, 'rows': rows}
+
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+
+        profiler = cProfile.Profile() if self.profile_dir else None
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield record
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            record['seconds'] = round(time.perf_counter() - start, 6)
+            if record['rows'] is not None:
+                record['rows'] = int(record['rows'])
+
+            if self.trace_memory:
+                record['peak_traced_mb'] = round(tracemalloc.get_traced_memory()[1] / 2**20, 3)
+                if started_tracing:
+                    tracemalloc.stop()
+            rss = peak_rss_mb()
+            record['peak_rss_mb'] = round(rss, 3) if rss is not None else None
+
+            if profiler is not None:
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                path = self.profile_dir / f"{name}.prof"
+                profiler.dump_stats(path)
+                record['profile'] = str(path)
+
+            self.records.append(record)
+            logger.debug(f"   ⏱️  {name}: {record['seconds']:.3f}s"
+                         + (f" | {record['rows']:,}행" if record['rows'] is not None else ""))
+
+    def timed(self, name=None, rows=None):
+        """
+        함수 계측 데코레이터
+        rows: 반환값 → 처리 행 수 함수 (예: rows=len)
+        """
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name or func.__name__) as record:
+                    result = func(*args, **kwargs)
+                    if rows is not None:
+                        record['rows'] = rows(result)
+                return result
+            return wrapper
+        return decorator
+
+    def summary(self):
+        """단계 이름 → 기록 (같은 단계가 여러 번이면 시간 / 행 수는 합, 메모리는 최대값)"""
+        stages = {}
+        for record in self.records:
+            merged = stages.setdefault(record['stage'], {'seconds': 0.0, 'rows': None})
+            merged['seconds'] = round(merged['seconds'] + record['seconds'], 6)
+            if record['rows'] is not None:
+                merged['rows'] = (merged['rows'] or 0) + record['rows']
+            for key in ('peak_traced_mb', 'peak_rss_mb'):
+                if record.get(key) is not None:
+                    merged[key] = max(merged.get(key) or 0, record[key])
+        return stages
+
+    def write_jsonl(self, path):
+        """단계마다 한 줄씩 JSON Lines 파일에 추가"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        with open(path, 'a', encoding='utf-8') as f:
+            for record in self.records:
+                f.write(json.dumps({'timestamp': timestamp, **self.labels, **record},
+                                   ensure_ascii=False) + "\n")
+
+    def write_prometheus(self, path, prefix=PROMETHEUS_PREFIX):
+        """
+        Prometheus node_exporter textfile 형식으로 저장 (메모리는 바이트 단위)
+        수집 중에 반쯤 쓰인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        """
+        metrics = [
+            ('seconds', 'seconds', 1, "Wall time of the pipeline stage"),
+            ('rows', 'rows', 1, "Rows processed by the pipeline stage"),
+            ('peak_rss_bytes', 'peak_rss_mb', 2**20, "Process peak resident set size at the end of the stage"),
+            ('peak_traced_bytes', 'peak_traced_mb', 2**20, "Peak traced Python allocations during the stage"),
+        ]
+        label_text = "".join(f',{key}="{value}"' for key, value in sorted(self.labels.items()))
+        stages = self.summary()
+
+        lines = []
+        for metric, key, scale, description in metrics:
+            values = [(stage, record[key]) for stage, record in stages.items() if record.get(key) is not None]
+            if not values:
+                continue
+            lines.append(f"# HELP {prefix}_{metric} {description}")
+            lines.append(f"# TYPE {prefix}_{metric} gauge")
+            for stage, value in values:
+                # 바이트 / 행 수는 정수, 시간은 소수
+                number = int(value * scale) if scale != 1 or isinstance(value, int) else float(value)
+                lines.append(f'{prefix}_{metric}{{stage="{stage}"{label_text}}} {number}')
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text("\n".join(lines) + "\n", encoding='utf-8')
+        os.replace(tmp, path)
+
+    def write(self, path):
+        """확장자가 .prom이면 Prometheus textfile, 그 외에는 JSON Lines"""
+        if Path(path).suffix == '.prom':
+            self.write_prometheus(path)
+        else:
+            self.write_jsonl(path)
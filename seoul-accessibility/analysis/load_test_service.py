@@ -0,0 +1,116 @@
+"""
+접근성 점수 서비스 부하 테스트 (로컬호스트)
+동시 연결 N개가 keep-alive로 요청을 반복 전송하고, 클라이언트 측 지연 시간 분포와 처리량을 출력
+끝나면 서비스의 /stats 카운터도 함께 출력
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from benchmark import generate_origins
+from scoring_service import DEFAULT_HOST, DEFAULT_PORT
+
+
+async def _request(reader, writer, method, path, body=None):
+    payload = json.dumps(body).encode('utf-8') if body is not None else b''
+    writer.write((
+        f"{method} {path} HTTP/1.1\r\n"
+        f"Host: localhost\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(payload)}\r\n\r\n"
+    ).encode('latin-1') + payload)
+    await writer.drain()
+
+    status_line = await reader.readline()
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def _client(host, port, points, requests, batch_size, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(requests):
+            start = time.perf_counter()
+            if batch_size > 1:
+                chunk = points[(i * batch_size) % len(points):][:batch_size]
+                status, _ = await _request(reader, writer, 'POST', '/score/batch',
+                                           {'points': chunk.tolist()})
+            else:
+                lat, lon = points[i % len(points)]
+                status, _ = await _request(reader, writer, 'GET', f'/score?lat={lat}&lon={lon}')
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load_test(host=DEFAULT_HOST, port=DEFAULT_PORT, concurrency=50,
+                        requests_per_client=100, batch_size=1, seed=42):
+    """
+    부하 테스트 실행
+    결과: 요청 수, 오류 수, 초당 요청 / 지점 수, 지연 시간 백분위(ms), 서비스 /stats
+    """
+    origins = generate_origins(10_000, seed)
+    points = origins[['latitude', 'longitude']].to_numpy().round(6)
+
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        _client(host, port, np.roll(points, -client * 97, axis=0),
+                requests_per_client, batch_size, latencies, errors)
+        for client in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, stats = await _request(reader, writer, 'GET', '/stats')
+    writer.close()
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'points_per_second': round(len(latencies) * batch_size / elapsed, 1),
+        'latency_ms': {
+            name: round(float(np.percentile(latencies_ms, q)), 3)
+            for name, q in (('p50', 50), ('p95', 95), ('p99', 99), ('max', 100))
+        },
+        'service_stats': stats,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="접근성 점수 서비스 부하 테스트")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--concurrency", type=int, default=50, help="동시 연결 수")
+    parser.add_argument("--requests", type=int, default=100, help="연결당 요청 수")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="요청당 지점 수 (1이면 GET /score, 그 이상이면 POST /score/batch)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load_test(args.host, args.port, args.concurrency,
+                                       args.requests, args.batch_size, args.seed))
+    print(f"⏱️  {report['requests']:,}건 / {report['seconds']}s | "
+          f"{report['requests_per_second']:,} req/s | {report['points_per_second']:,} points/s | "
+          f"오류 {report['errors']}건")
+    latency = report['latency_ms']
+    print(f"   지연 시간 p50 {latency['p50']}ms | p95 {latency['p95']}ms | "
+          f"p99 {latency['p99']}ms | max {latency['max']}ms")
+    print(f"   서비스 배치당 요청 수: {report['service_stats']['requests_per_batch']}")
@@ -0,0 +1,136 @@
+"""
+결과 파일 스트리밍 저장
+전체 결과를 한 번에 dict 목록으로 만들지 않고 행 청크 단위로 직렬화하여 파일에 바로 기록
+
+- csv: UTF-8 BOM CSV (to_csv와 같은 내용)
+- json: 레코드 배열 (기존 대시보드 형식, json.dump(indent=2)와 같은 내용)
+- ndjson: 한 줄에 레코드 하나
+- parquet: 청크마다 row group 하나 (pyarrow 필요)
+- columnar: 필드별 배열의 압축 JSON {"columns": [...], "length": n, "data": {필드: [...]}}
+  (레코드 배열보다 작고 브라우저에서 빠르게 파싱)
+"""
+
+import json
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+SUFFIXES = {
+    'csv': '.csv',
+    'json': '.json',
+    'ndjson': '.ndjson',
+    'parquet': '.parquet',
+    'columnar': '.columns.json',
+}
+
+
+def _chunks(data, chunk_rows):
+    """DataFrame 또는 DataFrame 청크 iterable → 최대 chunk_rows행 청크"""
+    frames = [data] if isinstance(data, pd.DataFrame) else data
+    for frame in frames:
+        for start in range(0, len(frame), chunk_rows):
+            yield frame.iloc[start:start + chunk_rows]
+
+
+def _json_ready(chunk):
+    """NaN은 None(JSON null)으로, 값은 파이썬 기본 타입으로"""
+    return chunk.astype(object).where(chunk.notna(), None)
+
+
+def write_csv(data, path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """청크 단위 CSV 저장 (첫 청크만 헤더와 BOM 포함)"""
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        header = True
+        for chunk in _chunks(data, chunk_rows):
+            chunk.to_csv(f, index=False, header=header)
+            header = False
+
+
+def write_json_records(data, path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """레코드 배열 JSON을 청크 단위로 저장 (json.dump(records, indent=2)와 같은 출력)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        first = True
+        for chunk in _chunks(data, chunk_rows):
+            for record in _json_ready(chunk).to_dict(orient='records'):
+                text = json.dumps(record, ensure_ascii=False, indent=2)
+                f.write(("[\n  " if first else ",\n  ") + text.replace("\n", "\n  "))
+                first = False
+        f.write("[]" if first else "\n]")
+
+
+def write_ndjson(data, path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """줄 단위 JSON (한 줄에 레코드 하나)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for chunk in _chunks(data, chunk_rows):
+            records = _json_ready(chunk).to_dict(orient='records')
+            f.write("".join(
+                json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n"
+                for record in records))
+
+
+def write_parquet(data, path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """청크마다 row group 하나로 Parquet 저장"""
+    if pq is None:
+        raise ImportError("Parquet 저장에는 pyarrow가 필요합니다")
+
+    writer = None
+    try:
+        for chunk in _chunks(data, chunk_rows):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_columnar_json(df, path):
+    """
+    필드별 배열 JSON (한 번에 한 컬럼씩 직렬화)
+    컬럼 단위로 써야 하므로 청크 iterable이 아닌 DataFrame만 받음
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"columns":' + json.dumps([str(c) for c in df.columns], ensure_ascii=False,
+                                            separators=(',', ':'))
+                + f',"length":{len(df)},"data":{{')
+        for i, column in enumerate(df.columns):
+            values = _json_ready(df[[column]])[column].tolist()
+            f.write(("," if i else "") + json.dumps(str(column), ensure_ascii=False) + ":"
+                    + json.dumps(values, ensure_ascii=False, separators=(',', ':')))
+        f.write("}}")
+
+
+WRITERS = {
+    'csv': write_csv,
+    'json': write_json_records,
+    'ndjson': write_ndjson,
+    'parquet': write_parquet,
+    'columnar': write_columnar_json,
+}
+
+
+def write_results(df, output_dir, stem, formats=('csv', 'json'), chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    여러 형식으로 결과 저장
+    결과: {형식: 저장 경로}
+    """
+    paths = {}
+    for fmt in formats:
+        if fmt not in WRITERS:
+            raise ValueError(f"알 수 없는 출력 형식: {fmt} (가능: {list(WRITERS)})")
+        path = Path(output_dir) / f"{stem}{SUFFIXES[fmt]}"
+        if fmt == 'columnar':
+            WRITERS[fmt](df, path)
+        else:
+            WRITERS[fmt](df, path, chunk_rows=chunk_rows)
+        paths[fmt] = path
+    return paths
@@ -0,0 +1,173 @@
+"""
+프로세스 풀 병렬 거리 계산
+시설 종류 × 출발지 청크 단위로 작업을 나누어 여러 코어에서 실행
+좌표 배열은 DataFrame을 피클링하지 않고 공유 메모리(multiprocessing.shared_memory)로 전달하며
+(좌표 저장소 coordinate_store.py의 memmap 배열은 워커가 같은 파일을 다시 열어 OS 페이지 캐시를 공유),
+결과는 (시설 종류, 청크 시작 위치) 순서로 합쳐 직렬 실행과 같은 값을 보장
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from coordinate_store import CoordinateStore
+from distance_engine import grouped_nearest_and_mean_distances
+from spatial_index import FacilityIndex
+
+DEFAULT_CHUNK_SIZE = 4096
+
+# 워커 프로세스 전역 상태 (initializer에서 한 번만 채움)
+_WORKER_ARRAYS = {}
+_WORKER_SHARED = []
+_WORKER_INDEXES = {}
+
+
+class SharedArrays:
+    """
+    NumPy 배열 묶음을 공유 메모리에 올리고 워커에 넘길 설명자 생성
+    with 블록을 벗어나면 공유 메모리 해제
+    """
+
+    def __init__(self):
+        self._blocks = []
+        self.descriptors = {}
+
+    def add(self, key, array):
+        array = np.ascontiguousarray(array)
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        self._blocks.append(block)
+        self.descriptors[key] = (block.name, array.shape, array.dtype.str)
+
+    def add_memmap(self, key, array, dtype=np.float64):
+        """
+        memmap 배열은 복사하지 않고 (파일 경로, 오프셋, shape, dtype) 설명자만 등록
+        memmap이 아니거나 dtype이 다르면 add와 같이 공유 메모리로 복사
+        """
+        if not isinstance(array, np.memmap) or array.filename is None \
+                or array.dtype != np.dtype(dtype) or not array.flags['C_CONTIGUOUS']:
+            self.add(key, np.asarray(array, dtype=dtype))
+            return
+        self.descriptors[key] = (str(array.filename), array.offset, array.shape, array.dtype.str)
+
+    def close(self):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _attach(descriptor):
+    if len(descriptor) == 4:
+        filename, offset, shape, dtype = descriptor
+        return np.memmap(filename, dtype=np.dtype(dtype), mode='r', offset=offset, shape=shape)
+
+    name, shape, dtype = descriptor
+    # 워커는 메인 프로세스의 resource_tracker를 공유하므로 해제(unlink)는 메인 프로세스가 담당
+    block = shared_memory.SharedMemory(name=name)
+    _WORKER_SHARED.append(block)
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+def _init_worker(descriptors):
+    _WORKER_ARRAYS.clear()
+    _WORKER_INDEXES.clear()
+    for key, descriptor in descriptors.items():
+        _WORKER_ARRAYS[key] = _attach(descriptor)
+
+
+def _distance_task(facility_type, start, stop, top_n, search_scope, search_radius_km):
+    """워커에서 실행: 한 시설 종류의 출발지 청크 [start, stop) 거리 계산"""
+    origin_lats = _WORKER_ARRAYS['origin_lat'][start:stop]
+    origin_lons = _WORKER_ARRAYS['origin_lon'][start:stop]
+    facility_lats = _WORKER_ARRAYS[(facility_type, 'lat')]
+    facility_lons = _WORKER_ARRAYS[(facility_type, 'lon')]
+
+    if search_scope == 'city':
+        # 인덱스는 워커마다 시설 종류별로 한 번만 생성
+        index = _WORKER_INDEXES.get(facility_type)
+        if index is None:
+            index = FacilityIndex(facility_lats, facility_lons)
+            _WORKER_INDEXES[facility_type] = index
+        nearest, mean = index.nearest_and_mean_distances(
+            origin_lats, origin_lons, top_n=top_n, max_distance_km=search_radius_km)
+    else:
+        nearest, mean = grouped_nearest_and_mean_distances(
+            origin_lats, origin_lons, _WORKER_ARRAYS['origin_group'][start:stop],
+            facility_lats, facility_lons, _WORKER_ARRAYS[(facility_type, 'group')],
+            top_n=top_n
+        )
+
+    return facility_type, start, nearest, mean
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def compute_distances_parallel(origins_df, facilities, specs, search_scope='district',
+                               search_radius_km=None, workers=None,
+                               chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    시설 종류별 최근접 / 평균 거리를 프로세스 풀로 계산
+    origins_df: latitude / longitude / district 컬럼의 출발지 DataFrame
+    facilities: {시설 종류: DataFrame 또는 CoordinateStore}
+    specs: {시설 종류: FACILITY_SPECS 항목}
+    결과: {시설 종류: (최근접 거리 배열, 평균 거리 배열)} - 직렬 계산과 동일한 값
+    """
+    workers = workers or default_workers()
+    num_origins = len(origins_df)
+
+    # 구 이름은 출발지 / 시설 공통 정수 코드로 변환하여 공유
+    group_labels = pd.Index(pd.unique(pd.concat(
+        [origins_df['district'].astype(str)]
+        + [pd.Series(df.district_labels) if isinstance(df, CoordinateStore) else df['district'].astype(str)
+           for df in facilities.values()]
+    )))
+
+    results = {
+        facility_type: (np.full(num_origins, np.nan), np.full(num_origins, np.nan))
+        for facility_type in facilities
+    }
+
+    with SharedArrays() as shared:
+        shared.add('origin_lat', origins_df['latitude'].to_numpy(dtype=np.float64))
+        shared.add('origin_lon', origins_df['longitude'].to_numpy(dtype=np.float64))
+        shared.add('origin_group', group_labels.get_indexer(origins_df['district'].astype(str)))
+        for facility_type, df in facilities.items():
+            if isinstance(df, CoordinateStore):
+                shared.add_memmap((facility_type, 'lat'), df.latitude)
+                shared.add_memmap((facility_type, 'lon'), df.longitude)
+                shared.add_memmap((facility_type, 'group'), df.group_codes(group_labels), dtype=np.int32)
+                continue
+            shared.add((facility_type, 'lat'), df['latitude'].to_numpy(dtype=np.float64))
+            shared.add((facility_type, 'lon'), df['longitude'].to_numpy(dtype=np.float64))
+            shared.add((facility_type, 'group'), group_labels.get_indexer(df['district'].astype(str)))
+
+        tasks = [
+            (facility_type, start, min(start + chunk_size, num_origins),
+             specs[facility_type]['top_n'] or 1, search_scope, search_radius_km)
+            for facility_type in facilities
+            for start in range(0, num_origins, chunk_size)
+        ]
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shared.descriptors,)) as pool:
+            futures = [pool.submit(_distance_task, *task) for task in tasks]
+            # 완료 순서와 관계없이 작업 목록 순서대로 결과 배치
+            for future in futures:
+                facility_type, start, nearest, mean = future.result()
+                stop = start + len(nearest)
+                results[facility_type][0][start:stop] = nearest
+                results[facility_type][1][start:stop] = mean
+
+    return results
@@ -0,0 +1,312 @@
+"""
+What-if 시나리오 분석 (시설 추가 / 폐쇄)
+기준 상태(구별 가까운 시설 목록, 구별 시설 수)를 한 번만 만들어 두고,
+시나리오마다 영향받는 구의 최근접 / top-k 거리만 갱신한 뒤 다시 정규화하여 구별 점수 / 등급 변화를 계산
+
+- 추가: 새 시설과 검색 범위 안의 구 중심 사이 거리만 계산하여 기존 top-k 목록에 병합
+- 폐쇄: top-k 목록에 폐쇄 시설이 들어 있는 구만 인덱스로 다시 질의
+- 여러 시나리오는 같은 기준 상태를 공유하는 프로세스 풀에서 병렬 실행
+
+시나리오 형식 (JSON)
+{
+  "name": "9호선 연장",
+  "add": [{"type": "subway_stations", "latitude": 37.55, "longitude": 127.15, "name": "신규역"}],
+  "remove": [{"type": "gov_offices", "name": "OO동 주민센터"}]
+}
+추가 시설의 district를 생략하면 가장 가까운 구 중심의 구로 배정
+"""
+
+import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from calculate_accessibility import (
+    PROCESSED_DIR, FACILITY_SPECS, DISTRICT_COLUMNS, SCORE_COMPONENTS,
+    load_facilities, calculate_facility_metrics, calculate_scores, result_columns,
+)
+from distance_engine import haversine_matrix
+from spatial_index import FacilityIndex, radius_limited_distances
+from ingest import load_dataset
+
+# 폐쇄에 대비해 top-k보다 더 보관하는 이웃 수
+SPARE_NEIGHBORS = 2
+
+DIFF_COLUMNS = list(SCORE_COMPONENTS) + ['total_accessibility_score']
+
+
+class FacilityNeighbors:
+    """
+    한 시설 종류의 기준 상태
+    distances / positions: 구별 가까운 시설 거리(오름차순)와 시설 행 위치 (M, k) - 빈 칸은 NaN / -1
+    """
+
+    def __init__(self, districts_df, facilities_df, spec, search_scope='district',
+                 search_radius_km=None):
+        self.spec = spec
+        self.search_scope = search_scope
+        self.search_radius_km = search_radius_km
+        self.top_n = spec['top_n'] or 1
+        self.k = self.top_n + SPARE_NEIGHBORS
+
+        self.origin_lats = districts_df['latitude'].to_numpy(dtype=np.float64)
+        self.origin_lons = districts_df['longitude'].to_numpy(dtype=np.float64)
+        self.origin_districts = districts_df['district'].astype(str).to_numpy()
+        self.num_facilities = len(facilities_df)
+        self.facility_districts = facilities_df['district'].astype(str).to_numpy()
+
+        self.counts = (pd.Series(self.facility_districts).value_counts()
+                       .reindex(self.origin_districts, fill_value=0).to_numpy())
+
+        # 검색 범위별 인덱스: 서울시 전체 또는 구별 (인덱스 위치 → 전체 시설 행 위치)
+        if search_scope == 'city':
+            self._indexes = {None: (FacilityIndex.from_dataframe(facilities_df),
+                                    np.arange(self.num_facilities))}
+        else:
+            self._indexes = {}
+            for district in np.unique(self.origin_districts):
+                rows = np.flatnonzero(self.facility_districts == district)
+                self._indexes[district] = (
+                    FacilityIndex.from_dataframe(facilities_df.iloc[rows]), rows)
+
+        self.distances, self.positions = self.query(np.arange(len(self.origin_lats)))
+
+    def _scope_key(self, origin):
+        return None if self.search_scope == 'city' else self.origin_districts[origin]
+
+    def query(self, origins, exclude=None):
+        """
+        지정한 구 중심들의 가까운 시설 k개를 인덱스로 다시 질의 (exclude의 시설 행 위치는 제외)
+        결과: (distances, positions) - (len(origins), k)
+        """
+        exclude = np.asarray(sorted(exclude or ()), dtype=np.int64)
+        distances = np.full((len(origins), self.k), np.nan)
+        positions = np.full((len(origins), self.k), -1, dtype=np.int64)
+
+        for i, origin in enumerate(origins):
+            entry = self._indexes.get(self._scope_key(origin))
+            if entry is None:
+                continue
+            index, rows = entry
+            found_d, found_p = index.query(self.origin_lats[origin], self.origin_lons[origin],
+                                           k=self.k + len(exclude))
+            found_d, found_p = found_d[0], found_p[0]
+            keep = found_p >= 0
+            found_d, found_p = found_d[keep], rows[found_p[keep]]
+            keep = ~np.isin(found_p, exclude)
+            if self.search_radius_km is not None:
+                keep &= found_d <= self.search_radius_km
+            found_d, found_p = found_d[keep][:self.k], found_p[keep][:self.k]
+            distances[i, :len(found_d)] = found_d
+            positions[i, :len(found_p)] = found_p
+
+        return distances, positions
+
+    def apply(self, additions=None, removals=None):
+        """
+        시설 추가 / 폐쇄를 반영한 (최근접 거리, 평균 거리, 구별 시설 수)
+        additions: latitude / longitude / district 컬럼의 DataFrame
+        removals: 폐쇄할 시설 행 위치 목록
+        """
+        distances = self.distances.copy()
+        positions = self.positions.copy()
+        counts = self.counts.copy()
+
+        removals = set(int(p) for p in (removals or ()))
+        if removals:
+            removed = np.fromiter(removals, dtype=np.int64)
+            np.subtract.at(counts, self._district_positions(self.facility_districts[removed]), 1)
+            # top-k 목록에 폐쇄 시설이 있는 구만 다시 질의
+            affected = np.flatnonzero(np.isin(positions, removed).any(axis=1))
+            if len(affected):
+                distances[affected], positions[affected] = self.query(affected, exclude=removals)
+
+        if additions is not None and len(additions):
+            add_districts = additions['district'].astype(str).to_numpy()
+            np.add.at(counts, self._district_positions(add_districts), 1)
+
+            added = haversine_matrix(self.origin_lats, self.origin_lons,
+                                     additions['latitude'].to_numpy(dtype=np.float64),
+                                     additions['longitude'].to_numpy(dtype=np.float64))
+            if self.search_scope != 'city':
+                added[self.origin_districts[:, np.newaxis] != add_districts[np.newaxis, :]] = np.nan
+            elif self.search_radius_km is not None:
+                added[added > self.search_radius_km] = np.nan
+
+            # 기존 목록과 병합 후 다시 k개만 유지 (NaN은 정렬 시 뒤로 감)
+            new_positions = self.num_facilities + np.arange(len(additions))
+            merged_d = np.concatenate([distances, added], axis=1)
+            merged_p = np.concatenate(
+                [positions, np.broadcast_to(new_positions, added.shape)], axis=1)
+            order = np.argsort(merged_d, axis=1, kind='stable')[:, :self.k]
+            distances = np.take_along_axis(merged_d, order, axis=1)
+            positions = np.take_along_axis(merged_p, order, axis=1)
+            positions[np.isnan(distances)] = -1
+
+        if self.search_radius_km is not None:
+            # 배치 계산(spatial_index)과 같이 반경 안 시설이 모자란 칸은 반경으로 채워 평균
+            nearest, mean = radius_limited_distances(distances, self.top_n, self.search_radius_km)
+            return nearest, mean, counts
+
+        nearest = distances[:, 0]
+        top = distances[:, :self.top_n]
+        found = (~np.isnan(top)).sum(axis=1)
+        mean = np.full(len(top), np.nan)
+        np.divide(np.nansum(top, axis=1), found, out=mean, where=found > 0)
+        return nearest, mean, counts
+
+    def _district_positions(self, districts):
+        lookup = pd.Index(self.origin_districts)
+        positions = lookup.get_indexer(districts)
+        if (positions < 0).any():
+            raise ValueError(f"알 수 없는 구: {sorted(set(np.asarray(districts)[positions < 0]))}")
+        return positions
+
+
+class ScenarioEngine:
+    """기준 상태 (시설 종류별 FacilityNeighbors)와 기준 점수"""
+
+    def __init__(self, districts_df, facilities, search_scope='district', search_radius_km=None):
+        self.districts = districts_df.reset_index(drop=True)
+        self.facilities = facilities
+        self.search_scope = search_scope
+        self.neighbors = {
+            facility_type: FacilityNeighbors(self.districts, facilities[facility_type], spec,
+                                             search_scope, search_radius_km)
+            for facility_type, spec in FACILITY_SPECS.items()
+        }
+        self._district_index = FacilityIndex.from_dataframe(self.districts)
+        self.base = self._scores({})
+
+    @classmethod
+    def from_datasets(cls, search_scope='district', search_radius_km=None):
+        return cls(load_dataset('districts'), load_facilities(), search_scope, search_radius_km)
+
+    def _scores(self, changes):
+        metrics = []
+        for facility_type, spec in FACILITY_SPECS.items():
+            additions, removals = changes.get(facility_type, (None, None))
+            nearest, mean, counts = self.neighbors[facility_type].apply(additions, removals)
+            metrics.append(calculate_facility_metrics(
+                self.districts, None, spec, distances=(nearest, mean), counts=counts))
+        results_df = pd.concat([self.districts[DISTRICT_COLUMNS]] + metrics, axis=1)[result_columns()]
+        return calculate_scores(results_df)
+
+    def _resolve(self, scenario):
+        """시나리오 dict → {시설 종류: (추가 DataFrame, 폐쇄 행 위치 목록)}"""
+        changes = {}
+        for item in scenario.get('add', []):
+            facility_type = item['type']
+            if facility_type not in FACILITY_SPECS:
+                raise ValueError(f"알 수 없는 시설 종류: {facility_type}")
+            row = {'latitude': float(item['latitude']), 'longitude': float(item['longitude']),
+                   'district': item.get('district')}
+            if row['district'] is None:
+                _, position = self._district_index.nearest(row['latitude'], row['longitude'])
+                row['district'] = str(self.districts['district'].iloc[position[0]])
+            changes.setdefault(facility_type, ([], []))[0].append(row)
+
+        for item in scenario.get('remove', []):
+            facility_type = item['type']
+            if facility_type not in FACILITY_SPECS:
+                raise ValueError(f"알 수 없는 시설 종류: {facility_type}")
+            if 'index' in item:
+                index = int(item['index'])
+                if not 0 <= index < len(self.facilities[facility_type]):
+                    raise ValueError(f"{facility_type} 시설 위치 범위를 벗어남: {index} "
+                                     f"(0 이상 {len(self.facilities[facility_type])} 미만)")
+                rows = [index]
+            else:
+                names = self.facilities[facility_type]['name'].astype(str).to_numpy()
+                rows = np.flatnonzero(names == item['name']).tolist()
+                if not rows:
+                    raise ValueError(f"{facility_type}에 '{item['name']}' 시설이 없습니다")
+            changes.setdefault(facility_type, ([], []))[1].extend(rows)
+
+        return {
+            facility_type: (pd.DataFrame(added) if added else None, removed)
+            for facility_type, (added, removed) in changes.items()
+        }
+
+    def run(self, scenario):
+        """
+        시나리오 하나 실행
+        결과: 구별 점수 / 등급 변화 DataFrame (기준, 시나리오, 차이, 등급 변경 여부)
+        """
+        scores = self._scores(self._resolve(scenario))
+
+        diff = pd.DataFrame({'district': self.districts['district'].astype(str)})
+        for column in DIFF_COLUMNS:
+            diff[f'{column}_base'] = self.base[column]
+            diff[f'{column}_new'] = scores[column]
+            diff[f'{column}_delta'] = scores[column] - self.base[column]
+        diff['grade_base'] = self.base['grade']
+        diff['grade_new'] = scores['grade']
+        diff['grade_changed'] = diff['grade_base'] != diff['grade_new']
+        diff.insert(0, 'scenario', scenario.get('name', ''))
+        return diff
+
+
+# 병렬 실행용 워커 전역 상태 (initializer에서 기준 상태를 한 번만 받음)
+_WORKER_ENGINE = None
+
+
+def _init_worker(engine):
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = engine
+
+
+def _run_task(scenario):
+    return _WORKER_ENGINE.run(scenario)
+
+
+def run_scenarios(engine, scenarios, workers=None):
+    """
+    여러 시나리오를 같은 기준 상태에서 실행
+    workers가 2 이상이면 프로세스 풀 사용 (기준 상태는 워커마다 한 번만 전달)
+    결과: 시나리오 순서대로 diff DataFrame 목록
+    """
+    if workers is None or workers <= 1 or len(scenarios) <= 1:
+        return [engine.run(scenario) for scenario in scenarios]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(engine,)) as pool:
+        return list(pool.map(_run_task, scenarios))
+
+
+def load_scenarios(path):
+    """시나리오 JSON 파일 (객체 하나 또는 목록)"""
+    with open(path, encoding='utf-8') as f:
+        scenarios = json.load(f)
+    return scenarios if isinstance(scenarios, list) else [scenarios]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="What-if 시나리오 분석 (시설 추가 / 폐쇄)")
+    parser.add_argument("scenarios", type=Path, nargs="+", help="시나리오 JSON 파일")
+    parser.add_argument("--scope", choices=["district", "city"], default="district")
+    parser.add_argument("--radius-km", type=float, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", type=Path, default=PROCESSED_DIR / "scenario_diff.csv",
+                        help="구별 점수 변화 CSV 저장 경로")
+    args = parser.parse_args()
+
+    scenarios = [scenario for path in args.scenarios for scenario in load_scenarios(path)]
+    engine = ScenarioEngine.from_datasets(args.scope, args.radius_km)
+    diffs = run_scenarios(engine, scenarios, workers=args.workers)
+
+    for scenario, diff in zip(scenarios, diffs):
+        changed = diff[diff['total_accessibility_score_delta'].abs() > 0]
+        print(f"🔀 {scenario.get('name', '(이름 없음)')}: 점수 변화 {len(changed)}개 구 / "
+              f"등급 변경 {int(diff['grade_changed'].sum())}개 구")
+        for row in changed.sort_values('total_accessibility_score_delta').itertuples():
+            grade = (f"{row.grade_base} → {row.grade_new}" if row.grade_changed
+                     else row.grade_new)
+            print(f"   {row.district:6s} {row.total_accessibility_score_base:6.2f} → "
+                  f"{row.total_accessibility_score_new:6.2f} ({row.total_accessibility_score_delta:+.2f}) | {grade}")
+
+    pd.concat(diffs, ignore_index=True).to_csv(args.output, index=False, encoding='utf-8-sig')
+    print(f"\n✅ 시나리오 결과 저장: {args.output}")
@@ -0,0 +1,267 @@
+"""
+임의 지점 접근성 점수 API
+시설 종류별 공간 인덱스를 한 번만 만들어 두고, 마지막 배치 실행의 정규화 상수(normalization.json)와
+점수 계산 계획(scoring_plan.json)으로 위도 / 경도 한 점의 점수를 밀리초 단위로 계산
+같은 지점의 반복 질의는 좌표를 반올림한 키의 LRU 캐시로 처리
+"""
+
+import argparse
+import json
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from calculate_accessibility import (
+    PROCESSED_DIR, FACILITY_SPECS, SCORING_PLAN,
+    load_facilities, facility_metric_columns, normalization_params, apply_normalization,
+)
+from distance_engine import nearest_and_mean_distances
+from scoring_config import load_scoring_plan
+from spatial_index import FacilityIndex, build_facility_indexes
+
+# 좌표 반올림 자릿수 (소수 4자리 ≈ 11m)
+DEFAULT_PRECISION = 4
+DEFAULT_CACHE_SIZE = 10_000
+
+
+def resolve_weights(weights=None, plan=None):
+    """
+    카테고리 가중치 정리 (지정하지 않은 카테고리는 계획의 가중치 사용, 합이 1이 되도록 조정)
+    weights: {'medical_score': 0.5, ...} 또는 None
+    plan: 점수 계산 계획 (None이면 scoring_config.json)
+    """
+    resolved = (plan or SCORING_PLAN).category_weight_map
+    if weights:
+        unknown = set(weights) - set(resolved)
+        if unknown:
+            raise ValueError(f"알 수 없는 카테고리: {sorted(unknown)}")
+        resolved.update(weights)
+
+    total = sum(resolved.values())
+    if total <= 0:
+        raise ValueError("가중치 합은 0보다 커야 합니다")
+    return {category: weight / total for category, weight in resolved.items()}
+
+
+def apply_weights(scores, weights=None, plan=None):
+    """카테고리 점수 DataFrame에 가중치를 적용하여 종합 점수와 등급 컬럼 추가"""
+    plan = plan or SCORING_PLAN
+    weights = resolve_weights(weights, plan)
+    total = sum(scores[category] * weight for category, weight in weights.items())
+    scores['total_accessibility_score'] = total.round(plan.total_decimals)
+    scores['grade'] = plan.grades(scores['total_accessibility_score'].to_numpy())
+    return scores
+
+
+class AccessibilityScorer:
+    """
+    지점 단위 접근성 점수 계산기
+    indexes: {시설 종류: FacilityIndex} (서울시 전체 시설)
+    districts: district / latitude / longitude 및 시설 밀도 컬럼을 가진 배치 결과 DataFrame
+    normalization: calculate_accessibility.normalization_params 결과
+                   (배치 실행의 search_scope / search_radius_km 포함, 없으면 기본 배치와 같은 'district')
+    plan: 정규화 상수를 만든 배치 실행의 점수 계산 계획 (None이면 scoring_config.json)
+    facilities: {시설 종류: DataFrame} ('district' 범위 상수일 때 필요 - 같은 구 시설만 대상으로 거리 계산)
+    """
+
+    def __init__(self, indexes, districts, normalization,
+                 precision=DEFAULT_PRECISION, cache_size=DEFAULT_CACHE_SIZE, plan=None, facilities=None):
+        self.indexes = indexes
+        self.districts = districts.reset_index(drop=True)
+        self.normalization = normalization
+        self.plan = plan or SCORING_PLAN
+        self.precision = precision
+        self.cache_size = cache_size
+
+        # 정규화 상수를 만든 배치 실행과 같은 범위로 거리 계산
+        self.search_scope = normalization.get('search_scope', 'district')
+        self.search_radius_km = normalization.get('search_radius_km')
+        if self.search_scope not in ('district', 'city'):
+            raise ValueError(f"search_scope must be 'district' or 'city', got {self.search_scope!r}")
+        self._district_facilities = None
+        if self.search_scope == 'district':
+            if facilities is None:
+                raise ValueError("'district' 범위 정규화 상수에는 facilities가 필요합니다")
+            self._district_facilities = {
+                facility_type: {
+                    str(district): (group['latitude'].to_numpy(), group['longitude'].to_numpy())
+                    for district, group in df.groupby('district', observed=True)
+                }
+                for facility_type, df in facilities.items()
+            }
+
+        # 지점이 속한 구는 가장 가까운 구 중심으로 판단
+        self._district_index = FacilityIndex.from_dataframe(self.districts)
+
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_processed(cls, processed_dir=PROCESSED_DIR, facilities=None, **kwargs):
+        """배치 결과(accessibility_scores.csv / normalization.json / scoring_plan.json)와 시설 데이터로 생성"""
+        districts = pd.read_csv(processed_dir / "accessibility_scores.csv", encoding='utf-8-sig')
+
+        # 배치 실행이 --scoring-config로 다른 계획을 썼다면 같은 계획으로 점수 계산
+        plan_file = processed_dir / "scoring_plan.json"
+        plan = load_scoring_plan(plan_file) if plan_file.exists() else SCORING_PLAN
+
+        normalization_file = processed_dir / "normalization.json"
+        if normalization_file.exists():
+            with open(normalization_file, encoding='utf-8') as f:
+                normalization = json.load(f)
+        else:
+            # 이전 버전 배치 결과: 저장된 지표 컬럼으로 정규화 상수 재계산
+            normalization = normalization_params(districts, plan)
+
+        facilities = facilities if facilities is not None else load_facilities()
+        indexes = build_facility_indexes(facilities)
+        return cls(indexes, districts, normalization, plan=plan, facilities=facilities, **kwargs)
+
+    def distances(self, facility_type, latitudes, longitudes, district_names):
+        """
+        지점별 (최근접 거리, 평균 거리) - 배치 실행과 같은 범위
+        'district'면 지점이 속한 구의 시설만 (calculate_accessibility.calculate_distances와 같은 계산),
+        'city'면 서울시 전체 시설 (검색 반경이 있으면 반경 내 시설만)
+        """
+        top_n = FACILITY_SPECS[facility_type]['top_n'] or 1
+        if self.search_scope == 'city':
+            return self.indexes[facility_type].nearest_and_mean_distances(
+                latitudes, longitudes, top_n=top_n, max_distance_km=self.search_radius_km)
+
+        nearest = np.full(len(latitudes), np.nan)
+        mean = np.full(len(latitudes), np.nan)
+        groups = self._district_facilities[facility_type]
+        for district in np.unique(district_names):
+            if str(district) not in groups:
+                continue
+            rows = np.flatnonzero(district_names == district)
+            nearest[rows], mean[rows] = nearest_and_mean_distances(
+                latitudes[rows], longitudes[rows], *groups[str(district)], top_n=top_n)
+        return nearest, mean
+
+    def metrics(self, latitudes, longitudes):
+        """지점별 최근접 / 평균 거리와 소속 구의 구 단위 지표 (개수 / 밀도 / 인구 대비 비율)"""
+        latitudes = np.atleast_1d(np.asarray(latitudes, dtype=np.float64))
+        longitudes = np.atleast_1d(np.asarray(longitudes, dtype=np.float64))
+
+        _, district_positions = self._district_index.nearest(latitudes, longitudes)
+        district_rows = self.districts.iloc[district_positions]
+
+        metrics = {'district': district_rows['district'].to_numpy()}
+        for facility_type, spec in FACILITY_SPECS.items():
+            columns = facility_metric_columns(spec)
+            nearest, mean = self.distances(facility_type, latitudes, longitudes, metrics['district'])
+            metrics[columns['nearest']] = nearest
+            if 'avg' in columns:
+                metrics[columns['avg']] = mean
+            for kind in ('count', 'density', 'per_capita'):
+                if kind in columns and columns[kind] in district_rows:
+                    metrics[columns[kind]] = district_rows[columns[kind]].to_numpy()
+        return metrics
+
+    def category_scores(self, latitudes, longitudes):
+        """지점별 카테고리 점수 (배치 실행과 같은 구성 / 정규화 상수)"""
+        metrics = self.metrics(latitudes, longitudes)
+        scores = {'district': metrics['district']}
+        for category, components in self.plan.components.items():
+            scores[category] = sum(
+                apply_normalization(metrics[column], self.normalization[column]) * weight
+                for column, _, weight in components
+            )
+        return scores
+
+    def score_many(self, latitudes, longitudes, weights=None):
+        """
+        여러 지점 점수를 한 번에 계산 (캐시를 거치지 않는 벡터 연산)
+        결과: 지점별 카테고리 / 종합 점수와 등급 DataFrame
+        """
+        scores = pd.DataFrame(self.category_scores(latitudes, longitudes))
+        scores.insert(0, 'latitude', np.atleast_1d(latitudes))
+        scores.insert(1, 'longitude', np.atleast_1d(longitudes))
+        return apply_weights(scores, weights, self.plan)
+
+    def _cache_key(self, latitude, longitude):
+        return (round(float(latitude), self.precision), round(float(longitude), self.precision))
+
+    def _cached_category_scores(self, latitude, longitude):
+        key = self._cache_key(latitude, longitude)
+        entry = self._cache.get(key)
+        if entry is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        scores = self.category_scores([key[0]], [key[1]])
+        entry = {name: values[0] for name, values in scores.items()}
+        self._cache[key] = entry
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return entry
+
+    def score_location(self, latitude, longitude, weights=None):
+        """
+        한 지점의 접근성 점수
+        카테고리 점수는 반올림 좌표 단위로 캐시하고, 가중치는 매 호출마다 적용
+        """
+        entry = self._cached_category_scores(latitude, longitude)
+        weights = resolve_weights(weights, self.plan)
+
+        result = {
+            'latitude': float(latitude),
+            'longitude': float(longitude),
+            'district': str(entry['district']),
+        }
+        for category in self.plan.categories:
+            result[category] = float(entry[category])
+        total = round(float(sum(entry[category] * weight for category, weight in weights.items())),
+                      self.plan.total_decimals)
+        result['total_accessibility_score'] = total
+        result['grade'] = self.plan.grade(total)
+        return result
+
+    def cache_info(self):
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._cache), 'max_size': self.cache_size}
+
+    def clear_cache(self):
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_default_scorer = None
+
+
+def get_scorer():
+    """기본 점수 계산기 (처음 호출할 때 한 번만 로드)"""
+    global _default_scorer
+    if _default_scorer is None:
+        _default_scorer = AccessibilityScorer.from_processed()
+    return _default_scorer
+
+
+def score_location(latitude, longitude, weights=None):
+    """기본 점수 계산기로 한 지점의 접근성 점수 계산"""
+    return get_scorer().score_location(latitude, longitude, weights=weights)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="임의 지점 접근성 점수 계산")
+    parser.add_argument("latitude", type=float)
+    parser.add_argument("longitude", type=float)
+    parser.add_argument("--weights", type=json.loads, default=None,
+                        help='카테고리 가중치 JSON (예: \'{"medical_score": 0.5}\')')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    scorer = get_scorer()
+    print(f"📁 인덱스 로드: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    start = time.perf_counter()
+    result = scorer.score_location(args.latitude, args.longitude, weights=args.weights)
+    print(f"⏱️  점수 계산: {(time.perf_counter() - start) * 1000:.2f}ms\n")
+    print(json.dumps(result, ensure_ascii=False, indent=2))
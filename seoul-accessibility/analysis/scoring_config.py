@@ -0,0 +1,215 @@
+"""
+점수 계산 규칙 설정 (scoring_config.json)
+카테고리 / 지표 가중치, 역수 정규화 오프셋, 등급 기준을 설정 파일에서 읽어
+한 번만 벡터 연산 계획(ScoringPlan)으로 변환
+
+- 지표 정규화: 컬럼마다 NumPy 배열 연산 한 번
+- 등급: np.select (행마다 함수를 호출하지 않음)
+- 여러 가중치 설정: 정규화된 지표 행렬 × 설정별 유효 가중치 행렬의 곱 한 번으로 평가 (거리 재계산 없음)
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+CONFIG_FILE = Path(__file__).parent / "scoring_config.json"
+
+NORMALIZATION_KINDS = ['inverse', 'direct']
+
+
+class ScoringPlan:
+    """
+    컴파일된 점수 계산 계획
+    columns: 정규화할 지표 컬럼 (중복 없이 설정 순서대로)
+    component_matrix: (지표 수, 카테고리 수) 지표 → 카테고리 가중치
+    category_weights: (카테고리 수,) 종합 점수 가중치
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.inverse_offset = float(config.get('inverse_offset', 0.1))
+        self.degenerate_score = float(config.get('degenerate_score', 50))
+        self.total_decimals = int(config.get('total_decimals', 2))
+
+        categories = config.get('categories')
+        if not categories:
+            raise ValueError("scoring config: categories가 비어 있습니다")
+        self.categories = list(categories)
+        self.category_weights = np.array(
+            [float(categories[name]['weight']) for name in self.categories])
+
+        # 카테고리별 [(컬럼, 정규화 방식, 가중치)]
+        self.components = {}
+        self.columns = []
+        self.kinds = {}
+        for name in self.categories:
+            components = []
+            for component in categories[name]['components']:
+                column, kind = component['column'], component['normalize']
+                if kind not in NORMALIZATION_KINDS:
+                    raise ValueError(f"scoring config: {column}의 정규화 방식 '{kind}'은 지원하지 않습니다")
+                if self.kinds.setdefault(column, kind) != kind:
+                    raise ValueError(f"scoring config: {column}에 서로 다른 정규화 방식이 지정됨")
+                if column not in self.columns:
+                    self.columns.append(column)
+                components.append((column, kind, float(component['weight'])))
+            self.components[name] = components
+
+        self.component_matrix = np.zeros((len(self.columns), len(self.categories)))
+        for j, name in enumerate(self.categories):
+            for column, _, weight in self.components[name]:
+                self.component_matrix[self.columns.index(column), j] += weight
+
+        # 등급: 기준 점수 내림차순, min_score가 null인 마지막 등급이 기본값
+        grades = config.get('grades', [])
+        self.grade_labels = [grade['grade'] for grade in grades if grade.get('min_score') is not None]
+        self.grade_thresholds = np.array(
+            [float(grade['min_score']) for grade in grades if grade.get('min_score') is not None])
+        defaults = [grade['grade'] for grade in grades if grade.get('min_score') is None]
+        if len(defaults) != 1:
+            raise ValueError("scoring config: min_score가 null인 기본 등급이 하나 있어야 합니다")
+        self.default_grade = defaults[0]
+        if np.any(np.diff(self.grade_thresholds) >= 0):
+            raise ValueError("scoring config: 등급 기준 점수는 내림차순이어야 합니다")
+
+    @classmethod
+    def from_file(cls, path=CONFIG_FILE):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def save(self, path):
+        """설정 원본을 JSON으로 저장 (배치 실행과 같은 계획으로 지점 점수를 계산할 수 있도록)"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.config, f, ensure_ascii=False, indent=2)
+
+    @property
+    def category_weight_map(self):
+        return dict(zip(self.categories, self.category_weights.tolist()))
+
+    def with_columns(self, renames):
+        """지표 컬럼 이름만 바꾼 계획 (예: 이동 시간 모드에서 거리 컬럼 → 시간 컬럼)"""
+        config = json.loads(json.dumps(self.config))
+        for category in config['categories'].values():
+            for component in category['components']:
+                component['column'] = renames.get(component['column'], component['column'])
+        return ScoringPlan(config)
+
+    def with_weights(self, category_weights=None, component_weights=None):
+        """
+        가중치만 바꾼 계획
+        category_weights: {카테고리: 가중치}, component_weights: {카테고리: {컬럼: 가중치}}
+        """
+        config = json.loads(json.dumps(self.config))
+        for name, weight in (category_weights or {}).items():
+            config['categories'][name]['weight'] = weight
+        for name, weights in (component_weights or {}).items():
+            for component in config['categories'][name]['components']:
+                component['weight'] = weights.get(component['column'], component['weight'])
+        return ScoringPlan(config)
+
+    # --- 정규화 ---
+
+    def normalize(self, values, kind):
+        """
+        한 지표 컬럼의 0-100점 정규화 (역수 정규화: 1 / (값 + offset))
+        결측값은 역수 정규화에서는 중앙값, 직접 정규화에서는 0으로 채움
+        값이 모두 같으면 degenerate_score
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if kind == 'inverse':
+            filled = np.where(np.isnan(values), np.nanmedian(values) if (~np.isnan(values)).any()
+                              else np.nan, values)
+        else:
+            filled = np.where(np.isnan(values), 0.0, values)
+
+        valid = filled[~np.isnan(filled)]
+        if len(valid) == 0 or (len(np.unique(valid)) == 1 and len(valid) == len(filled)):
+            return np.full(len(values), self.degenerate_score)
+
+        transformed = 1 / (filled + self.inverse_offset) if kind == 'inverse' else filled
+        low, high = np.nanmin(transformed), np.nanmax(transformed)
+        if high == low:
+            return np.full(len(values), self.degenerate_score)
+        return (transformed - low) / (high - low) * 100
+
+    def normalized_components(self, df):
+        """정규화된 지표 행렬 (행 수, 지표 수) - 가중치 설정이 바뀌어도 그대로 재사용"""
+        return np.column_stack([
+            self.normalize(df[column].to_numpy(dtype=np.float64), self.kinds[column])
+            for column in self.columns
+        ]) if len(df) else np.zeros((0, len(self.columns)))
+
+    # --- 점수 / 등급 ---
+
+    def category_scores(self, normalized):
+        """
+        카테고리 점수 (행 수, 카테고리 수)
+        설정 순서대로 더해 부동소수점 결과가 항상 같도록 행렬 곱 대신 열 단위로 누적
+        """
+        scores = np.empty((len(normalized), len(self.categories)))
+        for j, name in enumerate(self.categories):
+            score = None
+            for column, _, weight in self.components[name]:
+                part = normalized[:, self.columns.index(column)]
+                if weight != 1.0:
+                    part = part * weight
+                score = part if score is None else score + part
+            scores[:, j] = score
+        return scores
+
+    def total_scores(self, category_scores):
+        total = None
+        for j, weight in enumerate(self.category_weights):
+            part = category_scores[:, j] * weight
+            total = part if total is None else total + part
+        return np.round(total, self.total_decimals)
+
+    def grades(self, scores):
+        """점수 배열 → 등급 배열 (np.select)"""
+        scores = np.asarray(scores, dtype=np.float64)
+        conditions = [scores >= threshold for threshold in self.grade_thresholds]
+        return np.select(conditions, self.grade_labels, default=self.default_grade).astype(object)
+
+    def grade(self, score):
+        """점수 하나 → 등급"""
+        for label, threshold in zip(self.grade_labels, self.grade_thresholds):
+            if score >= threshold:
+                return label
+        return self.default_grade
+
+    def apply(self, df):
+        """카테고리 점수 / 종합 점수 / 등급 컬럼 추가"""
+        categories = self.category_scores(self.normalized_components(df))
+        for j, name in enumerate(self.categories):
+            df[name] = categories[:, j]
+        df['total_accessibility_score'] = self.total_scores(categories)
+        df['grade'] = self.grades(df['total_accessibility_score'].to_numpy())
+        return df
+
+    # --- 여러 가중치 설정 한 번에 평가 ---
+
+    def effective_weights(self):
+        """지표별 종합 점수 기여 가중치 (지표 수,) = component_matrix · category_weights"""
+        return self.component_matrix @ self.category_weights
+
+    def weight_matrix(self, plans):
+        """여러 계획의 유효 가중치를 이 계획의 지표 순서로 정렬한 (지표 수, 설정 수) 행렬"""
+        matrix = np.zeros((len(self.columns), len(plans)))
+        for k, plan in enumerate(plans):
+            if plan.inverse_offset != self.inverse_offset or plan.kinds.items() - self.kinds.items():
+                raise ValueError("정규화 방식 / 오프셋이 다른 설정은 함께 평가할 수 없습니다")
+            for column, weight in zip(plan.columns, plan.effective_weights()):
+                matrix[self.columns.index(column), k] = weight
+        return matrix
+
+    def evaluate(self, df, plans):
+        """
+        여러 가중치 설정의 종합 점수 (행 수, 설정 수)
+        지표 정규화는 한 번만 하고 행렬 곱 한 번으로 모든 설정을 계산 (반올림 전 값)
+        """
+        return self.normalized_components(df) @ self.weight_matrix(plans)
+
+
+def load_scoring_plan(path=CONFIG_FILE):
+    return ScoringPlan.from_file(path)
@@ -0,0 +1,336 @@
+"""
+로컬 HTTP 접근성 점수 서비스 (asyncio)
+시작할 때 시설 인덱스와 정규화 상수를 한 번만 로드하고, 같은 틱에 들어온 요청들의 좌표를 모아
+한 번의 벡터 거리 계산으로 처리
+
+엔드포인트
+- GET  /score?lat=37.5&lon=127.0[&weights={"medical_score": 0.5}]  한 지점
+- POST /score/batch  {"points": [[lat, lon], ...], "weights": {...}}  여러 지점
+- GET  /stats   요청 수 / 처리량 / 지연 시간 카운터
+- GET  /health
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+
+from scoring_api import AccessibilityScorer, resolve_weights
+from instrumentation import configure_logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# 한 배치에 모을 최대 지점 수, 지연 시간 통계에 보관할 최근 요청 수
+MAX_BATCH_POINTS = 50_000
+LATENCY_WINDOW = 10_000
+MAX_BODY_BYTES = 16 * 2**20
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+               500: 'Internal Server Error'}
+
+
+class ServiceStats:
+    """요청 / 배치 카운터와 최근 요청 지연 시간"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.errors = 0
+        self.points = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self.latencies_ms = deque(maxlen=window)
+
+    def record_request(self, seconds, error=False):
+        self.requests += 1
+        self.errors += int(error)
+        self.latencies_ms.append(seconds * 1000)
+
+    def record_batch(self, num_requests, num_points):
+        self.batches += 1
+        self.batched_requests += num_requests
+        self.points += num_points
+
+    def snapshot(self):
+        uptime = time.perf_counter() - self.started
+        latencies = np.array(self.latencies_ms) if self.latencies_ms else np.zeros(1)
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        return {
+            'uptime_seconds': round(uptime, 3),
+            'requests': self.requests,
+            'errors': self.errors,
+            'points': self.points,
+            'batches': self.batches,
+            'requests_per_batch': round(self.batched_requests / max(self.batches, 1), 3),
+            'requests_per_second': round(self.requests / uptime, 3) if uptime else 0.0,
+            'points_per_second': round(self.points / uptime, 3) if uptime else 0.0,
+            'latency_ms': {
+                'p50': round(float(p50), 3),
+                'p95': round(float(p95), 3),
+                'p99': round(float(p99), 3),
+                'max': round(float(latencies.max()), 3),
+            },
+        }
+
+
+class RequestCoalescer:
+    """
+    대기 중인 요청들을 모아 한 번에 점수 계산
+    계산은 전용 스레드 하나에서 실행되므로, 계산 중에 들어온 요청은 다음 배치로 모임
+    """
+
+    def __init__(self, scorer, stats, max_batch_points=MAX_BATCH_POINTS):
+        self.scorer = scorer
+        self.stats = stats
+        self.max_batch_points = max_batch_points
+        self._pending = deque()
+        self._wakeup = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scorer')
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=True)
+
+    async def submit(self, latitudes, longitudes, weights=None):
+        """좌표 배열 점수 요청 → 지점별 결과 dict 목록"""
+        weights = resolve_weights(weights, self.scorer.plan)
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((latitudes, longitudes, weights, future))
+        self._wakeup.set()
+        return await future
+
+    def _take_batch(self):
+        batch, num_points = [], 0
+        while self._pending and (not batch or num_points + len(self._pending[0][0]) <= self.max_batch_points):
+            request = self._pending.popleft()
+            batch.append(request)
+            num_points += len(request[0])
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            # 같은 틱에 도착한 요청이 모두 대기열에 들어오도록 한 번 양보
+            await asyncio.sleep(0)
+            batch = self._take_batch()
+            if not self._pending:
+                self._wakeup.clear()
+            if not batch:
+                continue
+
+            latitudes = np.concatenate([request[0] for request in batch])
+            longitudes = np.concatenate([request[1] for request in batch])
+            try:
+                scores = await loop.run_in_executor(
+                    self._executor, self.scorer.category_scores, latitudes, longitudes)
+            except Exception as error:
+                if len(batch) == 1:
+                    if not batch[0][-1].done():
+                        batch[0][-1].set_exception(error)
+                else:
+                    # 한 요청 때문에 같은 배치의 다른 요청까지 실패하지 않도록 요청별로 다시 계산
+                    await self._run_separately(batch)
+                continue
+
+            self.stats.record_batch(len(batch), len(latitudes))
+            self._resolve(batch, latitudes, longitudes, scores)
+
+    async def _run_separately(self, batch):
+        """배치 계산이 실패하면 요청마다 따로 계산 (실패한 요청만 예외)"""
+        loop = asyncio.get_running_loop()
+        for request_lats, request_lons, weights, future in batch:
+            try:
+                scores = await loop.run_in_executor(
+                    self._executor, self.scorer.category_scores, request_lats, request_lons)
+            except Exception as error:
+                if not future.done():
+                    future.set_exception(error)
+                continue
+            self.stats.record_batch(1, len(request_lats))
+            self._resolve([(request_lats, request_lons, weights, future)],
+                          request_lats, request_lons, scores)
+
+    def _resolve(self, batch, latitudes, longitudes, scores):
+        """배치 점수를 요청별로 나누어 future에 결과 설정"""
+        plan = self.scorer.plan
+        categories = {category: scores[category] for category in plan.categories}
+
+        start = 0
+        for request_lats, _, weights, future in batch:
+            stop = start + len(request_lats)
+            if not future.done():
+                future.set_result(_records(
+                    latitudes[start:stop], longitudes[start:stop],
+                    scores['district'][start:stop],
+                    {category: values[start:stop] for category, values in categories.items()},
+                    weights, plan))
+            start = stop
+
+
+def _records(latitudes, longitudes, districts, categories, weights, plan):
+    """요청 하나의 지점별 결과 dict 목록 (가중치는 요청마다 다를 수 있음)"""
+    total = np.round(sum(categories[category] * weight for category, weight in weights.items()),
+                     plan.total_decimals)
+    columns = {category: values.tolist() for category, values in categories.items()}
+    grades = plan.grades(total)
+    records = []
+    for i, (lat, lon, district, score, grade) in enumerate(zip(
+            latitudes.tolist(), longitudes.tolist(), districts, total.tolist(), grades)):
+        record = {'latitude': lat, 'longitude': lon, 'district': str(district)}
+        for category, values in columns.items():
+            record[category] = values[i]
+        record['total_accessibility_score'] = score
+        record['grade'] = grade
+        records.append(record)
+    return records
+
+
+def _parse_point(lat, lon):
+    """좌표 검증 (숫자가 아니거나 NaN / 무한대 / 위경도 범위 밖이면 대기열에 넣기 전에 ValueError)"""
+    try:
+        lat, lon = float(lat), float(lon)
+    except (TypeError, ValueError):
+        raise ValueError(f"잘못된 좌표: {lat}, {lon}")
+    if not (np.isfinite(lat) and np.isfinite(lon) and -90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError(f"잘못된 좌표: {lat}, {lon}")
+    return lat, lon
+
+
+class ScoringService:
+    """HTTP/1.1 (keep-alive) 요청 처리"""
+
+    def __init__(self, scorer):
+        self.stats = ServiceStats()
+        self.coalescer = RequestCoalescer(scorer, self.stats)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {'error': '요청 본문이 너무 큽니다'}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                start = time.perf_counter()
+                status, payload = await self._dispatch(method, target, body)
+                if urlsplit(target).path.startswith('/score'):
+                    self.stats.record_request(time.perf_counter() - start, error=status != 200)
+
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, target, body):
+        url = urlsplit(target)
+        try:
+            if method == 'GET' and url.path == '/score':
+                query = parse_qs(url.query)
+                lat, lon = _parse_point(query.get('lat', [None])[0], query.get('lon', [None])[0])
+                weights = json.loads(query['weights'][0]) if 'weights' in query else None
+                results = await self.coalescer.submit(np.array([lat]), np.array([lon]), weights)
+                return 200, results[0]
+
+            if method == 'POST' and url.path == '/score/batch':
+                request = json.loads(body or b'{}')
+                if not isinstance(request, dict):
+                    return 400, {'error': '요청 본문은 JSON 객체여야 합니다'}
+                points = [_parse_point(*point) for point in request.get('points', [])]
+                if not points:
+                    return 400, {'error': 'points가 비어 있습니다'}
+                lats, lons = np.array(points, dtype=np.float64).T
+                results = await self.coalescer.submit(lats, lons, request.get('weights'))
+                return 200, {'results': results}
+
+            if method == 'GET' and url.path == '/stats':
+                return 200, self.stats.snapshot()
+
+            if method == 'GET' and url.path == '/health':
+                return 200, {'status': 'ok'}
+
+            return 404, {'error': f'{method} {url.path} 없음'}
+        except (ValueError, TypeError, KeyError) as error:
+            return 400, {'error': str(error)}
+        except Exception as error:
+            return 500, {'error': str(error)}
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive=True):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode('latin-1')
+        writer.write(head + body)
+        await writer.drain()
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, scorer=None):
+    """인덱스를 로드하고 서비스 시작 (종료될 때까지 실행)"""
+    start = time.perf_counter()
+    scorer = scorer or AccessibilityScorer.from_processed()
+    logger.info(f"📁 인덱스 로드 완료: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    service = ScoringService(scorer)
+    service.coalescer.start()
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    logger.info(f"✅ 접근성 점수 서비스: http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.coalescer.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 HTTP 접근성 점수 서비스")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--quiet", action="store_true", help="경고 외 콘솔 출력 생략")
+    args = parser.parse_args()
+
+    configure_logging(quiet=args.quiet)
+
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        logger.info("\n👋 서비스 종료")
@@ -0,0 +1,232 @@
+"""
+가중치 민감도 분석 (Monte Carlo)
+카테고리 가중치(4개)와 카테고리 내 거리 / 밀도 비율을 Dirichlet 분포에서 수천 번 샘플링하여
+단위(구 / 격자 셀)별 순위 분포와 등급이 바뀔 확률을 계산
+
+- 배치 결과 CSV의 거리 / 밀도 지표를 한 번만 정규화 (거리 재계산 없음)
+- 샘플별 유효 가중치 행렬(지표 수 × 샘플 수)과의 행렬 곱 한 번으로 모든 샘플의 종합 점수 계산
+- 순위 / 등급 집계는 샘플 묶음 단위로 누적 (단위 수 × 샘플 수 행렬을 한 번에 들고 있지 않음)
+- 단위별 순위 분포는 구간 수가 제한된 히스토그램과 평균 / 표준편차 / 상·하위 k위 빈도로 요약
+  (격자 셀처럼 단위가 많아도 메모리가 단위 수에 비례)
+"""
+
+import argparse
+import logging
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from calculate_accessibility import PROCESSED_DIR, SCORING_PLAN, load_scoring_plan
+from instrumentation import configure_logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SAMPLES = 10_000
+DEFAULT_BATCH_SIZE = 2_000
+# 단위별 순위 히스토그램 구간 수 (단위 수가 이보다 많으면 순위를 구간으로 묶음)
+DEFAULT_RANK_BINS = 100
+# 한 묶음의 순위 / 점수 행렬 원소 수 상한 (단위 수 × 샘플 수)
+DEFAULT_MAX_ELEMENTS = 8_000_000
+RANK_PERCENTILES = [5, 50, 95]
+
+
+def sample_weight_matrix(plan, n_samples, concentration=None, seed=None):
+    """
+    가중치 샘플 → 지표별 유효 가중치 행렬 (지표 수, 샘플 수)
+    concentration: None이면 균등 Dirichlet(1, ..., 1) (가중치에 대한 사전 지식 없음),
+                   값을 주면 설정 가중치를 평균으로 하는 Dirichlet(concentration · 가중치) (클수록 설정 가중치 근처)
+    지표가 하나뿐인 카테고리는 설정의 지표 가중치를 그대로 사용
+    """
+    rng = np.random.default_rng(seed)
+
+    def alphas(weights):
+        weights = np.asarray(weights, dtype=np.float64)
+        if concentration is None:
+            return np.ones(len(weights))
+        return concentration * weights / weights.sum()
+
+    category_weights = rng.dirichlet(alphas(plan.category_weights), n_samples)
+    effective = np.zeros((len(plan.columns), n_samples))
+    for j, category in enumerate(plan.categories):
+        components = plan.components[category]
+        weights = [weight for *_, weight in components]
+        if len(components) > 1:
+            splits = rng.dirichlet(alphas(weights), n_samples)
+        else:
+            splits = np.broadcast_to(np.asarray(weights), (n_samples, 1))
+        for i, (column, _, _) in enumerate(components):
+            effective[plan.columns.index(column)] += category_weights[:, j] * splits[:, i]
+    return effective
+
+
+def rank_units(totals):
+    """점수 행렬 (단위 수, 샘플 수) → 샘플별 순위 (1 = 최고 점수)"""
+    order = np.argsort(-totals, axis=0, kind='stable')
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(1, len(totals) + 1)[:, None], axis=0)
+    return ranks
+
+
+def grade_indices(plan, totals):
+    """점수 → 등급 번호 (plan.grade_labels 순서, 마지막 번호가 기본 등급)"""
+    # 기준 점수가 내림차순이므로 부호를 바꿔 오름차순 searchsorted (점수보다 높은 기준의 개수)
+    return np.searchsorted(-plan.grade_thresholds, -totals, side='left')
+
+
+def rank_bins(n_units, max_bins=DEFAULT_RANK_BINS):
+    """순위 → 히스토그램 구간 번호 계산용 (구간 수, 구간별 (최소 순위, 최대 순위))"""
+    bins = min(n_units, max_bins)
+    edges = -(-np.arange(bins + 1) * n_units // bins)  # ceil(b · n / bins)
+    return bins, edges[:-1] + 1, edges[1:]
+
+
+def run_sensitivity(units, plan=None, id_column='district', n_samples=DEFAULT_SAMPLES,
+                    concentration=None, seed=None, batch_size=DEFAULT_BATCH_SIZE, top_k=5,
+                    max_rank_bins=DEFAULT_RANK_BINS, max_elements=DEFAULT_MAX_ELEMENTS):
+    """
+    가중치 Monte Carlo 민감도 분석
+    units: 지표 컬럼을 가진 단위별 배치 결과 (accessibility_scores.csv / grid_accessibility_scores.csv)
+    max_rank_bins: 단위별 순위 히스토그램 구간 수 (단위 수 이하면 순위별 정확한 분포, 넘으면 구간 분포)
+    max_elements: 한 묶음의 (단위 수 × 샘플 수) 상한 (단위가 많으면 묶음 크기를 줄임)
+    결과: (단위별 요약 DataFrame, 순위 구간 분포 DataFrame (id, rank_min, rank_max, probability))
+    메모리는 단위 수 × (구간 수 + 등급 수)로 제한 (단위 수의 제곱에 비례하지 않음)
+    """
+    plan = plan or SCORING_PLAN
+    n_units = len(units)
+    labels = plan.grade_labels + [plan.default_grade]
+    top_k = min(top_k, n_units)
+    batch_size = max(1, min(batch_size, max_elements // max(n_units, 1)))
+
+    normalized = plan.normalized_components(units)
+    base_totals = np.round(normalized @ plan.effective_weights(), plan.total_decimals)
+    base_ranks = rank_units(base_totals[:, None])[:, 0]
+    base_grades = grade_indices(plan, base_totals)
+
+    weights = sample_weight_matrix(plan, n_samples, concentration, seed)
+
+    bins, bin_min, bin_max = rank_bins(n_units, max_rank_bins)
+    rank_counts = np.zeros(n_units * bins, dtype=np.int64)
+    grade_counts = np.zeros((n_units, len(labels)), dtype=np.int64)
+    top_counts = np.zeros(n_units, dtype=np.int64)
+    bottom_counts = np.zeros(n_units, dtype=np.int64)
+    rank_sum = np.zeros(n_units)
+    rank_sq_sum = np.zeros(n_units)
+    rank_min = np.full(n_units, n_units, dtype=np.int64)
+    rank_max = np.zeros(n_units, dtype=np.int64)
+    score_sum = np.zeros(n_units)
+    score_sq_sum = np.zeros(n_units)
+    score_min = np.full(n_units, np.inf)
+    score_max = np.full(n_units, -np.inf)
+    offsets = (np.arange(n_units) * bins)[:, None]
+
+    for start in range(0, n_samples, batch_size):
+        totals = np.round(normalized @ weights[:, start:start + batch_size], plan.total_decimals)
+
+        ranks = rank_units(totals)
+        rank_counts += np.bincount((offsets + (ranks - 1) * bins // n_units).ravel(),
+                                   minlength=n_units * bins)
+        top_counts += (ranks <= top_k).sum(axis=1)
+        bottom_counts += (ranks > n_units - top_k).sum(axis=1)
+        rank_sum += ranks.sum(axis=1)
+        rank_sq_sum += (ranks.astype(np.float64) ** 2).sum(axis=1)
+        rank_min = np.minimum(rank_min, ranks.min(axis=1))
+        rank_max = np.maximum(rank_max, ranks.max(axis=1))
+
+        grades = grade_indices(plan, totals)
+        grade_counts += np.stack([(grades == g).sum(axis=1) for g in range(len(labels))], axis=1)
+
+        score_sum += totals.sum(axis=1)
+        score_sq_sum += (totals ** 2).sum(axis=1)
+        score_min = np.minimum(score_min, totals.min(axis=1))
+        score_max = np.maximum(score_max, totals.max(axis=1))
+
+    rank_probabilities = rank_counts.reshape(n_units, bins) / n_samples
+    cumulative = np.cumsum(rank_probabilities, axis=1)
+
+    mean_score = score_sum / n_samples
+    mean_rank = rank_sum / n_samples
+    summary = pd.DataFrame({
+        id_column: units[id_column].to_numpy(),
+        'base_score': base_totals,
+        'base_rank': base_ranks,
+        'base_grade': np.asarray(labels, dtype=object)[base_grades],
+        'mean_score': mean_score,
+        'score_std': np.sqrt(np.maximum(score_sq_sum / n_samples - mean_score ** 2, 0)),
+        'min_score': score_min,
+        'max_score': score_max,
+        'mean_rank': mean_rank,
+        'rank_std': np.sqrt(np.maximum(rank_sq_sum / n_samples - mean_rank ** 2, 0)),
+        'min_rank': rank_min,
+        'max_rank': rank_max,
+    })
+    for q in RANK_PERCENTILES:
+        # 누적 확률이 q% 이상이 되는 첫 순위 구간의 최대 순위 (구간 폭이 1이면 정확한 순위)
+        summary[f'rank_p{q:02d}'] = bin_max[(cumulative < q / 100 - 1e-12).sum(axis=1)]
+    summary[f'top{top_k}_probability'] = top_counts / n_samples
+    summary[f'bottom{top_k}_probability'] = bottom_counts / n_samples
+    for g, label in enumerate(labels):
+        summary[f'grade_{label}_probability'] = grade_counts[:, g] / n_samples
+    summary['grade_flip_probability'] = 1 - grade_counts[np.arange(n_units), base_grades] / n_samples
+
+    unit_index, bin_index = np.nonzero(rank_probabilities)
+    distribution = pd.DataFrame({
+        id_column: units[id_column].to_numpy()[unit_index],
+        'rank_min': bin_min[bin_index],
+        'rank_max': bin_max[bin_index],
+        'probability': rank_probabilities[unit_index, bin_index],
+    })
+
+    return summary.sort_values('base_rank').reset_index(drop=True), distribution
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="가중치 Monte Carlo 민감도 분석")
+    parser.add_argument("--input", type=Path, default=PROCESSED_DIR / "accessibility_scores.csv",
+                        help="단위별 배치 결과 CSV (기본: 자치구 결과)")
+    parser.add_argument("--id-column", default="district", help="단위 식별 컬럼 (격자: cell_id)")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES)
+    parser.add_argument("--concentration", type=float, default=None,
+                        help="설정 가중치 중심 Dirichlet 집중도 (기본: 균등 Dirichlet)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--rank-bins", type=int, default=DEFAULT_RANK_BINS,
+                        help="단위별 순위 분포 구간 수 (단위 수 이하면 순위별 정확한 분포)")
+    parser.add_argument("--scoring-config", type=Path, default=None, metavar="JSON")
+    parser.add_argument("--quiet", action="store_true", help="경고 외 콘솔 출력 생략")
+    args = parser.parse_args()
+
+    configure_logging(quiet=args.quiet)
+
+    plan = load_scoring_plan(args.scoring_config) if args.scoring_config else SCORING_PLAN
+    units = pd.read_csv(args.input, encoding='utf-8-sig')
+
+    logger.info(f"🎲 가중치 샘플 {args.samples:,}개 × 단위 {len(units):,}개 민감도 분석 중...")
+    start = time.perf_counter()
+    summary, distribution = run_sensitivity(
+        units, plan, id_column=args.id_column, n_samples=args.samples,
+        concentration=args.concentration, seed=args.seed, batch_size=args.batch_size,
+        max_rank_bins=args.rank_bins)
+    logger.info(f"   ✅ 완료: {time.perf_counter() - start:.2f}초\n")
+
+    stem = args.input.stem
+    summary_output = PROCESSED_DIR / f"{stem}_sensitivity.csv"
+    distribution_output = PROCESSED_DIR / f"{stem}_rank_distribution.csv"
+    summary.to_csv(summary_output, index=False, encoding='utf-8-sig')
+    distribution.to_csv(distribution_output, index=False, encoding='utf-8-sig')
+
+    logger.info("📊 순위 분포 (기준 순위 / 5%·50%·95% 순위 / 등급 변경 확률)")
+    logger.info("-" * 80)
+    for row in summary.head(20).itertuples(index=False):
+        unit = str(getattr(row, args.id_column))
+        logger.info(f"{unit:8s} | 기준 {row.base_rank:3d}위 ({row.base_grade}) | "
+                    f"{row.rank_p05:3d} / {row.rank_p50:3d} / {row.rank_p95:3d}위 | "
+                    f"등급 변경 {row.grade_flip_probability:6.1%}")
+    if len(summary) > 20:
+        logger.info(f"... 외 {len(summary) - 20:,}개")
+    logger.info("-" * 80)
+    logger.info(f"   • 평균 등급 변경 확률: {summary['grade_flip_probability'].mean():.1%}")
+
+    logger.info(f"\n✅ 요약 저장: {summary_output}")
+    logger.info(f"✅ 순위 분포 저장: {distribution_output}")
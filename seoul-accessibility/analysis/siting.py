@@ -0,0 +1,218 @@
+"""
+신규 시설 최적 입지 추천 (lazy-greedy 최대 커버리지)
+격자 셀을 수요 지점(인구 가중)으로, 더 성긴 격자 셀을 후보지로 두고
+예산 K개만큼 인구 가중 최근접 거리 감소량(또는 반경 내 신규 커버 인구)이 가장 큰 후보를 차례로 선택
+
+- 후보지마다 영향 반경 내 수요 셀과 거리를 미리 한 번 계산 (BallTree 반경 질의)
+- 선택 후에는 선택된 후보의 영향 셀만 최근접 거리를 갱신
+- 목적 함수가 체감(submodular)하므로 이전 이득을 상한으로 쓰는 lazy-greedy로 대부분의 재평가를 생략
+  (재평가 한 번은 해당 후보의 영향 셀 수에 비례)
+"""
+
+import argparse
+import heapq
+import logging
+
+import numpy as np
+import pandas as pd
+
+from calculate_accessibility import PROCESSED_DIR, FACILITY_SPECS, load_facilities
+from grid_accessibility import build_grid
+from spatial_index import FacilityIndex
+from ingest import load_dataset
+from instrumentation import configure_logging
+
+logger = logging.getLogger(__name__)
+
+OBJECTIVES = ['distance', 'coverage']
+
+# 기존 시설이 하나도 없을 때 수요 셀의 현재 거리로 쓰는 값 (km)
+NO_FACILITY_DISTANCE_KM = 20.0
+
+
+def demand_weights(districts_df, population_df=None, age_groups=None):
+    """
+    구별 수요 인구
+    age_groups를 주면 population.csv의 해당 연령대 인구 합 (예: 병원 입지에 60+만 반영)
+    """
+    if not age_groups:
+        return districts_df.set_index('district')['population'].astype(np.float64)
+
+    selected = population_df[population_df['age_group'].astype(str).isin(age_groups)]
+    if selected.empty:
+        raise ValueError(f"population.csv에 없는 연령대: {age_groups}")
+    weights = selected.groupby('district', observed=True)['population'].sum()
+    return weights.reindex(districts_df['district']).fillna(0).astype(np.float64)
+
+
+def build_demand_cells(districts_df, weights, cell_m=100):
+    """격자 셀별 수요 인구 (구 수요 인구를 구 내 셀에 균등 배분)"""
+    cells = build_grid(districts_df, cell_m=cell_m)
+    cells_per_district = cells['district'].map(cells['district'].value_counts())
+    cells['population'] = cells['district'].map(weights).fillna(0) / cells_per_district
+    return cells
+
+
+class CoverageProblem:
+    """
+    후보지 × 영향 수요 셀 구조 (CSR 형태: offsets[j]:offsets[j+1]이 후보 j의 영향 셀)
+    current: 수요 셀별 현재 최근접 시설 거리 (선택할 때마다 갱신)
+    """
+
+    def __init__(self, demand_lats, demand_lons, demand_weights, current_distances,
+                 candidate_lats, candidate_lons, radius_km, objective='distance', coverage_km=None):
+        if objective not in OBJECTIVES:
+            raise ValueError(f"objective는 {OBJECTIVES} 중 하나여야 합니다")
+        self.objective = objective
+        self.coverage_km = coverage_km
+        self.weights = np.asarray(demand_weights, dtype=np.float64)
+        self.current = np.asarray(current_distances, dtype=np.float64).copy()
+
+        demand_index = FacilityIndex(demand_lats, demand_lons)
+        positions, distances = demand_index.query_radius(candidate_lats, candidate_lons, radius_km)
+        lengths = np.array([len(p) for p in positions], dtype=np.int64)
+        self.offsets = np.concatenate([[0], np.cumsum(lengths)])
+        self.cells = np.concatenate(positions) if len(positions) else np.array([], dtype=np.int64)
+        self.distances = np.concatenate(distances) if len(distances) else np.array([])
+
+    @property
+    def num_candidates(self):
+        return len(self.offsets) - 1
+
+    def _affected(self, candidate):
+        start, stop = self.offsets[candidate], self.offsets[candidate + 1]
+        return self.cells[start:stop], self.distances[start:stop]
+
+    def gain(self, candidate):
+        """후보 하나를 추가했을 때의 목적 함수 증가량 (영향 셀만 계산)"""
+        cells, distances = self._affected(candidate)
+        current = self.current[cells]
+        if self.objective == 'distance':
+            return float((self.weights[cells] * np.maximum(current - distances, 0.0)).sum())
+        newly_covered = (current > self.coverage_km) & (distances <= self.coverage_km)
+        return float(self.weights[cells][newly_covered].sum())
+
+    def select(self, candidate):
+        """후보 선택: 영향 셀의 최근접 거리 갱신"""
+        cells, distances = self._affected(candidate)
+        self.current[cells] = np.minimum(self.current[cells], distances)
+
+    def lazy_greedy(self, k):
+        """
+        lazy-greedy 선택
+        결과: [(후보 번호, 이득)] 선택 순서대로, 재평가 횟수
+        """
+        heap = [(-self.gain(j), j, 0) for j in range(self.num_candidates)]
+        heapq.heapify(heap)
+        evaluations = self.num_candidates
+
+        chosen = []
+        while heap and len(chosen) < k:
+            negative_gain, candidate, round_evaluated = heapq.heappop(heap)
+            if round_evaluated == len(chosen):
+                # 최신 이득이 다른 후보들의 상한보다 크므로 그대로 선택
+                if -negative_gain <= 0:
+                    break
+                self.select(candidate)
+                chosen.append((candidate, -negative_gain))
+                continue
+            heapq.heappush(heap, (-self.gain(candidate), candidate, len(chosen)))
+            evaluations += 1
+
+        return chosen, evaluations
+
+
+def recommend_sites(facility_type='hospitals', k=10, objective='distance', cell_m=100,
+                    candidate_cell_m=500, radius_km=None, coverage_km=1.0, age_groups=None):
+    """
+    신규 시설 입지 추천
+    radius_km: 후보지 영향 반경 (None이면 현재 최근접 거리의 최댓값 → 거리 목적 함수에서 정확한 값)
+    결과: (선택 후보지 DataFrame, 요약 dict)
+    """
+    if facility_type not in FACILITY_SPECS:
+        raise ValueError(f"알 수 없는 시설 종류: {facility_type}")
+
+    districts = load_dataset('districts')
+    population = load_dataset('population') if age_groups else None
+    weights = demand_weights(districts, population, age_groups)
+
+    cells = build_demand_cells(districts, weights, cell_m=cell_m)
+    candidates = build_grid(districts, cell_m=candidate_cell_m)
+
+    facilities = load_facilities()[facility_type]
+    index = FacilityIndex.from_dataframe(facilities)
+    lats = cells['latitude'].to_numpy()
+    lons = cells['longitude'].to_numpy()
+    if len(index):
+        current, _ = index.nearest(lats, lons)
+    else:
+        current = np.full(len(cells), NO_FACILITY_DISTANCE_KM)
+
+    if radius_km is None:
+        radius_km = float(current.max()) if objective == 'distance' else coverage_km
+
+    problem = CoverageProblem(
+        lats, lons, cells['population'].to_numpy(), current,
+        candidates['latitude'].to_numpy(), candidates['longitude'].to_numpy(),
+        radius_km=radius_km, objective=objective, coverage_km=coverage_km,
+    )
+    chosen, evaluations = problem.lazy_greedy(k)
+
+    positions = [candidate for candidate, _ in chosen]
+    sites = candidates.iloc[positions][['latitude', 'longitude', 'district']].reset_index(drop=True)
+    sites.insert(0, 'rank', np.arange(1, len(sites) + 1))
+    sites['gain'] = [gain for _, gain in chosen]
+
+    population_total = cells['population'].sum()
+    summary = {
+        'facility_type': facility_type,
+        'objective': objective,
+        'demand_cells': len(cells),
+        'candidates': problem.num_candidates,
+        'evaluations': evaluations,
+        'weighted_nearest_km_before': float((current * cells['population']).sum() / population_total),
+        'weighted_nearest_km_after': float((problem.current * cells['population']).sum() / population_total),
+        'coverage_before': float(cells['population'][current <= coverage_km].sum() / population_total),
+        'coverage_after': float(cells['population'][problem.current <= coverage_km].sum() / population_total),
+    }
+    return sites, summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="신규 시설 최적 입지 추천 (lazy-greedy)")
+    parser.add_argument("--type", default="hospitals", choices=list(FACILITY_SPECS))
+    parser.add_argument("-k", type=int, default=10, help="신규 시설 수 (예산)")
+    parser.add_argument("--objective", choices=OBJECTIVES, default="distance",
+                        help="distance: 인구 가중 최근접 거리 감소 / coverage: 반경 내 신규 커버 인구")
+    parser.add_argument("--cell-m", type=int, default=100, help="수요 격자 크기 (m)")
+    parser.add_argument("--candidate-cell-m", type=int, default=500, help="후보지 격자 크기 (m)")
+    parser.add_argument("--radius-km", type=float, default=None, help="후보지 영향 반경 (km)")
+    parser.add_argument("--coverage-km", type=float, default=1.0, help="커버리지 기준 거리 (km)")
+    parser.add_argument("--age-groups", nargs="+", default=None,
+                        help="수요 인구로 쓸 연령대 (예: 60+)")
+    parser.add_argument("--quiet", action="store_true", help="경고 외 콘솔 출력 생략")
+    args = parser.parse_args()
+
+    configure_logging(quiet=args.quiet)
+
+    logger.info(f"📍 {FACILITY_SPECS[args.type]['display_name']} 신규 입지 {args.k}곳 탐색 중...\n")
+    sites, summary = recommend_sites(
+        args.type, k=args.k, objective=args.objective, cell_m=args.cell_m,
+        candidate_cell_m=args.candidate_cell_m, radius_km=args.radius_km,
+        coverage_km=args.coverage_km, age_groups=args.age_groups,
+    )
+
+    for _, site in sites.iterrows():
+        logger.info(f"   {site['rank']:2d}. {site['district']:6s} ({site['latitude']:.5f}, {site['longitude']:.5f}) "
+                    f"| 이득 {site['gain']:,.1f}")
+
+    logger.info(f"\n   수요 셀 {summary['demand_cells']:,}개 / 후보지 {summary['candidates']:,}개 | "
+                f"재평가 {summary['evaluations']:,}회")
+    logger.info(f"   인구 가중 최근접 거리: {summary['weighted_nearest_km_before']:.3f}km → "
+                f"{summary['weighted_nearest_km_after']:.3f}km")
+    logger.info(f"   {args.coverage_km}km 이내 인구 비율: {summary['coverage_before']:.1%} → "
+                f"{summary['coverage_after']:.1%}")
+
+    output_file = PROCESSED_DIR / f"siting_{args.type}.csv"
+    sites.to_csv(output_file, index=False, encoding='utf-8-sig')
+    logger.info(f"\n✅ 추천 입지 저장: {output_file}")
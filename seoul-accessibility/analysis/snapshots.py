@@ -0,0 +1,352 @@
+"""
+데이터 공개본별 분석 스냅샷 (시계열 비교용)
+분석을 다시 실행할 때마다 data/processed/가 덮어쓰이므로, 입력(원본 CSV / 점수 규칙)과 출력을
+내용 주소 저장소(data/snapshots/objects/, SHA-256)에 보관하고 스냅샷 manifest로 묶음
+
+- 내용이 같은 파일은 한 번만 저장 (바뀌지 않은 시설 파일은 스냅샷마다 중복 저장하지 않음)
+- 점수 결과 CSV는 스냅샷 시점에 Parquet으로도 저장하여, 비교 시 필요한 컬럼만 읽음
+  (원본 CSV를 다시 읽거나 분석을 다시 실행하지 않음)
+- diff: 두 스냅샷의 구별 점수 / 등급 변화, trend: 전체 스냅샷의 구별 점수 추이
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+from calculate_accessibility import DATA_DIR, RAW_DIR, PROCESSED_DIR, SCORE_COMPONENTS
+from scoring_config import CONFIG_FILE
+from ingest import SCHEMAS, file_sha256
+from instrumentation import configure_logging
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = DATA_DIR / "snapshots"
+
+# 스냅샷마다 컬럼형(Parquet)으로도 저장할 결과: {이름: (CSV 파일, 단위 컬럼)}
+COLUMNAR_OUTPUTS = {
+    'accessibility_scores': ("accessibility_scores.csv", 'district'),
+    'grid_district_scores': ("grid_district_scores.csv", 'district'),
+}
+
+SCORE_COLUMNS = list(SCORE_COMPONENTS) + ['total_accessibility_score']
+
+
+class SnapshotStore:
+    """
+    스냅샷 저장소
+    objects/{해시 앞 2자리}/{해시}: 파일 내용
+    manifests/{스냅샷 ID}.json: 입력 / 출력 / 컬럼형 결과 이름 → 해시
+    """
+
+    def __init__(self, root=SNAPSHOT_DIR):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.manifests_dir = self.root / "manifests"
+
+    def _object_path(self, digest):
+        return self.objects_dir / digest[:2] / digest
+
+    def _store(self, digest, write):
+        """해시에 해당하는 객체가 없을 때만 저장 (임시 파일에 쓴 뒤 이름 변경) - 결과: 새로 저장했는지"""
+        path = self._object_path(digest)
+        if path.exists():
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        write(tmp)
+        os.replace(tmp, path)
+        return True
+
+    def put_file(self, path):
+        """파일 저장 → (해시, 새로 저장했는지)"""
+        digest = file_sha256(path)
+        return digest, self._store(digest, lambda tmp: shutil.copyfile(path, tmp))
+
+    def put_bytes(self, data):
+        digest = hashlib.sha256(data).hexdigest()
+        return digest, self._store(digest, lambda tmp: tmp.write_bytes(data))
+
+    def object_path(self, digest):
+        path = self._object_path(digest)
+        if not path.exists():
+            raise FileNotFoundError(f"스냅샷 객체가 없습니다: {digest}")
+        return path
+
+    # --- 스냅샷 생성 / 조회 ---
+
+    def create(self, label=None, raw_dir=RAW_DIR, processed_dir=PROCESSED_DIR):
+        """
+        현재 입력 / 출력으로 스냅샷 생성
+        결과: manifest dict (stored: 이번에 새로 저장한 객체 수)
+        """
+        raw_dir, processed_dir = Path(raw_dir), Path(processed_dir)
+        files = {'inputs': {}, 'outputs': {}, 'columnar': {}}
+        stored = 0
+
+        sources = {name: raw_dir / schema['file'] for name, schema in SCHEMAS.items()}
+        sources['scoring_config'] = CONFIG_FILE
+        for name, path in sources.items():
+            if path.exists():
+                files['inputs'][name], new = self.put_file(path)
+                stored += new
+
+        for path in sorted(processed_dir.glob("*")):
+            if path.is_file():
+                files['outputs'][path.name], new = self.put_file(path)
+                stored += new
+
+        for name, (filename, _) in COLUMNAR_OUTPUTS.items():
+            path = processed_dir / filename
+            if path.exists():
+                files['columnar'][name], new = self.put_bytes(_to_parquet(path))
+                stored += new
+
+        if not files['outputs']:
+            raise FileNotFoundError(f"{processed_dir}에 분석 결과가 없습니다 (먼저 분석을 실행하세요)")
+
+        # 같은 초에 만든 스냅샷도 생성 순서를 유지하도록 순번과 마이크로초 단위 시각을 함께 저장
+        # (ID 해시에도 시각을 넣어 같은 초 / 같은 내용의 스냅샷이 서로 덮어쓰지 않음)
+        created = datetime.now(timezone.utc).isoformat(timespec='microseconds')
+        sequence = max((m.get('sequence', 0) for m in self.manifests()), default=0) + 1
+        content = hashlib.sha256(json.dumps({'created': created, 'files': files},
+                                            sort_keys=True).encode('utf-8')).hexdigest()
+        manifest = {
+            'id': f"{datetime.fromisoformat(created):%Y%m%dT%H%M%SZ}-{content[:8]}",
+            'sequence': sequence,
+            'created': created,
+            'label': label,
+            **files,
+        }
+        self.manifests_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.manifests_dir / f"{manifest['id']}.json", 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        return {**manifest, 'stored': stored}
+
+    def manifests(self):
+        """
+        모든 스냅샷 manifest (생성 순서)
+        파일 이름(초 단위 시각 + 내용 해시)이 아니라 순번 → 생성 시각 순으로 정렬
+        (순번이 없는 이전 스냅샷은 순번 0으로 보고 시각 순)
+        """
+        if not self.manifests_dir.exists():
+            return []
+        manifests = []
+        for path in self.manifests_dir.glob("*.json"):
+            with open(path, encoding='utf-8') as f:
+                manifests.append(json.load(f))
+        return sorted(manifests, key=lambda m: (m.get('sequence', 0), datetime.fromisoformat(m['created'])))
+
+    def resolve(self, ref):
+        """
+        스냅샷 지정 → manifest
+        ref: 스냅샷 ID (앞부분만 써도 됨), 라벨, 'latest', 'latest~N' (N개 전)
+        """
+        manifests = self.manifests()
+        if not manifests:
+            raise LookupError("저장된 스냅샷이 없습니다")
+
+        if ref == 'latest' or ref.startswith('latest~'):
+            back = int(ref.split('~')[1]) if '~' in ref else 0
+            if back >= len(manifests):
+                raise LookupError(f"스냅샷이 {len(manifests)}개뿐입니다: {ref}")
+            return manifests[-1 - back]
+
+        matches = [m for m in manifests if m['id'].startswith(ref)] or \
+                  [m for m in manifests if m.get('label') == ref]
+        if not matches:
+            raise LookupError(f"스냅샷을 찾을 수 없습니다: {ref}")
+        if len(matches) > 1:
+            # 같은 라벨이 여러 번이면 가장 최근 스냅샷
+            if all(m.get('label') == ref for m in matches):
+                return matches[-1]
+            raise LookupError(f"여러 스냅샷과 일치합니다: {[m['id'] for m in matches]}")
+        return matches[0]
+
+    def list(self):
+        """스냅샷 목록 (이전 스냅샷 대비 바뀐 입력 파일)"""
+        rows = []
+        previous = {}
+        for manifest in self.manifests():
+            inputs = manifest['inputs']
+            changed = sorted(name for name, digest in inputs.items() if previous.get(name) != digest)
+            rows.append({
+                'id': manifest['id'], 'created': manifest['created'], 'label': manifest.get('label'),
+                'inputs': len(inputs), 'outputs': len(manifest['outputs']),
+                'changed_inputs': ", ".join(changed),
+            })
+            previous = inputs
+        return pd.DataFrame(rows, columns=['id', 'created', 'label', 'inputs', 'outputs', 'changed_inputs'])
+
+    def read_columns(self, ref, columns, name='accessibility_scores'):
+        """스냅샷의 컬럼형 결과에서 필요한 컬럼만 읽기"""
+        if pq is None:
+            raise ImportError("스냅샷 비교에는 pyarrow가 필요합니다")
+        manifest = self.resolve(ref)
+        if name not in manifest['columnar']:
+            raise LookupError(f"스냅샷 {manifest['id']}에 {name} 결과가 없습니다")
+        path = self.object_path(manifest['columnar'][name])
+        available = set(pq.read_schema(path).names)
+        return pq.read_table(path, columns=[c for c in columns if c in available]).to_pandas()
+
+    def restore(self, ref, target_dir, kind='inputs'):
+        """스냅샷의 입력 또는 출력 파일을 target_dir에 복원 - 결과: 복원한 파일 경로 목록"""
+        manifest = self.resolve(ref)
+        target_dir = Path(target_dir)
+        target_dir.mkdir(parents=True, exist_ok=True)
+
+        if kind == 'inputs':
+            names = {name: CONFIG_FILE.name if name == 'scoring_config' else SCHEMAS[name]['file']
+                     for name in manifest['inputs']}
+        else:
+            names = {name: name for name in manifest['outputs']}
+
+        paths = []
+        for name, digest in manifest[kind].items():
+            path = target_dir / names[name]
+            shutil.copyfile(self.object_path(digest), path)
+            paths.append(path)
+        return paths
+
+
+def _to_parquet(csv_path):
+    """결과 CSV → Parquet 바이트"""
+    if pq is None:
+        raise ImportError("스냅샷의 컬럼형 결과 저장에는 pyarrow가 필요합니다")
+    buffer = io.BytesIO()
+    pd.read_csv(csv_path, encoding='utf-8-sig').to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+def diff_snapshots(store, before, after, name='accessibility_scores', columns=None):
+    """
+    두 스냅샷의 단위별 점수 / 등급 변화
+    결과: {컬럼}_before / _after / _change, grade_before / grade_after / grade_changed
+          (한쪽에만 있는 단위도 포함, 종합 점수 변화 내림차순)
+    """
+    key = COLUMNAR_OUTPUTS[name][1]
+    columns = list(columns or SCORE_COLUMNS)
+    wanted = [key] + columns + ['grade']
+    old = store.read_columns(before, wanted, name).set_index(key)
+    new = store.read_columns(after, wanted, name).set_index(key)
+    old.index, new.index = old.index.astype(str), new.index.astype(str)
+
+    units = old.index.union(new.index, sort=False)
+    old, new = old.reindex(units), new.reindex(units)
+
+    result = pd.DataFrame(index=units)
+    for column in columns:
+        if column in old or column in new:
+            before_values = old.get(column, pd.Series(index=units, dtype='float64'))
+            after_values = new.get(column, pd.Series(index=units, dtype='float64'))
+            result[f'{column}_before'] = before_values
+            result[f'{column}_after'] = after_values
+            result[f'{column}_change'] = after_values - before_values
+    if 'grade' in old or 'grade' in new:
+        result['grade_before'] = old.get('grade')
+        result['grade_after'] = new.get('grade')
+        result['grade_changed'] = result['grade_before'].ne(result['grade_after'])
+
+    sort_column = 'total_accessibility_score_change'
+    if sort_column in result:
+        result = result.sort_values(sort_column, ascending=False, na_position='last')
+    return result.rename_axis(key).reset_index()
+
+
+def score_trend(store, column='total_accessibility_score', name='accessibility_scores'):
+    """모든 스냅샷의 단위별 점수 추이 (행: 단위, 열: 스냅샷 라벨 또는 ID)"""
+    key = COLUMNAR_OUTPUTS[name][1]
+    series = {}
+    for manifest in store.manifests():
+        if name not in manifest['columnar']:
+            continue
+        frame = store.read_columns(manifest['id'], [key, column], name)
+        if column in frame:
+            series[manifest.get('label') or manifest['id']] = frame.set_index(key)[column]
+    return pd.DataFrame(series).rename_axis(key).reset_index()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="분석 스냅샷 저장 / 비교")
+    parser.add_argument("--store", type=Path, default=SNAPSHOT_DIR, help="스냅샷 저장소 경로")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    create_parser = commands.add_parser("create", help="현재 입력 / 출력으로 스냅샷 생성")
+    create_parser.add_argument("--label", default=None, help="스냅샷 라벨 (예: 2026-10 공개본)")
+
+    commands.add_parser("list", help="스냅샷 목록")
+
+    diff_parser = commands.add_parser("diff", help="두 스냅샷의 구별 점수 / 등급 변화")
+    diff_parser.add_argument("before", help="스냅샷 ID(앞부분) / 라벨 / latest~N")
+    diff_parser.add_argument("after", nargs="?", default="latest")
+    diff_parser.add_argument("--result", choices=list(COLUMNAR_OUTPUTS), default="accessibility_scores")
+    diff_parser.add_argument("--output", type=Path, default=None, help="변화표 CSV 저장 경로")
+
+    trend_parser = commands.add_parser("trend", help="전체 스냅샷의 구별 점수 추이")
+    trend_parser.add_argument("--column", default="total_accessibility_score")
+    trend_parser.add_argument("--result", choices=list(COLUMNAR_OUTPUTS), default="accessibility_scores")
+    trend_parser.add_argument("--output", type=Path, default=None, help="추이표 CSV 저장 경로")
+
+    restore_parser = commands.add_parser("restore", help="스냅샷의 입력 / 출력 파일 복원")
+    restore_parser.add_argument("snapshot")
+    restore_parser.add_argument("target_dir", type=Path)
+    restore_parser.add_argument("--kind", choices=["inputs", "outputs"], default="inputs")
+
+    args = parser.parse_args()
+    configure_logging()
+    store = SnapshotStore(args.store)
+
+    if args.command == "create":
+        manifest = store.create(label=args.label)
+        logger.info(f"📸 스냅샷 생성: {manifest['id']}" + (f" ({args.label})" if args.label else ""))
+        logger.info(f"   ✅ 입력 {len(manifest['inputs'])}개 / 출력 {len(manifest['outputs'])}개 | "
+                    f"새로 저장한 객체 {manifest['stored']}개 (나머지는 이전 스냅샷과 동일)")
+
+    elif args.command == "list":
+        snapshots = store.list()
+        logger.info(snapshots.to_string(index=False) if len(snapshots) else "저장된 스냅샷이 없습니다")
+
+    elif args.command == "diff":
+        before, after = store.resolve(args.before), store.resolve(args.after)
+        changes = diff_snapshots(store, before['id'], after['id'], name=args.result)
+        changed_inputs = sorted(name for name in set(before['inputs']) | set(after['inputs'])
+                                if before['inputs'].get(name) != after['inputs'].get(name))
+
+        logger.info(f"📊 {before['id']} → {after['id']}")
+        logger.info(f"   • 바뀐 입력: {', '.join(changed_inputs) or '없음'}")
+        logger.info(f"   • 등급이 바뀐 단위: {int(changes['grade_changed'].sum())}개\n")
+        key = changes.columns[0]
+        for row in changes.itertuples(index=False):
+            row = row._asdict()
+            grade = (f"{row['grade_before']} → {row['grade_after']}" if row['grade_changed']
+                     else f"{row['grade_after']}")
+            logger.info(f"{str(row[key]):8s} | 종합 {row['total_accessibility_score_before']:6.2f} → "
+                        f"{row['total_accessibility_score_after']:6.2f} "
+                        f"({row['total_accessibility_score_change']:+6.2f}) | 등급 {grade}")
+        if args.output:
+            changes.to_csv(args.output, index=False, encoding='utf-8-sig')
+            logger.info(f"\n✅ 변화표 저장: {args.output}")
+
+    elif args.command == "trend":
+        trend = score_trend(store, column=args.column, name=args.result)
+        logger.info(trend.round(2).to_string(index=False))
+        if args.output:
+            trend.to_csv(args.output, index=False, encoding='utf-8-sig')
+            logger.info(f"\n✅ 추이표 저장: {args.output}")
+
+    elif args.command == "restore":
+        paths = store.restore(args.snapshot, args.target_dir, kind=args.kind)
+        logger.info(f"✅ {len(paths)}개 파일 복원: {args.target_dir}")
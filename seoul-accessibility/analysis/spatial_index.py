@@ -0,0 +1,149 @@
+"""
+시설 좌표 공간 인덱스 (BallTree, Haversine 거리)
+시설 종류별로 한 번만 구축하고 모든 출발지 질의에 재사용
+"""
+
+import numpy as np
+from sklearn.neighbors import BallTree
+
+from distance_engine import EARTH_RADIUS_KM
+
+
+class FacilityIndex:
+    """
+    시설 좌표에 대한 최근접 / k-최근접 / 반경 질의
+    거리는 모두 킬로미터 단위
+    """
+
+    def __init__(self, latitudes, longitudes, leaf_size=40):
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+
+        # 좌표가 비어 있는 시설은 제외하고, 원래 행 위치를 기억
+        valid = ~(np.isnan(latitudes) | np.isnan(longitudes))
+        self.positions = np.flatnonzero(valid)
+        self.size = len(self.positions)
+
+        self._tree = None
+        if self.size > 0:
+            coords = np.radians(np.column_stack([latitudes[valid], longitudes[valid]]))
+            self._tree = BallTree(coords, leaf_size=leaf_size, metric='haversine')
+
+    @classmethod
+    def from_dataframe(cls, facilities_df, **kwargs):
+        """latitude / longitude 컬럼을 가진 DataFrame으로부터 인덱스 생성"""
+        return cls(facilities_df['latitude'].to_numpy(),
+                   facilities_df['longitude'].to_numpy(), **kwargs)
+
+    def __len__(self):
+        return self.size
+
+    @staticmethod
+    def _origins(latitudes, longitudes):
+        latitudes = np.atleast_1d(np.asarray(latitudes, dtype=np.float64))
+        longitudes = np.atleast_1d(np.asarray(longitudes, dtype=np.float64))
+        return np.radians(np.column_stack([latitudes, longitudes]))
+
+    def query(self, latitudes, longitudes, k=1):
+        """
+        k-최근접 질의
+        결과: (distances, positions) - (M, k) 배열, 거리 오름차순
+        시설 수가 k보다 적으면 남는 칸은 거리 NaN / 위치 -1
+        """
+        origins = self._origins(latitudes, longitudes)
+        distances = np.full((len(origins), k), np.nan)
+        positions = np.full((len(origins), k), -1, dtype=np.int64)
+
+        k_found = min(k, self.size)
+        if k_found == 0 or len(origins) == 0:
+            return distances, positions
+
+        dist, ind = self._tree.query(origins, k=k_found, sort_results=True)
+        distances[:, :k_found] = dist * EARTH_RADIUS_KM
+        positions[:, :k_found] = self.positions[ind]
+        return distances, positions
+
+    def nearest(self, latitudes, longitudes):
+        """최근접 시설까지의 거리 (km)와 시설 행 위치"""
+        distances, positions = self.query(latitudes, longitudes, k=1)
+        return distances[:, 0], positions[:, 0]
+
+    def nearest_and_mean_distances(self, latitudes, longitudes, top_n=1, max_distance_km=None):
+        """
+        최근접 시설 거리와 가까운 N개 시설의 평균 거리 (km)
+        distance_engine.nearest_and_mean_distances와 같은 형태의 결과
+        max_distance_km를 주면 반경 내 시설만 사용 (radius_limited_distances - 최근접 시설이 반경 밖이면 NaN,
+        평균은 반경 밖 / 빈 칸을 반경으로 채워 계산)
+        """
+        if max_distance_km is not None:
+            return self._nearest_and_mean_within(latitudes, longitudes, top_n, max_distance_km)
+
+        distances, _ = self.query(latitudes, longitudes, k=top_n)
+        k_found = min(top_n, self.size)
+        if k_found == 0:
+            return distances[:, 0], distances[:, 0].copy()
+
+        distances = distances[:, :k_found]
+        return distances[:, 0], distances.mean(axis=1)
+
+    def _nearest_and_mean_within(self, latitudes, longitudes, top_n, max_distance_km):
+        """k-최근접 질의(k=top_n) 후 반경 밖 시설 제외 (출발지당 작업량은 top_n으로 제한)"""
+        distances, _ = self.query(latitudes, longitudes, k=top_n)
+        return radius_limited_distances(distances, top_n, max_distance_km)
+
+    def query_radius(self, latitudes, longitudes, radius_km, return_distance=True):
+        """
+        반경 질의
+        결과: 출발지별 (positions, distances) 배열 목록
+        """
+        origins = self._origins(latitudes, longitudes)
+        if self.size == 0 or len(origins) == 0:
+            empty = np.array([], dtype=np.int64)
+            if return_distance:
+                return [empty] * len(origins), [np.array([])] * len(origins)
+            return [empty] * len(origins)
+
+        radius = radius_km / EARTH_RADIUS_KM
+        if not return_distance:
+            ind = self._tree.query_radius(origins, r=radius)
+            return [self.positions[i] for i in ind]
+
+        ind, dist = self._tree.query_radius(origins, r=radius,
+                                            return_distance=True, sort_results=True)
+        return ([self.positions[i] for i in ind],
+                [d * EARTH_RADIUS_KM for d in dist])
+
+    def count_within(self, latitudes, longitudes, radius_km):
+        """반경 내 시설 개수"""
+        origins = self._origins(latitudes, longitudes)
+        if self.size == 0 or len(origins) == 0:
+            return np.zeros(len(origins), dtype=np.int64)
+        return self._tree.query_radius(origins, r=radius_km / EARTH_RADIUS_KM,
+                                       count_only=True)
+
+
+def radius_limited_distances(distances, top_n, max_distance_km):
+    """
+    반경 제한 (최근접 거리, 평균 거리)
+    distances: (M, k) 거리 오름차순 배열 (빈 칸은 NaN)
+    반경 안 시설이 top_n개보다 적으면 모자란 칸을 반경으로 채워 평균
+    (반경 안 시설이 적은 곳의 평균이 더 작아져 유리해지지 않도록), 최근접 시설이 반경 밖이면 최근접 거리는 NaN
+    """
+    top = np.full((len(distances), top_n), np.nan)
+    top[:, :min(top_n, distances.shape[1])] = distances[:, :top_n]
+    within = top <= max_distance_km
+
+    nearest = np.where(within[:, 0], top[:, 0], np.nan)
+    mean = np.where(within, top, max_distance_km).mean(axis=1)
+    return nearest, mean
+
+
+def build_facility_indexes(facilities):
+    """
+    시설 종류별 인덱스 생성
+    facilities: {시설 종류: DataFrame} 딕셔너리
+    """
+    return {
+        facility_type: FacilityIndex.from_dataframe(df)
+        for facility_type, df in facilities.items()
+    }
@@ -0,0 +1,216 @@
+"""
+대시보드 히트맵용 다중 해상도 타일 생성
+격자 점수를 Web Mercator z/x/y 타일로 나누고, 타일마다 bins × bins 칸의 min / mean / max를 미리 집계하여
+data/processed/tiles/{z}/{x}/{y}.json에 저장 (화면에 보이는 타일만 해당 줌 해상도로 불러오기 위함)
+
+- 가장 세밀한 줌은 셀에서 직접 집계하고, 한 단계 낮은 줌은 바로 위 줌의 칸 2×2를 합쳐 집계 (쿼드트리)
+- 타일 직렬화 / 저장은 프로세스 풀에서 병렬 실행
+- 타일 내용 해시를 manifest.json에 기록하여 바뀐 타일만 다시 쓰고, 사라진 타일은 삭제
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from calculate_accessibility import PROCESSED_DIR
+from parallel import default_workers
+from instrumentation import configure_logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_ZOOM = 10
+DEFAULT_MAX_ZOOM = 15
+DEFAULT_BINS = 32
+VALUE_DECIMALS = 2
+
+TILES_DIR = PROCESSED_DIR / "tiles"
+
+DEFAULT_VALUE_COLUMNS = [
+    'medical_score', 'financial_score', 'transport_score',
+    'administrative_score', 'total_accessibility_score',
+]
+
+
+def mercator_pixels(latitudes, longitudes, zoom, bins):
+    """위도 / 경도 → 줌 z의 전역 칸 좌표 (타일 번호 × bins + 타일 내 칸 번호)"""
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    scale = (2 ** zoom) * bins
+    x = (np.asarray(longitudes, dtype=np.float64) + 180.0) / 360.0 * scale
+    y = (1.0 - np.log(np.tan(lat) + 1.0 / np.cos(lat)) / np.pi) / 2.0 * scale
+    return np.floor(x).astype(np.int64), np.floor(y).astype(np.int64)
+
+
+def aggregate_levels(cells, value_columns, min_zoom=DEFAULT_MIN_ZOOM, max_zoom=DEFAULT_MAX_ZOOM,
+                     bins=DEFAULT_BINS):
+    """
+    줌 단계별 칸 집계
+    결과: {줌: DataFrame(gx, gy, count, population, {컬럼}_sum / _min / _max)}
+    """
+    gx, gy = mercator_pixels(cells['latitude'], cells['longitude'], max_zoom, bins)
+    frame = pd.DataFrame({'gx': gx, 'gy': gy, 'count': 1,
+                          'population': cells['population'].to_numpy(dtype=np.float64)
+                          if 'population' in cells else 0.0})
+    aggregations = {'count': 'sum', 'population': 'sum'}
+    for column in value_columns:
+        values = cells[column].to_numpy(dtype=np.float64)
+        frame[f'{column}_sum'] = values
+        frame[f'{column}_min'] = values
+        frame[f'{column}_max'] = values
+        aggregations.update({f'{column}_sum': 'sum', f'{column}_min': 'min', f'{column}_max': 'max'})
+
+    levels = {}
+    for zoom in range(max_zoom, min_zoom - 1, -1):
+        if zoom < max_zoom:
+            # 쿼드트리: 한 단계 위 줌의 칸 2×2를 하나로 합침
+            frame = frame.assign(gx=frame['gx'] // 2, gy=frame['gy'] // 2)
+        frame = frame.groupby(['gx', 'gy'], as_index=False, sort=True).agg(aggregations)
+        levels[zoom] = frame
+    return levels
+
+
+def _tile_payload(zoom, x, y, bins, rows, value_columns):
+    """타일 하나의 JSON 내용 (칸이 있는 위치만 필드별 배열로 저장)"""
+    count = rows['count'].to_numpy()
+    payload = {
+        'z': zoom, 'x': x, 'y': y, 'bins': bins,
+        'bin_x': (rows['gx'].to_numpy() - x * bins).tolist(),
+        'bin_y': (rows['gy'].to_numpy() - y * bins).tolist(),
+        'count': count.tolist(),
+        'population': np.round(rows['population'].to_numpy(), 1).tolist(),
+    }
+    for column in value_columns:
+        payload[f'{column}_min'] = np.round(rows[f'{column}_min'].to_numpy(), VALUE_DECIMALS).tolist()
+        payload[f'{column}_mean'] = np.round(
+            rows[f'{column}_sum'].to_numpy() / count, VALUE_DECIMALS).tolist()
+        payload[f'{column}_max'] = np.round(rows[f'{column}_max'].to_numpy(), VALUE_DECIMALS).tolist()
+    return payload
+
+
+def _write_tiles(output_dir, tiles, bins, value_columns, previous_hashes):
+    """
+    워커에서 실행: 타일 묶음 직렬화 후 내용이 바뀐 타일만 저장
+    결과: [(타일 키, 해시, 저장 여부)]
+    """
+    output_dir = Path(output_dir)
+    results = []
+    for zoom, x, y, rows in tiles:
+        key = f"{zoom}/{x}/{y}"
+        text = json.dumps(_tile_payload(zoom, x, y, bins, rows, value_columns),
+                          separators=(',', ':'))
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        path = output_dir / str(zoom) / str(x) / f"{y}.json"
+        changed = previous_hashes.get(key) != digest or not path.exists()
+        if changed:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding='utf-8')
+        results.append((key, digest, changed))
+    return results
+
+
+def _split_tiles(levels, bins):
+    """줌 단계별 칸 집계 → [(줌, x, y, 칸 DataFrame)]"""
+    tiles = []
+    for zoom, frame in levels.items():
+        tile_x = frame['gx'].to_numpy() // bins
+        tile_y = frame['gy'].to_numpy() // bins
+        order = np.lexsort((tile_y, tile_x))
+        frame = frame.iloc[order].reset_index(drop=True)
+        tile_x, tile_y = tile_x[order], tile_y[order]
+        starts = np.flatnonzero(np.r_[True, (tile_x[1:] != tile_x[:-1]) | (tile_y[1:] != tile_y[:-1])])
+        stops = np.r_[starts[1:], len(frame)]
+        for start, stop in zip(starts, stops):
+            tiles.append((zoom, int(tile_x[start]), int(tile_y[start]), frame.iloc[start:stop]))
+    return tiles
+
+
+def _load_manifest(output_dir):
+    path = output_dir / "manifest.json"
+    if not path.exists():
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def generate_tiles(cells, output_dir=TILES_DIR, value_columns=None, min_zoom=DEFAULT_MIN_ZOOM,
+                   max_zoom=DEFAULT_MAX_ZOOM, bins=DEFAULT_BINS, workers=None, batch_size=256):
+    """
+    격자 점수 → z/x/y 타일
+    이전 manifest와 설정(줌 / bins / 컬럼)이 같으면 내용이 바뀐 타일만 다시 씀
+    결과: {'tiles': 전체 타일 수, 'written': 새로 쓴 타일 수, 'removed': 삭제한 타일 수}
+    """
+    output_dir = Path(output_dir)
+    value_columns = list(value_columns or DEFAULT_VALUE_COLUMNS)
+    settings = {'min_zoom': min_zoom, 'max_zoom': max_zoom, 'bins': bins,
+                'value_columns': value_columns, 'value_decimals': VALUE_DECIMALS}
+
+    manifest = _load_manifest(output_dir)
+    if manifest.get('settings') != settings:
+        # 설정이 바뀌면 기존 타일을 모두 버리고 새로 생성
+        if output_dir.exists():
+            shutil.rmtree(output_dir)
+        manifest = {}
+    previous_hashes = manifest.get('tiles', {})
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    levels = aggregate_levels(cells, value_columns, min_zoom, max_zoom, bins)
+    tiles = _split_tiles(levels, bins)
+    batches = [tiles[i:i + batch_size] for i in range(0, len(tiles), batch_size)]
+
+    workers = workers or default_workers()
+    if workers > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_write_tiles, output_dir, batch, bins, value_columns, previous_hashes)
+                       for batch in batches]
+            results = [result for future in futures for result in future.result()]
+    else:
+        results = [result for batch in batches
+                   for result in _write_tiles(output_dir, batch, bins, value_columns, previous_hashes)]
+
+    hashes = {key: digest for key, digest, _ in results}
+    removed = 0
+    for key in set(previous_hashes) - set(hashes):
+        path = output_dir / f"{key}.json"
+        if path.exists():
+            path.unlink()
+        removed += 1
+
+    index = {
+        'settings': settings,
+        'bounds': [float(cells['longitude'].min()), float(cells['latitude'].min()),
+                   float(cells['longitude'].max()), float(cells['latitude'].max())],
+        'tiles': dict(sorted(hashes.items())),
+    }
+    with open(output_dir / "manifest.json", 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+
+    return {'tiles': len(hashes), 'written': sum(changed for *_, changed in results), 'removed': removed}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="격자 점수 → 다중 해상도 히트맵 타일")
+    parser.add_argument("--input", type=Path, default=PROCESSED_DIR / "grid_accessibility_scores.csv",
+                        help="격자 점수 CSV (grid_accessibility.py 결과)")
+    parser.add_argument("--output-dir", type=Path, default=TILES_DIR)
+    parser.add_argument("--min-zoom", type=int, default=DEFAULT_MIN_ZOOM)
+    parser.add_argument("--max-zoom", type=int, default=DEFAULT_MAX_ZOOM)
+    parser.add_argument("--bins", type=int, default=DEFAULT_BINS, help="타일 한 변의 칸 수")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--quiet", action="store_true", help="경고 외 콘솔 출력 생략")
+    args = parser.parse_args()
+
+    configure_logging(quiet=args.quiet)
+
+    cells = pd.read_csv(args.input, encoding='utf-8-sig')
+    logger.info(f"🗺️  격자 셀 {len(cells):,}개 → 줌 {args.min_zoom}~{args.max_zoom} 타일 생성 중...")
+    summary = generate_tiles(cells, args.output_dir, min_zoom=args.min_zoom, max_zoom=args.max_zoom,
+                             bins=args.bins, workers=args.workers)
+    logger.info(f"   ✅ 타일 {summary['tiles']:,}개 | 새로 저장 {summary['written']:,}개 | "
+                f"삭제 {summary['removed']:,}개")
+    logger.info(f"\n✅ 타일 저장 위치: {args.output_dir}")
@@ -0,0 +1,408 @@
+"""
+도로 / 지하철 네트워크 기반 이동 시간 접근성
+로컬 OSM 추출 파일(.osm / .osm.gz, XML)의 보행 가능 도로와 subway_stations.csv의 지하철역으로
+CSR 인접 행렬 그래프를 만들고, 시설 종류별로 모든 시설을 출발점으로 하는 다중 출발 Dijkstra를 한 번 실행하여
+모든 노드의 최근접 시설까지 이동 시간(분)을 계산
+
+- 그래프와 시설 종류별 노드 이동 시간은 data/cache/travel_time/에 입력 해시와 함께 저장
+- 결과 컬럼: nearest_{label}_time_min, avg_{label}_time_min (점수 계산 시 거리 컬럼 대신 사용)
+- 가까운 N개 평균 시간은 출발지 청크별 Dijkstra를 시간 상한(limit)까지만 탐색하고 시설 노드 열만 남김
+  (출발지 × 노드 행렬을 한 번에 만들지 않으므로 격자 셀 같은 많은 출발지에도 메모리가 제한됨)
+- 지하철 노선의 역 순서 정보가 없으므로 노선별 역 좌표의 최소 신장 트리로 역 간 연결을 근사
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra, minimum_spanning_tree
+
+from distance_engine import haversine_matrix, EARTH_RADIUS_KM, DEFAULT_MAX_ELEMENTS
+from spatial_index import FacilityIndex
+from ingest import CACHE_DIR, COORDINATE_BOUNDS, RAW_DIR, file_sha256, load_dataset
+from instrumentation import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# 이동 속도 / 지연 시간 가정
+WALK_SPEED_KMH = 4.5
+SUBWAY_SPEED_KMH = 33.0
+STATION_ENTRY_MIN = 4.0     # 역 진입 + 승강장 이동 + 평균 대기
+STATION_EXIT_MIN = 2.0      # 하차 후 출구까지
+TRANSFER_MIN = 4.0          # 같은 이름의 다른 노선 역 환승
+
+# 보행 네트워크에서 제외할 도로 (자동차 전용)
+EXCLUDED_HIGHWAYS = {'motorway', 'motorway_link', 'trunk', 'trunk_link',
+                     'construction', 'proposed', 'raceway', 'bus_guideway'}
+
+# 가까운 N개 평균 시간 계산 시 Dijkstra 탐색 상한 (분) - 상한 안에서 N개를 못 찾은 출발지만 상한 없이 다시 계산
+AVG_TIME_LIMIT_MIN = 60.0
+
+# 그래프 구성 방식이 바뀌면 올려서 캐시 무효화
+GRAPH_VERSION = 1
+
+
+def travel_time_dir(cache_dir=CACHE_DIR):
+    return Path(cache_dir) / "travel_time"
+
+
+def _walk_minutes(km):
+    return np.asarray(km, dtype=np.float64) / WALK_SPEED_KMH * 60
+
+
+def _segment_km(lats1, lons1, lats2, lons2):
+    """점 쌍별 Haversine 거리 (km) - 행렬을 만들지 않는 원소별 계산"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64))
+                              for v in (lats1, lons1, lats2, lons2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(a))
+
+
+def parse_osm(path):
+    """
+    OSM XML에서 보행 가능 도로 추출
+    결과: (노드 위도 배열, 노드 경도 배열, 간선 시작 배열, 간선 끝 배열) - 노드 번호는 0부터 연속
+    """
+    path = Path(path)
+    if path.suffix == '.pbf':
+        raise ValueError(f"{path.name}: PBF는 지원하지 않습니다 (osmium cat 등으로 .osm XML 변환 필요)")
+
+    node_coords = {}
+    segments = []
+    opener = gzip.open if path.suffix == '.gz' else open
+    with opener(path, 'rb') as f:
+        for _, elem in ET.iterparse(f, events=('end',)):
+            if elem.tag == 'node':
+                node_coords[elem.get('id')] = (float(elem.get('lat')), float(elem.get('lon')))
+                elem.clear()
+            elif elem.tag == 'way':
+                tags = {tag.get('k'): tag.get('v') for tag in elem.iter('tag')}
+                highway = tags.get('highway')
+                if highway and highway not in EXCLUDED_HIGHWAYS and tags.get('foot') != 'no':
+                    refs = [nd.get('ref') for nd in elem.iter('nd')]
+                    segments.extend(zip(refs[:-1], refs[1:]))
+                elem.clear()
+
+    used = sorted({ref for segment in segments for ref in segment if ref in node_coords})
+    numbering = {ref: i for i, ref in enumerate(used)}
+    coords = np.array([node_coords[ref] for ref in used], dtype=np.float64).reshape(-1, 2)
+    edges = np.array([
+        (numbering[u], numbering[v]) for u, v in segments
+        if u in numbering and v in numbering and u != v
+    ], dtype=np.int64).reshape(-1, 2)
+
+    return coords[:, 0], coords[:, 1], edges[:, 0], edges[:, 1]
+
+
+def _csr(sources, targets, weights, num_nodes):
+    """간선 배열 → CSR 행렬 (같은 노드 쌍의 중복 간선은 가장 짧은 것만 유지)"""
+    order = np.lexsort((weights, targets, sources))
+    sources, targets, weights = sources[order], targets[order], weights[order]
+    first = np.ones(len(sources), dtype=bool)
+    first[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+    # 가중치 0인 간선이 빠지지 않도록 아주 작은 양수로 대체
+    weights = np.maximum(weights, 1e-9)
+    return csr_matrix((weights[first], (sources[first], targets[first])),
+                      shape=(num_nodes, num_nodes))
+
+
+class TravelGraph:
+    """
+    이동 시간 그래프 (간선 가중치: 분)
+    노드 0..num_road_nodes-1은 도로 노드, 그 뒤는 지하철역 노드
+    """
+
+    def __init__(self, node_lats, node_lons, matrix, num_road_nodes):
+        self.node_lats = np.asarray(node_lats, dtype=np.float64)
+        self.node_lons = np.asarray(node_lons, dtype=np.float64)
+        self.matrix = matrix
+        self.num_road_nodes = int(num_road_nodes)
+        self._road_index = FacilityIndex(self.node_lats[:self.num_road_nodes],
+                                         self.node_lons[:self.num_road_nodes])
+        self._reverse = None
+
+    @property
+    def num_nodes(self):
+        return self.matrix.shape[0]
+
+    @classmethod
+    def build(cls, osm_file, stations_df):
+        """OSM 도로망 + 지하철역으로 그래프 생성"""
+        road_lats, road_lons, u, v = parse_osm(osm_file)
+        num_road = len(road_lats)
+        if num_road == 0:
+            raise ValueError(f"{osm_file}: 보행 가능한 도로가 없습니다")
+
+        # 도로 간선: 양방향 보행
+        walk = _walk_minutes(_segment_km(road_lats[u], road_lons[u], road_lats[v], road_lons[v]))
+        sources = [u, v]
+        targets = [v, u]
+        weights = [walk, walk]
+
+        stations = stations_df.dropna(subset=['latitude', 'longitude']).reset_index(drop=True)
+        station_lats = stations['latitude'].to_numpy(dtype=np.float64)
+        station_lons = stations['longitude'].to_numpy(dtype=np.float64)
+        station_nodes = num_road + np.arange(len(stations))
+
+        if len(stations):
+            # 역 ↔ 가장 가까운 도로 노드 (진입 시 대기 시간 포함)
+            road_index = FacilityIndex(road_lats, road_lons)
+            access_km, access_node = road_index.nearest(station_lats, station_lons)
+            access = _walk_minutes(access_km)
+            sources += [access_node, station_nodes]
+            targets += [station_nodes, access_node]
+            weights += [access + STATION_ENTRY_MIN, access + STATION_EXIT_MIN]
+
+            # 노선별 역 연결 (최소 신장 트리)
+            lines = stations['line'].astype(str).to_numpy()
+            for line in np.unique(lines):
+                members = np.flatnonzero(lines == line)
+                if len(members) < 2:
+                    continue
+                km = haversine_matrix(station_lats[members], station_lons[members],
+                                      station_lats[members], station_lons[members])
+                tree = minimum_spanning_tree(csr_matrix(km)).tocoo()
+                ride = tree.data / SUBWAY_SPEED_KMH * 60
+                a, b = station_nodes[members[tree.row]], station_nodes[members[tree.col]]
+                sources += [a, b]
+                targets += [b, a]
+                weights += [ride, ride]
+
+            # 같은 이름의 역(다른 노선) 환승
+            names = stations['name'].astype(str).to_numpy()
+            order = np.argsort(names, kind='stable')
+            same = names[order][1:] == names[order][:-1]
+            a, b = station_nodes[order[:-1][same]], station_nodes[order[1:][same]]
+            transfer = np.full(len(a), TRANSFER_MIN)
+            sources += [a, b]
+            targets += [b, a]
+            weights += [transfer, transfer]
+
+        num_nodes = num_road + len(stations)
+        matrix = _csr(np.concatenate(sources).astype(np.int64),
+                      np.concatenate(targets).astype(np.int64),
+                      np.concatenate(weights), num_nodes)
+        return cls(np.concatenate([road_lats, station_lats]),
+                   np.concatenate([road_lons, station_lons]), matrix, num_road)
+
+    def save(self, path):
+        np.savez(path, node_lats=self.node_lats, node_lons=self.node_lons,
+                 indptr=self.matrix.indptr, indices=self.matrix.indices, data=self.matrix.data,
+                 num_road_nodes=self.num_road_nodes)
+
+    @classmethod
+    def load(cls, path):
+        arrays = np.load(path)
+        num_nodes = len(arrays['node_lats'])
+        matrix = csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']),
+                            shape=(num_nodes, num_nodes))
+        return cls(arrays['node_lats'], arrays['node_lons'], matrix, arrays['num_road_nodes'])
+
+    def snap(self, latitudes, longitudes):
+        """좌표 → (가장 가까운 도로 노드, 그 노드까지 도보 시간(분))"""
+        km, nodes = self._road_index.nearest(latitudes, longitudes)
+        return nodes, _walk_minutes(km)
+
+    def times_to_nearest(self, latitudes, longitudes):
+        """
+        모든 노드에서 주어진 시설 중 가장 가까운 곳까지의 이동 시간 (분)
+        가상 출발 노드 하나를 각 시설의 도로 노드에 (도보 접근 시간) 가중치로 연결하고
+        역방향 그래프에서 Dijkstra를 한 번만 실행 (다중 출발 최단 경로)
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        valid = ~(np.isnan(latitudes) | np.isnan(longitudes))
+        if not valid.any():
+            return np.full(self.num_nodes, np.inf)
+
+        nodes, access = self.snap(latitudes[valid], longitudes[valid])
+        if self._reverse is None:
+            self._reverse = self.matrix.T.tocsr()
+
+        super_source = self.num_nodes
+        extra = _csr(np.full(len(nodes), super_source, dtype=np.int64), nodes.astype(np.int64),
+                     access, self.num_nodes + 1)
+        reverse = self._reverse.copy()
+        reverse.resize((self.num_nodes + 1, self.num_nodes + 1))
+        times = dijkstra(reverse + extra, directed=True, indices=super_source, min_only=True)
+        return times[:self.num_nodes]
+
+    def times_from(self, latitudes, longitudes, limit=np.inf):
+        """출발지별 모든 노드까지의 이동 시간 (분) - (출발지 수, 노드 수)"""
+        nodes, access = self.snap(latitudes, longitudes)
+        times = dijkstra(self.matrix, directed=True, indices=nodes, limit=limit)
+        return times + access[:, np.newaxis]
+
+
+def graph_key(osm_file, stations_sha256):
+    payload = {
+        'version': GRAPH_VERSION,
+        'osm_sha256': file_sha256(osm_file),
+        'stations_sha256': stations_sha256,
+        'speeds': [WALK_SPEED_KMH, SUBWAY_SPEED_KMH, STATION_ENTRY_MIN, STATION_EXIT_MIN, TRANSFER_MIN],
+        'excluded': sorted(EXCLUDED_HIGHWAYS),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def load_graph(osm_file, cache_dir=CACHE_DIR, raw_dir=RAW_DIR, bounds=COORDINATE_BOUNDS):
+    """
+    캐시된 그래프 로드 (OSM 파일 / 지하철역 / 속도 가정이 바뀌면 다시 생성)
+    raw_dir / bounds: 지하철역 데이터셋 원본 디렉토리와 좌표 허용 범위 (시설 데이터와 같은 값)
+    """
+    stations = load_dataset('subway_stations', raw_dir=raw_dir, cache_dir=cache_dir, bounds=bounds)
+    stations_sha = hashlib.sha256(
+        pd.util.hash_pandas_object(stations, index=False).to_numpy().tobytes()).hexdigest()
+    key = graph_key(osm_file, stations_sha)
+
+    directory = travel_time_dir(cache_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"graph-{key[:16]}.npz"
+    if path.exists():
+        return TravelGraph.load(path), key
+
+    graph = TravelGraph.build(osm_file, stations)
+    for old in directory.glob("graph-*.npz"):
+        old.unlink()
+    graph.save(path)
+    return graph, key
+
+
+def facility_node_times(graph, key, facility_type, facilities_df, cache_dir=CACHE_DIR):
+    """시설 종류별 노드 → 최근접 시설 이동 시간 (입력 해시 단위로 캐시)"""
+    coords = facilities_df[['latitude', 'longitude']].to_numpy(dtype=np.float64)
+    facility_sha = hashlib.sha256(coords.tobytes()).hexdigest()
+    path = travel_time_dir(cache_dir) / f"{facility_type}-{key[:16]}-{facility_sha[:16]}.npy"
+    if path.exists():
+        return np.load(path)
+
+    times = graph.times_to_nearest(coords[:, 0], coords[:, 1])
+    for old in travel_time_dir(cache_dir).glob(f"{facility_type}-*.npy"):
+        old.unlink()
+    np.save(path, times)
+    return times
+
+
+def time_metric_columns(spec):
+    """시설 종류별 이동 시간 컬럼 이름"""
+    label = spec['label']
+    columns = {'nearest': f'nearest_{label}_time_min'}
+    if spec['top_n']:
+        columns['avg'] = f'avg_{label}_time_min'
+    return columns
+
+
+def _mean_of_smallest(times, k):
+    """행별 가장 작은 k개 값의 평균과 k번째 값 (도달할 수 없는 값(inf)은 제외, 하나도 없으면 NaN)"""
+    smallest = np.sort(np.partition(times, k - 1, axis=1)[:, :k], axis=1)
+    reachable = np.isfinite(smallest)
+    found = reachable.sum(axis=1)
+    mean = np.full(len(smallest), np.nan)
+    np.divide(np.where(reachable, smallest, 0.0).sum(axis=1), found,
+              out=mean, where=found > 0)
+    return mean, smallest[:, -1]
+
+
+def average_travel_times(graph, latitudes, longitudes, targets, limit_min=AVG_TIME_LIMIT_MIN,
+                         max_elements=DEFAULT_MAX_ELEMENTS):
+    """
+    출발지별 가까운 N개 시설 평균 이동 시간 (분)
+    targets: {시설 종류: (시설 도로 노드 배열, 시설 도보 접근 시간 배열, N)}
+    출발지를 (청크 크기 × 노드 수 ≤ max_elements) 청크로 나누어 limit_min까지만 Dijkstra를 실행하고,
+    N번째 시설 시간이 상한을 넘을 수 있는 출발지만 상한 없이 다시 계산 (결과는 상한 없는 계산과 동일)
+    결과: {시설 종류: 평균 시간 배열}
+    """
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    chunk_size = max(1, max_elements // max(graph.num_nodes, 1))
+    results = {facility_type: np.full(len(latitudes), np.nan) for facility_type in targets}
+
+    for start in range(0, len(latitudes), chunk_size):
+        lats = latitudes[start:start + chunk_size]
+        lons = longitudes[start:start + chunk_size]
+        nodes, access = graph.snap(lats, lons)
+        times = dijkstra(graph.matrix, directed=True, indices=nodes, limit=limit_min)
+
+        for facility_type, (facility_nodes, facility_access, top_n) in targets.items():
+            k = min(top_n, len(facility_nodes))
+            if k == 0:
+                continue
+            facility_times = (times[:, facility_nodes] + access[:, np.newaxis]
+                              + facility_access[np.newaxis, :])
+            mean, kth = _mean_of_smallest(facility_times, k)
+            # 상한 밖 시설은 (출발지 접근 + 그래프 시간 > 출발지 접근 + limit)이므로
+            # k번째 값이 그보다 확실히 작을 때만 확정 (경계 근처는 반올림 오차를 피해 다시 계산)
+            unresolved = ~(kth < access + limit_min - 1e-9)
+            if unresolved.any() and np.isfinite(limit_min):
+                full = dijkstra(graph.matrix, directed=True, indices=nodes[unresolved])
+                mean[unresolved], _ = _mean_of_smallest(
+                    full[:, facility_nodes] + access[unresolved, np.newaxis]
+                    + facility_access[np.newaxis, :], k)
+            results[facility_type][start:start + len(lats)] = mean
+
+    return results
+
+
+def calculate_travel_time_metrics(origins_df, facilities, specs, osm_file, cache_dir=CACHE_DIR,
+                                  limit_min=AVG_TIME_LIMIT_MIN, raw_dir=RAW_DIR, bounds=COORDINATE_BOUNDS):
+    """
+    출발지별 최근접 / 가까운 N개 평균 이동 시간 (분)
+    최근접 시간은 시설 종류별 다중 출발 Dijkstra 결과(캐시)를 출발지 도로 노드에서 읽고,
+    평균 시간은 average_travel_times (출발지 청크별 시간 상한 Dijkstra)로 가까운 N개 평균
+    (도달할 수 없는 시설만 있으면 NaN)
+    구 경계 / 검색 반경은 적용하지 않음 (항상 네트워크로 닿는 서울시 전체 시설 기준)
+    raw_dir / bounds: 그래프에 넣을 지하철역 데이터셋 위치와 좌표 허용 범위
+    """
+    graph, key = load_graph(osm_file, cache_dir, raw_dir, bounds)
+    lats = origins_df['latitude'].to_numpy(dtype=np.float64)
+    lons = origins_df['longitude'].to_numpy(dtype=np.float64)
+    origin_nodes, origin_access = graph.snap(lats, lons)
+
+    metrics = pd.DataFrame(index=origins_df.index)
+    targets = {}
+    for facility_type, spec in specs.items():
+        columns = time_metric_columns(spec)
+        facilities_df = facilities[facility_type]
+
+        node_times = facility_node_times(graph, key, facility_type, facilities_df, cache_dir)
+        nearest = node_times[origin_nodes] + origin_access
+        metrics[columns['nearest']] = np.where(np.isfinite(nearest), nearest, np.nan)
+
+        if 'avg' in columns:
+            coords = facilities_df[['latitude', 'longitude']].dropna().to_numpy(dtype=np.float64)
+            facility_nodes, facility_access = graph.snap(coords[:, 0], coords[:, 1])
+            # 역방향 접근 시간 근사: 시설 → 도로 노드 도보 시간과 같다고 가정
+            targets[facility_type] = (facility_nodes, facility_access, spec['top_n'])
+
+    averages = average_travel_times(graph, lats, lons, targets, limit_min)
+    for facility_type, mean in averages.items():
+        metrics[time_metric_columns(specs[facility_type])['avg']] = mean
+
+    return metrics[[column for spec in specs.values() for column in time_metric_columns(spec).values()]]
+
+
+if __name__ == "__main__":
+    from calculate_accessibility import FACILITY_SPECS, load_facilities
+
+    parser = argparse.ArgumentParser(description="도로 / 지하철 네트워크 이동 시간 계산")
+    parser.add_argument("osm_file", type=Path, help="OSM XML 추출 파일 (.osm / .osm.gz)")
+    parser.add_argument("--quiet", action="store_true", help="경고 외 콘솔 출력 생략")
+    args = parser.parse_args()
+
+    configure_logging(quiet=args.quiet)
+    districts = load_dataset('districts')
+    graph, _ = load_graph(args.osm_file)
+    logger.info(f"🗺️  그래프: 노드 {graph.num_nodes:,}개 (지하철역 {graph.num_nodes - graph.num_road_nodes}개) | "
+                f"간선 {graph.matrix.nnz:,}개")
+
+    metrics = calculate_travel_time_metrics(districts, load_facilities(), FACILITY_SPECS, args.osm_file)
+    metrics.insert(0, 'district', districts['district'])
+    logger.info(metrics.round(1).to_string(index=False))